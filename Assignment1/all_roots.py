@@ -0,0 +1,142 @@
+"""
+Finds every root of a polynomial at once, complex ones included, instead
+of running Newton's method from one guessed start after another.
+
+    >>> from assignment1 import get_coefficients
+    >>> roots = find_all_roots(get_coefficients(["-6", "11x", "-6x^2", "1x^3"]))
+    >>> [round(root.real, 9) for root in roots]
+    [1.0, 2.0, 3.0]
+    >>> real_roots(find_all_roots([1, 0, 1]))
+    []
+"""
+
+import cmath
+import math
+import sys
+from typing import List, Mapping, Sequence, Union
+
+from assignment1 import evaluate, evaluate_with_derivative, to_dense
+
+EPSILON = sys.float_info.epsilon
+
+Coefficients = Union[Sequence[float], Mapping[int, float]]
+
+
+def _trimmed(poly: Coefficients) -> List[float]:
+    if isinstance(poly, Mapping):
+        poly = to_dense(poly)
+    poly = list(poly)
+    while poly and poly[-1] == 0:
+        poly.pop()
+    if not poly:
+        raise ValueError("every number is a root of the zero polynomial")
+    return poly
+
+
+def _initial_guesses(poly: List[float]) -> List[complex]:
+    # spread over a circle as big as fujiwara's bound on the roots, turned
+    # a little so no guess starts out on the real axis
+    degree = len(poly) - 1
+    radius = 2 * max(
+        abs(poly[degree - k] / poly[degree]) ** (1 / k) for k in range(1, degree + 1)
+    )
+    radius = radius or 1.0
+    return [
+        radius * cmath.exp(1j * (2 * math.pi * k / degree + 0.4))
+        for k in range(degree)
+    ]
+
+
+def aberth(poly: List[float], tol: float, max_iter: int) -> List[complex]:
+    """
+    Aberth-Ehrlich iteration: every guess takes a Newton step that is
+    pushed away from all the other guesses, so they each settle on a
+    different root. poly must have a nonzero leading and constant term.
+    """
+    roots = _initial_guesses(poly)
+    # |p(z)| below this is as close to zero as rounding allows
+    magnitudes = [abs(coefficient) for coefficient in poly]
+    done = [False] * len(roots)
+
+    for _ in range(max_iter):
+        for k, z in enumerate(roots):
+            if done[k]:
+                continue
+            value, slope = evaluate_with_derivative(poly, z)
+            if abs(value) <= 4 * EPSILON * evaluate(magnitudes, abs(z)):
+                done[k] = True
+                continue
+
+            # newton's step is value / slope, aberth's is 1 / (slope / value - S)
+            # where S sums 1 / (z - other) over the other guesses
+            repulsion = sum(1 / (z - other) for j, other in enumerate(roots) if j != k)
+            denominator = slope / value - repulsion
+            if denominator:
+                correction = 1 / denominator
+            else:
+                # a saddle between guesses, nudge it off
+                correction = tol * max(1.0, abs(z)) * (1 + 1j)
+            roots[k] = z - correction
+            if abs(correction) <= tol * max(1.0, abs(z)):
+                done[k] = True
+
+        if all(done):
+            return roots
+
+    raise ArithmeticError(f"aberth iteration didn't converge in {max_iter} steps")
+
+
+def companion(poly: List[float]) -> List[complex]:
+    """
+    The eigenvalues of poly's companion matrix, which are its roots, by way
+    of numpy.roots. Raises ImportError when NumPy isn't installed.
+    """
+    import numpy as np
+
+    return [complex(root) for root in np.roots(poly[::-1])]
+
+
+METHODS = {"aberth": aberth, "companion": companion}
+
+
+def find_all_roots(
+    poly: Coefficients,
+    method: str = "aberth",
+    tol: float = 1e-12,
+    max_iter: int = 500,
+) -> List[complex]:
+    """
+    Returns all degree roots of poly, a list of coefficients like the ones
+    get_coefficients makes (or the sparse dict form), repeated roots as many
+    times as they repeat, sorted by real part then imaginary part.
+
+    method is "aberth", in pure python, or "companion", which needs NumPy.
+    Each aberth step costs O(degree^2), so for high degrees the companion
+    matrix is faster.
+    """
+    if method not in METHODS:
+        raise ValueError(f"unknown method {method!r}, expected one of {set(METHODS)}")
+
+    poly = _trimmed(poly)
+    # x^k factors out as k roots at 0
+    zeros = 0
+    while poly[zeros] == 0:
+        zeros += 1
+    poly = poly[zeros:]
+
+    roots = [0j] * zeros
+    if len(poly) > 1:
+        if method == "aberth":
+            roots += aberth(poly, tol, max_iter)
+        else:
+            roots += companion(poly)
+    # rounding keeps a conjugate pair together when their real parts differ
+    # only by rounding error
+    return sorted(roots, key=lambda root: (round(root.real, 9), root.imag))
+
+
+def real_roots(roots: Sequence[complex], tol: float = 1e-9) -> List[float]:
+    """
+    The real parts of those roots whose imaginary part is within tol of 0.
+    """
+    return [root.real for root in roots if abs(root.imag) <= tol]
@@ -0,0 +1,94 @@
+import cmath
+import random
+
+import pytest
+
+from all_roots import find_all_roots, real_roots
+from assignment1 import evaluate, get_coefficients
+
+METHODS = ["aberth", "companion"]
+
+
+@pytest.fixture(params=METHODS)
+def method(request):
+    if request.param == "companion":
+        pytest.importorskip("numpy")
+    return request.param
+
+
+# --------------------------------------------------------------------------
+# Tests for find_all_roots
+# --------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "poly, expected",
+    [
+        ([-6, 11, -6, 1], [1, 2, 3]),
+        ([1, 0, 1], [-1j, 1j]),
+        ([0, 0, 2], [0, 0]),  # Roots at zero
+        ([0, -1, 0, 1], [-1, 0, 1]),
+        ([4, 0, 0, 0, 0], []),  # Trailing zeros are dropped
+        ([5], []),  # Constant
+        ({4: 1.0, 0: -1.0}, [-1, -1j, 1j, 1]),  # Sparse
+    ],
+)
+def test_known_roots(poly, expected, method):
+    roots = find_all_roots(poly, method)
+    assert len(roots) == len(expected)
+    for root, exact in zip(roots, expected):
+        assert root == pytest.approx(exact, abs=1e-9)
+
+
+def test_repeated_root(method):
+    # (x - 1)^3, rounding only allows about a third of the digits back
+    roots = find_all_roots([-1, 3, -3, 1], method)
+    assert len(roots) == 3
+    assert all(abs(root - 1) < 1e-4 for root in roots)
+
+
+@pytest.mark.parametrize("degree", [5, 20, 60])
+def test_random_polynomials(degree, method):
+    rng = random.Random(degree)
+    poly = [rng.uniform(-1, 1) for _ in range(degree + 1)]
+    roots = find_all_roots(poly, method)
+
+    assert len(roots) == degree
+    for root in roots:
+        scale = evaluate([abs(c) for c in poly], abs(root))
+        assert abs(evaluate(poly, root)) <= 1e-8 * scale
+
+
+def test_from_get_coefficients():
+    poly = get_coefficients(["-2", "1x^2"])
+    assert real_roots(find_all_roots(poly)) == pytest.approx([-(2**0.5), 2**0.5])
+
+
+def test_matches_companion():
+    pytest.importorskip("numpy")
+    rng = random.Random(0)
+    poly = [rng.uniform(-1, 1) for _ in range(31)]
+    companion = find_all_roots(poly, "companion")
+    for root in find_all_roots(poly, "aberth"):
+        assert min(abs(root - other) for other in companion) < 1e-9
+
+
+@pytest.mark.parametrize("poly", [[], [0, 0]])
+def test_zero_polynomial(poly):
+    with pytest.raises(ValueError):
+        find_all_roots(poly)
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        find_all_roots([1, 1], "guess")
+
+
+# --------------------------------------------------------------------------
+# Tests for real_roots
+# --------------------------------------------------------------------------
+
+
+def test_real_roots():
+    roots = [-2 + 0j, 1 - 1e-12j, cmath.sqrt(-1), 3 + 0.5j]
+    assert real_roots(roots) == [-2, 1]
@@ -1,4 +1,7 @@
 # using the black python formatter if you're curious
+from typing import Callable, List, Tuple
+
+
 def is_valid_number(num: str) -> bool:
     """
     Returns True if and only if num is represents a valid number.
@@ -51,53 +54,11 @@ def is_valid_term(term: str) -> bool:
     >>> is_valid_term("7x^ 8.8")
     False
     """
-    if not term:
-        return False
-    elif term.count("^") > 1:
-        return False
-
-    xIndex = term.find("x")
-
-    # degree 0
-    if xIndex == -1:
-        if not is_valid_number(term):
-            return False
-
-        coefficient = get_coefficient(term)
-        degree = degree_of(term)
-        return degree == 0 and coefficient == float(term)
-
-    coefficient_string = term[:xIndex]
-    if not coefficient_string or not is_valid_number(coefficient_string):
-        return False
-
-    # degree 1
-    if xIndex == len(term) - 1:
-        coefficient = get_coefficient(term)
-        degree = degree_of(term)
-        return degree == 1 and coefficient == float(coefficient_string)
-
-    # degree 3 and up
-    if term[xIndex + 1] != "^":
-        return False
-
-    degree_string = term[xIndex + 2 :]
-
-    if (
-        not degree_string
-        or degree_string.count(".") >= 1
-        or degree_string.count("-") >= 1
-        or not is_valid_number(degree_string)
-    ):
-        return False
-
-    degree_value = int(degree_string)
-    if degree_value <= 0:
+    try:
+        parse_term(term)
+    except PolynomialSyntaxError:
         return False
-
-    coefficient = get_coefficient(term)
-    degree = degree_of(term)
-    return degree == degree_value and coefficient == float(coefficient_string)
+    return True
 
 
 def approx_equal(x: float, y: float, tol: float) -> bool:
@@ -161,6 +122,128 @@ def get_coefficient(term: str) -> float:
     return float(coefficient)
 
 
+DIGITS = "0123456789"
+
+
+class PolynomialSyntaxError(ValueError):
+    """
+    Raised when a term or polynomial isn't valid. offset is the index in
+    text of the first character that's wrong.
+    """
+
+    def __init__(self, message: str, text: str, offset: int) -> None:
+        super().__init__(f"{message} at offset {offset} in {text!r}")
+        self.message = message
+        self.text = text
+        self.offset = offset
+
+
+def _parse_term(
+    text: str, start: int, end: int, number: Callable[[str], float]
+) -> Tuple[float, int]:
+    # reads the term in text[start:end] from left to right exactly once
+    index = start
+    if index < end and text[index] == "-":
+        index += 1
+
+    digits = 0
+    seen_point = False
+    while index < end:
+        character = text[index]
+        if character in DIGITS:
+            digits += 1
+        elif character == "." and not seen_point:
+            seen_point = True
+        else:
+            break
+        index += 1
+
+    if not digits:
+        raise PolynomialSyntaxError("expected a number", text, index)
+    coefficient = number(text[start:index])
+
+    # degree 0
+    if index == end:
+        return coefficient, 0
+    if text[index] != "x":
+        raise PolynomialSyntaxError("expected 'x'", text, index)
+    index += 1
+
+    # degree 1
+    if index == end:
+        return coefficient, 1
+    if text[index] != "^":
+        raise PolynomialSyntaxError("expected '^' after 'x'", text, index)
+    index += 1
+
+    degree_start = index
+    while index < end and text[index] in DIGITS:
+        index += 1
+    if index == degree_start:
+        raise PolynomialSyntaxError("expected a whole number degree", text, index)
+    if index != end:
+        raise PolynomialSyntaxError("unexpected character", text, index)
+
+    degree = int(text[degree_start:end])
+    if degree <= 0:
+        raise PolynomialSyntaxError("degree must be positive", text, degree_start)
+    return coefficient, degree
+
+
+def parse_term(
+    term: str, number: Callable[[str], float] = float
+) -> Tuple[float, int]:
+    """
+    Returns the coefficient and degree of term, in one pass over it.
+    Raises PolynomialSyntaxError if term isn't a valid term. number turns
+    the digits of the coefficient into a number, and is called once per
+    term; fractions.Fraction or decimal.Decimal keep it exact.
+
+    >>> parse_term("44.4x^6")
+    (44.4, 6)
+    >>> parse_term("-7x")
+    (-7.0, 1)
+    >>> parse_term("7x8")
+    Traceback (most recent call last):
+    ...
+    assignment1.PolynomialSyntaxError: expected '^' after 'x' at offset 2 in '7x8'
+    """
+    return _parse_term(term, 0, len(term), number)
+
+
+def parse_polynomial(
+    poly_string: str, number: Callable[[str], float] = float
+) -> List[Tuple[float, int]]:
+    """
+    Returns the (coefficient, degree) of every "+" separated term of
+    poly_string, in the order they appear, with coefficients made by number
+    as in parse_term. Surrounding whitespace is ignored. Raises
+    PolynomialSyntaxError, with the offset into poly_string, at the first
+    term that isn't valid.
+
+    >>> parse_polynomial("-2+1x^2")
+    [(-2.0, 0), (1.0, 2)]
+    >>> parse_polynomial("1x+2y")
+    Traceback (most recent call last):
+    ...
+    assignment1.PolynomialSyntaxError: expected 'x' at offset 4 in '1x+2y'
+    """
+    start, end = 0, len(poly_string)
+    while start < end and poly_string[start].isspace():
+        start += 1
+    while end > start and poly_string[end - 1].isspace():
+        end -= 1
+
+    terms = []
+    while True:
+        plus = poly_string.find("+", start, end)
+        if plus == -1:
+            terms.append(_parse_term(poly_string, start, end, number))
+            return terms
+        terms.append(_parse_term(poly_string, start, plus, number))
+        start = plus + 1
+
+
 # Do not worry about the code past this point.
 # ********************************************
 
@@ -175,56 +258,143 @@ def derive(poly):
 
 
 def get_coefficients(terms):
+    # terms can come in any order, and terms of the same degree add up
     poly = []
-    degree = 0
-    for term in terms:
-        while degree != degree_of(term):
+    for coefficient, degree in map(parse_term, terms):
+        while len(poly) <= degree:
             poly.append(0)
-            degree += 1
-        poly.append(get_coefficient(term))
-        degree += 1
+        poly[degree] += coefficient
     return poly
 
 
 def evaluate(poly, x):
+    # horner's scheme: a + bx + cx^2 == a + x(b + x(c)), one multiply and
+    # one add per coefficient instead of a power for every term
     value = 0
-    degree = 0
-    for coefficient in poly:
-        degree += 1
-        value += coefficient * x**degree
+    for coefficient in reversed(poly):
+        value = value * x + coefficient
     return value
 
 
-if __name__ == "__main__":
+def evaluate_with_derivative(poly, x):
+    # runs horner's scheme on poly and, alongside it, on its derivative,
+    # so a newton step needs one pass over the coefficients instead of two
+    value = 0
+    slope = 0
+    for coefficient in reversed(poly):
+        slope = slope * x + value
+        value = value * x + coefficient
+    return value, slope
+
+
+# a polynomial with fewer terms than this fraction of its degree is
+# faster to evaluate in sparse form, going by newton_bench.py
+SPARSE_DENSITY = 0.1
+
+
+def get_sparse_coefficients(terms):
+    # maps each degree to its coefficient, leaving out degrees that don't
+    # appear, so a high degree with few terms stays small
+    return sum_terms(map(parse_term, terms))
+
+
+def sum_terms(parsed):
+    # parsed is (coefficient, degree) pairs, as from parse_polynomial
+    poly = {}
+    for coefficient, degree in parsed:
+        poly[degree] = poly.get(degree, 0) + coefficient
+    return {degree: c for degree, c in poly.items() if c != 0}
+
+
+def is_sparse(poly):
+    # poly is in sparse form, true if sparse form is the faster one for it
+    degree = max(poly, default=0)
+    return len(poly) < SPARSE_DENSITY * (degree + 1)
 
-    poly_string = input("Please enter a polynomial: ")
-    terms = poly_string.strip().split("+")
 
-    valid_poly = True
-    for term in terms:
-        if not is_valid_term(term):
-            valid_poly = False
+def to_dense(poly):
+    dense = [0] * (max(poly, default=-1) + 1)
+    for degree, coefficient in poly.items():
+        dense[degree] = coefficient
+    return dense
 
-    while not valid_poly:
-        poly_string = input("Incorrect format. Please enter a polynomial: ")
-        terms = poly_string.strip().split("+")
 
-        valid_poly = True
-        for term in terms:
-            if not is_valid_term(term):
-                valid_poly = False
+def derive_sparse(poly):
+    return {
+        degree - 1: coefficient * degree
+        for degree, coefficient in poly.items()
+        if degree > 0
+    }
+
+
+def power(x, n):
+    # exponentiation by squaring, about log2(n) multiplications
+    result = 1
+    while n:
+        if n & 1:
+            result *= x
+        n >>= 1
+        if n:
+            x *= x
+    return result
+
+
+def sparse_terms(poly):
+    # poly's (degree, coefficient) pairs from the highest degree down, the
+    # order the sparse horner's scheme goes through them in
+    return tuple(sorted(poly.items(), reverse=True))
+
+
+def evaluate_sparse(poly, x):
+    return evaluate_terms_with_derivative(sparse_terms(poly), x)[0]
+
+
+def evaluate_sparse_with_derivative(poly, x):
+    return evaluate_terms_with_derivative(sparse_terms(poly), x)
+
+
+def evaluate_terms(terms, x):
+    return evaluate_terms_with_derivative(terms, x)[0]
+
+
+def evaluate_terms_with_derivative(terms, x):
+    # horner's scheme over only the terms that are there, jumping each gap
+    # between degrees with a power: if q = v*x^g then q' = v'*x^g + g*v*x^(g-1)
+    # terms comes from sparse_terms, so something evaluated again and again
+    # only has to be sorted once
+    value = 0
+    slope = 0
+    for index, (degree, coefficient) in enumerate(terms):
+        value += coefficient
+        lower = terms[index + 1][0] if index + 1 < len(terms) else 0
+        gap = degree - lower
+        if gap:
+            below = power(x, gap - 1)
+            slope = (slope * x + gap * value) * below
+            value = value * x * below
+    return value, slope
+
+
+if __name__ == "__main__":
+    from polynomial import Polynomial
+    from solvers import RootNotFoundError
+
+    poly_string = input("Please enter a polynomial: ")
+    while True:
+        try:
+            polynomial = Polynomial(poly_string)
+            break
+        except PolynomialSyntaxError as error:
+            poly_string = input(
+                f"Incorrect format, {error.message} at character "
+                f"{error.offset + 1}. Please enter a polynomial: "
+            )
 
-    poly = get_coefficients(terms)
-    derivative = derive(poly)
     current_value = float(input("Please enter a starting point: "))
     tol = float(input("Please enter a tolerance: "))
 
-    next_value = current_value - (
-        evaluate(poly, current_value) / evaluate(derivative, current_value)
-    )
-    while not (approx_equal(current_value, next_value, tol)):
-        current_value = next_value
-        next_value = current_value - (
-            evaluate(poly, current_value) / evaluate(derivative, current_value)
-        )
-    print("The polynoimal has a 'zero' approximately at: " + str(next_value))
+    try:
+        next_value = polynomial.find_root(current_value, tol)
+        print("The polynoimal has a 'zero' approximately at: " + str(next_value))
+    except RootNotFoundError as error:
+        print(f"Couldn't find a 'zero', {error}")
@@ -1,5 +1,7 @@
 import pytest
 import math
+from decimal import Decimal
+from fractions import Fraction
 
 # Assuming assignment1.py is available and contains the required functions
 from assignment1 import (
@@ -8,6 +10,12 @@ from assignment1 import (
     approx_equal,
     degree_of,
     get_coefficient,
+    derive,
+    evaluate,
+    evaluate_with_derivative,
+    parse_term,
+    parse_polynomial,
+    PolynomialSyntaxError,
 )
 
 # --------------------------------------------------------------------------
@@ -194,3 +202,150 @@ def test_is_valid_term_pass(term):
 def test_is_valid_term_fail(term):
     """Tests cases where is_valid_term should return False."""
     assert is_valid_term(term) is False
+
+
+# --------------------------------------------------------------------------
+# Tests for evaluate, evaluate_with_derivative and derive
+# --------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "poly, x, expected",
+    [
+        ([1, 2, 3], 2, 17),  # 1 + 2(2) + 3(2^2)
+        ([5], 10, 5),  # Constant
+        ([0, 1], -4, -4),  # Identity
+        ([-2, 0, 1], 0, -2),  # Evaluated at zero
+        ([], 3, 0),  # Empty polynomial
+        ([1.5, 0, 0, -2], 0.5, 1.25),  # Float coefficients
+    ],
+)
+def test_evaluate_pass(poly, x, expected):
+    """Tests that evaluate gives the value of the polynomial at x."""
+    assert evaluate(poly, x) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize(
+    "poly, x",
+    [
+        ([1, 2, 3], 2),
+        ([5], 10),
+        ([-2, 0, 1], 0),
+        ([3, -1, 4, 1, -5, 9], -1.5),
+        ([0.5] * 20, 0.9),
+    ],
+)
+def test_evaluate_with_derivative_pass(poly, x):
+    """Tests the fused pass against evaluating poly and its derivative."""
+    value, slope = evaluate_with_derivative(poly, x)
+    assert value == pytest.approx(evaluate(poly, x))
+    assert slope == pytest.approx(evaluate(derive(poly), x))
+
+
+@pytest.mark.parametrize(
+    "poly, x, not_expected",
+    [
+        ([1, 2, 3], 2, 34),  # Wrong - every power one too high
+        ([-2, 0, 1], 0, 0),  # Wrong - loses the constant term
+    ],
+)
+def test_evaluate_fail(poly, x, not_expected):
+    """Tests that evaluate doesn't shift the degree of every term."""
+    assert evaluate(poly, x) != not_expected
+
+
+# --------------------------------------------------------------------------
+# Tests for parse_term and parse_polynomial
+# --------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "term, expected",
+    [
+        ("44.4x^6", (44.4, 6)),
+        ("-7x", (-7.0, 1)),
+        ("9.9", (9.9, 0)),
+        ("-0", (-0.0, 0)),
+        ("1x^01", (1.0, 1)),  # Leading zero in the degree
+    ],
+)
+def test_parse_term_pass(term, expected):
+    """Tests that parse_term agrees with get_coefficient and degree_of."""
+    assert parse_term(term) == expected
+    assert parse_term(term) == (get_coefficient(term), degree_of(term))
+
+
+@pytest.mark.parametrize(
+    "term, offset",
+    [
+        ("", 0),  # Nothing to parse
+        ("-", 1),  # Sign without digits
+        ("x^2", 0),  # Missing coefficient
+        ("12.9.0", 4),  # Second decimal point
+        ("7y**8", 1),  # Wrong variable
+        ("7x8", 2),  # Missing caret
+        ("7x^ 8", 3),  # Space in the degree
+        ("7x^8.8", 4),  # Decimal degree
+        ("7x^0", 3),  # Zero degree
+        ("7x^-1", 3),  # Negative degree
+        ("1x^2^3", 4),  # Two carets
+    ],
+)
+def test_parse_term_fail(term, offset):
+    """Tests that parse_term points at the first character that's wrong."""
+    with pytest.raises(PolynomialSyntaxError) as error:
+        parse_term(term)
+    assert error.value.offset == offset
+    assert isinstance(error.value, ValueError)
+
+
+@pytest.mark.parametrize(
+    "poly_string, expected",
+    [
+        ("-2+1x^2", [(-2.0, 0), (1.0, 2)]),
+        ("  1x^3+2x+3\n", [(1.0, 3), (2.0, 1), (3.0, 0)]),
+        ("5", [(5.0, 0)]),
+    ],
+)
+def test_parse_polynomial_pass(poly_string, expected):
+    """Tests that every term comes back in order."""
+    assert parse_polynomial(poly_string) == expected
+
+
+@pytest.mark.parametrize(
+    "poly_string, offset",
+    [
+        ("", 0),  # Empty polynomial
+        ("1+", 2),  # Empty last term
+        ("1++2", 2),  # Empty middle term
+        ("  1x+2y", 6),  # Offset counts the leading whitespace
+        ("1x^2 + 3", 4),  # Spaces around the plus
+    ],
+)
+def test_parse_polynomial_fail(poly_string, offset):
+    """Tests that the offset is into the whole polynomial string."""
+    with pytest.raises(PolynomialSyntaxError) as error:
+        parse_polynomial(poly_string)
+    assert error.value.offset == offset
+
+
+@pytest.mark.parametrize(
+    "term, number, expected",
+    [
+        ("0.1x^3", Fraction, (Fraction(1, 10), 3)),
+        ("-2.5", Fraction, (Fraction(-5, 2), 0)),
+        ("1.x", Fraction, (Fraction(1), 1)),  # Trailing decimal point
+        ("0.1x", Decimal, (Decimal("0.1"), 1)),
+    ],
+)
+def test_parse_term_exact(term, number, expected):
+    """Tests that number is given the coefficient's digits untouched."""
+    coefficient, degree = parse_term(term, number)
+    assert (coefficient, degree) == expected
+    assert type(coefficient) is number
+
+
+def test_parse_term_number_called_once():
+    calls = []
+    parse_polynomial("1.5x^2+-3+4x", lambda digits: calls.append(digits) or 0)
+    assert calls == ["1.5", "-3", "4"]
@@ -0,0 +1,142 @@
+"""
+Finds roots for polynomials read from a file, one per line, instead of
+from input().
+
+    python ingest.py polynomials.txt --start 1 --tol 0.0001
+    cat polynomials.txt | python ingest.py - --cache-size 4096
+
+Lines are read one at a time and a result is printed for each as soon as
+it's ready, so memory use doesn't grow with the size of the input. The
+same polynomial string showing up more than once is only parsed once,
+as long as it's still in the cache of recently parsed polynomials.
+"""
+
+import argparse
+import sys
+from contextlib import nullcontext
+from functools import lru_cache
+from typing import (
+    IO,
+    ContextManager,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Sequence,
+)
+
+from assignment1 import PolynomialSyntaxError
+from polynomial import Polynomial
+
+DEFAULT_CACHE_SIZE = 1024
+
+
+class Ingested(NamedTuple):
+    line_number: int  # counting from 1
+    poly_string: str
+    polynomial: Optional[Polynomial]  # None if the line isn't valid
+    error: Optional[PolynomialSyntaxError]
+
+
+class ParseCache:
+    """
+    Parses polynomial strings into Polynomial objects (coefficients and
+    derivative), keeping the maxsize most recently used ones so a repeated
+    string is only parsed the first time. Invalid strings aren't cached.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE) -> None:
+        self._parse = lru_cache(maxsize=maxsize)(Polynomial)
+
+    def parse(self, poly_string: str) -> Polynomial:
+        return self._parse(poly_string.strip())
+
+    @property
+    def hits(self) -> int:
+        return self._parse.cache_info().hits
+
+    @property
+    def misses(self) -> int:
+        return self._parse.cache_info().misses
+
+    def cache_info(self):
+        return self._parse.cache_info()
+
+    def clear(self) -> None:
+        self._parse.cache_clear()
+
+
+def ingest(lines: Iterable[str], cache: ParseCache) -> Iterator[Ingested]:
+    """
+    Yields an Ingested for each non blank line of lines, parsing it
+    through cache. lines is only read as far as the results asked for.
+    """
+    for line_number, line in enumerate(lines, start=1):
+        poly_string = line.strip()
+        if not poly_string:
+            continue
+        try:
+            yield Ingested(line_number, poly_string, cache.parse(poly_string), None)
+        except PolynomialSyntaxError as error:
+            yield Ingested(line_number, poly_string, None, error)
+
+
+def find_root(
+    polynomial: Polynomial,
+    start: float,
+    tol: float,
+    max_iter: int,
+    method: str = "newton",
+) -> Optional[float]:
+    """
+    Returns the root polynomial.solve finds from start, or None if it
+    stops without one, so one polynomial without a real root doesn't
+    hold up the rest of the file.
+    """
+    result = polynomial.solve(start, tol, method, max_iter)
+    return result.root if result.converged else None
+
+
+def open_input(path: str) -> ContextManager[IO[str]]:
+    # stdin is left open for whoever else wants it
+    if path == "-":
+        return nullcontext(sys.stdin)
+    return open(path, encoding="utf-8")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("input", help="file of polynomials, or - for stdin")
+    parser.add_argument("--start", type=float, default=1.0)
+    parser.add_argument("--tol", type=float, default=0.0001)
+    parser.add_argument("--max-iter", type=int, default=100)
+    parser.add_argument("--method", choices=["newton", "halley"], default="newton")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE)
+    args = parser.parse_args(argv)
+
+    cache = ParseCache(args.cache_size)
+    invalid = 0
+    with open_input(args.input) as lines:
+        for result in ingest(lines, cache):
+            if result.polynomial is None:
+                invalid += 1
+                print(f"{result.line_number}: invalid, {result.error}")
+                continue
+            root = find_root(
+                result.polynomial, args.start, args.tol, args.max_iter, args.method
+            )
+            if root is None:
+                print(f"{result.line_number}: no root found")
+            else:
+                print(f"{result.line_number}: {root}")
+
+    print(
+        f"{invalid} invalid lines, parse cache {cache.hits} hits "
+        f"{cache.misses} misses",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,81 @@
+import math
+
+import pytest
+
+from assignment1 import PolynomialSyntaxError
+from ingest import ParseCache, find_root, ingest, main
+from polynomial import Polynomial
+
+# --------------------------------------------------------------------------
+# Tests for ParseCache and ingest
+# --------------------------------------------------------------------------
+
+
+def test_repeated_strings_parsed_once():
+    cache = ParseCache()
+    lines = ["-2+1x^2\n", "1x+-1\n", "-2+1x^2\n", " -2+1x^2 \n"]
+    results = list(ingest(lines, cache))
+
+    assert [result.line_number for result in results] == [1, 2, 3, 4]
+    assert results[0].polynomial is results[2].polynomial is results[3].polynomial
+    assert results[0].polynomial.coefficients == [-2.0, 0, 1.0]
+    assert results[0].polynomial.derivative == [0, 2.0]
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_cache_is_bounded():
+    cache = ParseCache(maxsize=1)
+    list(ingest(["1x", "2x", "1x"], cache))
+    assert (cache.hits, cache.misses) == (0, 3)
+    assert cache.cache_info().currsize == 1
+
+
+def test_invalid_and_blank_lines():
+    results = list(ingest(["1x+2y\n", "\n", "1x\n"], ParseCache()))
+
+    assert [result.line_number for result in results] == [1, 3]
+    assert results[0].polynomial is None
+    assert isinstance(results[0].error, PolynomialSyntaxError)
+    assert results[0].error.offset == 4
+    assert results[1].error is None
+
+
+def test_reads_lazily():
+    def lines():
+        yield "1x"
+        raise AssertionError("read past the first line")
+
+    results = ingest(lines(), ParseCache())
+    assert next(results).polynomial.coefficients == [0, 1.0]
+
+
+# --------------------------------------------------------------------------
+# Tests for find_root and main
+# --------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "poly_string, start, expected",
+    [
+        ("-2+1x^2", 1, math.sqrt(2)),
+        ("1+1x^2", 1, None),  # No real root
+        ("1+1x^2", 0, None),  # Flat at the start
+    ],
+)
+def test_find_root(poly_string, start, expected):
+    root = find_root(Polynomial(poly_string), start, 1e-10, 100)
+    assert root == (None if expected is None else pytest.approx(expected))
+
+
+def test_main(tmp_path, capsys):
+    path = tmp_path / "polynomials.txt"
+    path.write_text("-2+1x^2\n1+1x^2\nbad\n-2+1x^2\n")
+
+    assert main([str(path), "--start", "1", "--tol", "1e-10"]) == 0
+    out, err = capsys.readouterr()
+    lines = out.splitlines()
+    assert float(lines[0].split(": ")[1]) == pytest.approx(math.sqrt(2))
+    assert lines[1] == "2: no root found"
+    assert lines[2].startswith("3: invalid, expected a number at offset 0")
+    assert lines[3] == lines[0].replace("1:", "4:")
+    assert "1 invalid lines, parse cache 1 hits 3 misses" in err
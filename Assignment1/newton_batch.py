@@ -0,0 +1,134 @@
+"""
+Newton's method on a whole array of starting points at once. Every lane
+takes its Newton step in the same few array operations, and lanes drop
+out as they converge, so scanning thousands of seeds doesn't cost a python
+loop per seed. Importing this module raises ImportError when NumPy isn't
+installed.
+"""
+
+from typing import Callable, List, Mapping, NamedTuple, Sequence, Tuple, Union
+
+import numpy as np
+
+from assignment1 import sparse_terms
+
+
+class BatchResult(NamedTuple):
+    roots: np.ndarray  # last guess for every lane
+    iterations: np.ndarray  # newton steps each lane took
+    converged: np.ndarray  # True where two guesses came within tol
+
+
+def evaluate_arrays(
+    poly: Union[Sequence[float], Mapping[int, float]], xs: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Evaluates poly and its derivative at every value in xs with horner's
+    scheme, one pass over the coefficients for the whole array. poly may
+    also be in sparse {degree: coefficient} form.
+    """
+    return _evaluator(poly)(xs)
+
+
+def _evaluator(
+    poly: Union[Sequence[float], Mapping[int, float]],
+) -> Callable[[np.ndarray], Tuple[np.ndarray, np.ndarray]]:
+    # sparse terms are sorted here once, not on every newton step
+    if isinstance(poly, Mapping):
+        terms = sparse_terms(poly)
+        return lambda xs: _evaluate_terms(terms, xs)
+    return lambda xs: _evaluate_dense(poly, xs)
+
+
+def _evaluate_terms(
+    terms: Sequence[Tuple[int, float]], xs: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    # same as evaluate_terms_with_derivative, a power for each gap
+    values = np.zeros_like(xs, dtype=float)
+    slopes = np.zeros_like(xs, dtype=float)
+    for index, (degree, coefficient) in enumerate(terms):
+        values = values + coefficient
+        lower = terms[index + 1][0] if index + 1 < len(terms) else 0
+        gap = degree - lower
+        if gap:
+            below = xs ** (gap - 1)
+            slopes = (slopes * xs + gap * values) * below
+            values = values * xs * below
+    return values, slopes
+
+
+def _evaluate_dense(
+    poly: Sequence[float], xs: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    values = np.zeros_like(xs, dtype=float)
+    slopes = np.zeros_like(xs, dtype=float)
+    for coefficient in reversed(poly):
+        slopes = slopes * xs + values
+        values = values * xs + coefficient
+    return values, slopes
+
+
+def newton_batch(
+    poly: Union[Sequence[float], Mapping[int, float]],
+    starts: Sequence[float],
+    tol: float,
+    max_iter: int = 100,
+) -> BatchResult:
+    """
+    Runs Newton's method on poly from every one of starts. A lane stops
+    once two guesses in a row are within tol of each other (the same test
+    as approx_equal), or once a guess is exactly a root, even where the
+    derivative is zero, as with solvers.solve. A lane also stops if a step
+    isn't a finite number, in which case it keeps its last finite guess and
+    isn't marked as converged. No lane takes more than max_iter steps.
+    """
+    roots = np.array(starts, dtype=float)
+    iterations = np.zeros(roots.shape, dtype=int)
+    converged = np.zeros(roots.shape, dtype=bool)
+    active = np.ones(roots.shape, dtype=bool)
+    evaluate = _evaluator(poly)
+
+    for _ in range(max_iter):
+        lanes = np.flatnonzero(active)
+        if lanes.size == 0:
+            break
+
+        current = roots[lanes]
+        values, slopes = evaluate(current)
+        # like newton_step, a lane already on a root stays put, so a zero
+        # slope there doesn't make a failed step
+        with np.errstate(divide="ignore", invalid="ignore"):
+            following = np.where(values == 0, current, current - values / slopes)
+
+        finite = np.isfinite(following)
+        finished = finite & (np.abs(current - following) <= tol)
+        roots[lanes] = np.where(finite, following, current)
+        iterations[lanes] += finite
+        converged[lanes[finished]] = True
+        active[lanes[finished | ~finite]] = False
+
+    return BatchResult(roots, iterations, converged)
+
+
+def scan(
+    poly: Union[Sequence[float], Mapping[int, float]],
+    low: float,
+    high: float,
+    seeds: int,
+    tol: float,
+    max_iter: int = 100,
+) -> List[float]:
+    """
+    Seeds Newton's method at seeds evenly spaced points from low to high
+    and returns the distinct roots found inside [low, high], in order.
+    Roots closer together than tol count as the same root.
+    """
+    result = newton_batch(poly, np.linspace(low, high, seeds), tol, max_iter)
+    found = np.sort(result.roots[result.converged])
+    found = found[(found >= low) & (found <= high)]
+
+    distinct: List[float] = []
+    for root in found:
+        if not distinct or root - distinct[-1] > tol:
+            distinct.append(float(root))
+    return distinct
@@ -0,0 +1,91 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from assignment1 import evaluate, evaluate_with_derivative
+from newton_batch import evaluate_arrays, newton_batch, scan
+from polynomial import Polynomial
+
+CUBIC = [-6, 11, -6, 1]  # (x - 1)(x - 2)(x - 3)
+
+
+# --------------------------------------------------------------------------
+# Tests for evaluate_arrays
+# --------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("poly", [CUBIC, [5], [], [0.5, -1.5, 0, 2, 1]])
+def test_evaluate_arrays(poly):
+    xs = np.linspace(-2, 2, 9)
+    values, slopes = evaluate_arrays(poly, xs)
+    for x, value, slope in zip(xs, values, slopes):
+        assert (value, slope) == pytest.approx(evaluate_with_derivative(poly, x))
+
+
+# --------------------------------------------------------------------------
+# Tests for newton_batch
+# --------------------------------------------------------------------------
+
+
+def test_matches_scalar_newton():
+    """Each lane ends on the same root as the one at a time solver."""
+    starts = [0, 0.5, 1.6, 2.4, 3.5, 10]
+    result = newton_batch(CUBIC, starts, 1e-10)
+    expected = list(Polynomial("-6+11x+-6x^2+1x^3").find_roots(starts, 1e-10))
+
+    assert result.converged.all()
+    assert result.roots == pytest.approx(expected)
+    assert all(abs(evaluate(CUBIC, root)) < 1e-8 for root in result.roots)
+
+
+def test_lanes_stop_independently():
+    """A lane that starts on a root stops straight away."""
+    result = newton_batch(CUBIC, [2.0, 100.0], 1e-12)
+    assert result.iterations[0] == 1
+    assert result.iterations[1] > 5
+
+
+@pytest.mark.parametrize("poly", [[0, 0, 1], {2: 1}])
+def test_start_on_flat_root(poly):
+    """Like solve, a start on a root converges even where the slope is zero."""
+    result = newton_batch(poly, [0.0], 1e-10)
+    scalar = Polynomial("1x^2").solve(0.0, 1e-10)
+
+    assert result.converged[0] and scalar.converged
+    assert result.roots[0] == scalar.root == 0.0
+    assert result.iterations[0] == scalar.iterations == 1
+
+
+def test_flat_derivative_lane():
+    """A zero derivative stops that lane without converging."""
+    result = newton_batch([1, 0, 1], [0.0, 1.0], 1e-10, max_iter=20)
+    assert result.roots[0] == 0.0
+    assert not result.converged[0]
+    assert result.iterations[0] == 0
+
+
+def test_max_iter():
+    """x^2 + 1 has no real roots, so no lane converges."""
+    result = newton_batch([1, 0, 1], [0.5, 3.0], 1e-10, max_iter=25)
+    assert not result.converged.any()
+    assert (result.iterations <= 25).all()
+
+
+# --------------------------------------------------------------------------
+# Tests for scan
+# --------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "poly, low, high, expected",
+    [
+        (CUBIC, 0, 4, [1, 2, 3]),
+        (CUBIC, 1.5, 2.5, [2]),
+        ([-2, 0, 1], -5, 5, [-math.sqrt(2), math.sqrt(2)]),
+        ([1, 0, 1], -5, 5, []),
+    ],
+)
+def test_scan(poly, low, high, expected):
+    assert scan(poly, low, high, 200, 1e-9) == pytest.approx(expected)
@@ -0,0 +1,171 @@
+"""
+Micro-benchmarks for evaluating polynomials and taking Newton steps.
+
+    python newton_bench.py
+    python newton_bench.py --degrees 1 100 10000 --repeat 3
+"""
+
+import argparse
+import random
+import timeit
+from fractions import Fraction
+from typing import List, Optional, Sequence
+
+from assignment1 import (
+    derive,
+    evaluate,
+    evaluate_terms_with_derivative,
+    evaluate_with_derivative,
+    parse_polynomial,
+    sparse_terms,
+    to_dense,
+)
+from polynomial import Polynomial
+
+DEFAULT_DEGREES = [1, 10, 100, 1000, 10000]
+DENSITIES = [0.01, 0.05, 0.1, 0.2, 0.5, 1.0]
+WILKINSON_DEGREES = [10, 15, 20]
+
+
+def evaluate_with_powers(poly: List[float], x: float) -> float:
+    """The old way of evaluating: one power per term."""
+    value = 0
+    for degree, coefficient in enumerate(poly):
+        value += coefficient * x**degree
+    return value
+
+
+def random_poly(degree: int, seed: int = 0) -> List[float]:
+    rng = random.Random(seed)
+    return [rng.uniform(-1, 1) for _ in range(degree + 1)]
+
+
+def best_time(statement, repeat: int) -> float:
+    """Seconds per call of statement, the best of repeat rounds."""
+    timer = timeit.Timer(statement)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def bench_evaluate(degrees: Sequence[int], repeat: int) -> None:
+    # |x| < 1 keeps high powers from overflowing
+    x = 0.999
+    print(f"{'degree':>8} {'powers':>12} {'horner':>12} {'speedup':>8}")
+    for degree in degrees:
+        poly = random_poly(degree)
+        powers = best_time(lambda: evaluate_with_powers(poly, x), repeat)
+        horner = best_time(lambda: evaluate(poly, x), repeat)
+        print(
+            f"{degree:>8} {powers * 1e6:>10.2f}us {horner * 1e6:>10.2f}us "
+            f"{powers / horner:>7.2f}x"
+        )
+
+
+def bench_newton_step(degrees: Sequence[int], repeat: int) -> None:
+    x = 0.999
+    print(f"{'degree':>8} {'two passes':>12} {'fused':>12} {'speedup':>8}")
+    for degree in degrees:
+        poly = random_poly(degree)
+        derivative = derive(poly)
+        separate = best_time(
+            lambda: x - evaluate(poly, x) / evaluate(derivative, x), repeat
+        )
+
+        def fused_step():
+            value, slope = evaluate_with_derivative(poly, x)
+            return x - value / slope
+
+        fused = best_time(fused_step, repeat)
+        print(
+            f"{degree:>8} {separate * 1e6:>10.2f}us {fused * 1e6:>10.2f}us "
+            f"{separate / fused:>7.2f}x"
+        )
+
+
+def bench_density(degree: int, repeat: int) -> None:
+    """
+    Compares dense and sparse evaluation for polynomials of one degree with
+    more and more of their terms filled in. This is where SPARSE_DENSITY in
+    assignment1 comes from.
+    """
+    x = 0.999
+    rng = random.Random(0)
+    print(f"{'density':>8} {'dense':>12} {'sparse':>12} {'sparse/dense':>13}")
+    for density in DENSITIES:
+        degrees = rng.sample(range(degree), max(1, int(density * degree)))
+        sparse = {d: rng.uniform(-1, 1) for d in degrees + [degree]}
+        dense = to_dense(sparse)
+        # sorted once up front, the way Polynomial keeps its sparse terms
+        terms = sparse_terms(sparse)
+        dense_time = best_time(lambda: evaluate_with_derivative(dense, x), repeat)
+        sparse_time = best_time(
+            lambda: evaluate_terms_with_derivative(terms, x), repeat
+        )
+        print(
+            f"{density:>8} {dense_time * 1e6:>10.2f}us "
+            f"{sparse_time * 1e6:>10.2f}us {sparse_time / dense_time:>12.2f}x"
+        )
+
+
+def wilkinson(degree: int) -> str:
+    """
+    (x - 1)(x - 2)...(x - degree) as a polynomial string, famously hard
+    to find the roots of in floating point.
+    """
+    poly = [1]
+    for root in range(1, degree + 1):
+        poly = [0] + poly
+        for index in range(len(poly) - 1):
+            poly[index] -= root * poly[index + 1]
+    return "+".join(
+        f"{coefficient}x^{power}" if power else str(coefficient)
+        for power, coefficient in enumerate(poly)
+    )
+
+
+def bench_exact(degrees: Sequence[int], repeat: int) -> None:
+    """
+    Parses each Wilkinson polynomial with floats and with Fractions, then
+    runs Newton's method from just below its largest root with each.
+    """
+    print(
+        f"{'degree':>8} {'mode':>6} {'parse':>12} {'solve':>12} "
+        f"{'steps':>6} {'status':>10} {'root':>20}"
+    )
+    for degree in degrees:
+        poly_string = wilkinson(degree)
+        start = degree - 0.5
+        for mode, number in (("float", float), ("exact", Fraction)):
+            parse = best_time(lambda: parse_polynomial(poly_string, number), repeat)
+            poly = Polynomial(poly_string, exact=number is Fraction)
+            solve = best_time(lambda: poly.solve(start, 1e-12, max_iter=1000), repeat)
+            result = poly.solve(start, 1e-12, max_iter=1000)
+            print(
+                f"{degree:>8} {mode:>6} {parse * 1e6:>10.2f}us "
+                f"{solve * 1e6:>10.2f}us {result.iterations:>6} "
+                f"{result.status:>10} {float(result.root):>20.15f}"
+            )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--degrees", type=int, nargs="+", default=DEFAULT_DEGREES)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print("evaluate: one power per term vs horner's scheme")
+    bench_evaluate(args.degrees, args.repeat)
+    print()
+    print("newton step: evaluate twice vs evaluate_with_derivative")
+    bench_newton_step(args.degrees, args.repeat)
+    print()
+    print("dense vs sparse evaluation of a degree 1000 polynomial")
+    bench_density(1000, args.repeat)
+    print()
+    print("float vs exact Newton's method on Wilkinson polynomials")
+    bench_exact(WILKINSON_DEGREES, args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,162 @@
+import math
+from fractions import Fraction
+from functools import cached_property
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from assignment1 import (
+    derive,
+    derive_sparse,
+    evaluate,
+    evaluate_terms,
+    evaluate_terms_with_derivative,
+    evaluate_with_derivative,
+    is_sparse,
+    parse_polynomial,
+    sparse_terms,
+    sum_terms,
+    to_dense,
+)
+from solvers import RootNotFoundError, SolveResult, solve
+from sturm import SturmChain, roots_between
+
+# binary places an exact polynomial's newton guesses are rounded to
+EXACT_BITS = 128
+
+
+class Polynomial:
+    """
+    A polynomial parsed once from a string of "+" separated terms, with
+    its derivative worked out up front, so it can be evaluated and have
+    its roots searched for from as many starting points as needed without
+    parsing it again.
+
+    Polynomials with only a few terms for their degree are kept in sparse
+    {degree: coefficient} form, anything else as a list of coefficients.
+
+    With exact=True the coefficients are parsed straight into Fractions,
+    and a Fraction x is evaluated without any rounding at all. Newton's
+    method then works on guesses rounded to EXACT_BITS binary places,
+    which keeps the fractions from growing without end.
+
+    >>> poly = Polynomial("-2+1x^2")
+    >>> poly.coefficients
+    [-2.0, 0, 1.0]
+    >>> poly.derivative
+    [0, 2.0]
+    >>> list(poly.find_roots([1, -1], 0.0001))
+    [1.4142135623746899, -1.4142135623746899]
+    >>> Polynomial("1x^1000000+-1").coefficients
+    {1000000: 1.0, 0: -1.0}
+    >>> Polynomial("0.1x+-0.3", exact=True).coefficients
+    [Fraction(-3, 10), Fraction(1, 10)]
+    """
+
+    def __init__(self, poly_string: str, exact: bool = False) -> None:
+        # raises PolynomialSyntaxError, a ValueError, for an invalid term
+        number = Fraction if exact else float
+        coefficients = sum_terms(parse_polynomial(poly_string, number))
+        self.poly_string = poly_string.strip()
+        self.exact = exact
+        self.sparse = is_sparse(coefficients)
+        if self.sparse:
+            self.coefficients = coefficients
+            self.derivative = derive_sparse(coefficients)
+            # sorted by degree once here rather than on every evaluation
+            self._terms = sparse_terms(self.coefficients)
+            self._derivative_terms = sparse_terms(self.derivative)
+            self._evaluate = evaluate_terms
+            self._evaluate_with_derivative = evaluate_terms_with_derivative
+        else:
+            self.coefficients = to_dense(coefficients)
+            self.derivative = derive(self.coefficients)
+            self._terms = self.coefficients
+            self._derivative_terms = self.derivative
+            self._evaluate = evaluate
+            self._evaluate_with_derivative = evaluate_with_derivative
+
+    def __call__(self, x: float) -> float:
+        return self._evaluate(self._terms, x)
+
+    def evaluate_with_derivative(self, x: float) -> Tuple[float, float]:
+        return self._evaluate_with_derivative(self._terms, x)
+
+    def slope_with_curvature(self, x: float) -> Tuple[float, float]:
+        """The first and second derivatives at x."""
+        return self._evaluate_with_derivative(self._derivative_terms, x)
+
+    def solve(
+        self,
+        start: float,
+        tol: float,
+        method: str = "newton",
+        max_iter: int = 100,
+        bracket: Optional[Tuple[float, float]] = None,
+    ) -> SolveResult:
+        """
+        Looks for a root from start with one of the methods in solvers,
+        which always stop, and returns how that went.
+        """
+        if self.exact:
+            start = Fraction(start)
+        return solve(self, start, tol, method, max_iter, bracket)
+
+    def rounded(self, x: float) -> float:
+        """
+        x, rounded to EXACT_BITS binary places if this polynomial is exact.
+        The solvers round every guess with this.
+        """
+        if not self.exact:
+            return x
+        scale = 1 << EXACT_BITS
+        return Fraction(round(x * scale), scale)
+
+    def find_root(self, start: float, tol: float, max_iter: int = 100) -> float:
+        """
+        Uses Newton's method from start until two guesses in a row are
+        within tol of each other, and returns the last guess. Raises
+        RootNotFoundError if that doesn't happen within max_iter steps, or
+        the derivative goes flat, or the guesses cycle or overflow.
+        """
+        result = self.solve(start, tol, max_iter=max_iter)
+        if not result.converged:
+            raise RootNotFoundError(start, result)
+        return result.root
+
+    def find_roots(
+        self, starts: Iterable[float], tol: float, max_iter: int = 100
+    ) -> Iterator[Optional[float]]:
+        """
+        Yields the root found from each of starts in turn, or None for a
+        start the solver stops from without one, so one bad start doesn't
+        end the rest. starts can be any iterable, and isn't read ahead of
+        the roots being asked for.
+        """
+        for start in starts:
+            result = self.solve(start, tol, max_iter=max_iter)
+            yield result.root if result.converged else None
+
+    @cached_property
+    def sturm(self) -> SturmChain:
+        """
+        The Sturm chain, worked out the first time it's needed and kept for
+        every interval query after that.
+        """
+        if self.sparse:
+            return SturmChain(to_dense(self.coefficients))
+        return SturmChain(self.coefficients)
+
+    def count_roots(self, low: float = -math.inf, high: float = math.inf) -> int:
+        """The number of distinct real roots in (low, high]."""
+        return self.sturm.count_roots(low, high)
+
+    def roots_between(self, low: float, high: float, tol: float) -> List[float]:
+        """
+        Every distinct real root in (low, high], in order, each found by
+        Newton's method inside a bracket known to hold just that root.
+        """
+        return roots_between(self, low, high, tol)
+
+    def __repr__(self) -> str:
+        if self.exact:
+            return f"Polynomial({self.poly_string!r}, exact=True)"
+        return f"Polynomial({self.poly_string!r})"
@@ -0,0 +1,217 @@
+import itertools
+import math
+from fractions import Fraction
+
+import pytest
+
+from assignment1 import (
+    derive,
+    derive_sparse,
+    evaluate,
+    evaluate_sparse,
+    evaluate_sparse_with_derivative,
+    evaluate_terms,
+    get_coefficients,
+    get_sparse_coefficients,
+    is_sparse,
+    power,
+    sparse_terms,
+    to_dense,
+)
+from newton_bench import wilkinson
+from polynomial import Polynomial
+
+
+# --------------------------------------------------------------------------
+# Tests for get_coefficients
+# --------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "terms, expected",
+    [
+        (["1", "2x", "3x^2"], [1.0, 2.0, 3.0]),
+        (["5x^3"], [0, 0, 0, 5.0]),
+        (["3x^2", "1"], [1.0, 0, 3.0]),  # Out of order
+        (["1x", "2x", "-1"], [-1.0, 3.0]),  # Same degree twice
+    ],
+)
+def test_get_coefficients_pass(terms, expected):
+    assert get_coefficients(terms) == expected
+
+
+# --------------------------------------------------------------------------
+# Tests for the sparse representation
+# --------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "terms, expected",
+    [
+        (["1", "2x", "3x^2"], {0: 1.0, 1: 2.0, 2: 3.0}),
+        (["1x^1000000", "1"], {1000000: 1.0, 0: 1.0}),
+        (["3x^2", "-3x^2", "4"], {0: 4.0}),  # Terms that cancel are left out
+        (["0x^7"], {}),
+    ],
+)
+def test_get_sparse_coefficients(terms, expected):
+    assert get_sparse_coefficients(terms) == expected
+
+
+@pytest.mark.parametrize(
+    "poly, expected",
+    [
+        ({1000000: 1.0, 0: 1.0}, True),
+        ({0: 1.0, 1: 2.0, 2: 3.0}, False),
+        ({0: 1.0, 10: 1.0}, False),
+    ],
+)
+def test_is_sparse(poly, expected):
+    assert is_sparse(poly) is expected
+
+
+@pytest.mark.parametrize("x", [1.5, -3, 0.5, 2])
+@pytest.mark.parametrize("n", [0, 1, 2, 7, 64, 100])
+def test_power(x, n):
+    assert power(x, n) == pytest.approx(x**n)
+
+
+SPARSE_POLYS = [
+    {0: -2.0, 2: 1.0},
+    {3: 1.5},
+    {1: 4.0, 9: -1.0, 30: 0.25},
+    {0: 7.0},
+    {},
+]
+
+
+@pytest.mark.parametrize("poly", SPARSE_POLYS)
+@pytest.mark.parametrize("x", [0, 0.9, -1.1, 2])
+def test_sparse_matches_dense(poly, x):
+    """Evaluating and deriving in sparse form gives the dense answers."""
+    dense = to_dense(poly)
+    value, slope = evaluate_sparse_with_derivative(poly, x)
+    assert value == pytest.approx(evaluate(dense, x))
+    assert slope == pytest.approx(evaluate(derive(dense), x))
+    assert evaluate_sparse(poly, x) == pytest.approx(evaluate(dense, x))
+    assert evaluate_terms(sparse_terms(poly), x) == evaluate_sparse(poly, x)
+    assert to_dense(derive_sparse(poly)) == derive(dense)
+
+
+def test_sparse_terms():
+    assert sparse_terms({1: 4.0, 30: 0.25, 9: -1.0}) == (
+        (30, 0.25),
+        (9, -1.0),
+        (1, 4.0),
+    )
+
+
+# --------------------------------------------------------------------------
+# Tests for Polynomial
+# --------------------------------------------------------------------------
+
+
+def test_parsed_once():
+    poly = Polynomial(" -2+1x^2 ")
+    assert poly.coefficients == [-2.0, 0, 1.0]
+    assert poly.derivative == [0, 2.0]
+    assert repr(poly) == "Polynomial('-2+1x^2')"
+
+
+@pytest.mark.parametrize("poly_string", ["", "1+", "x^2", "2y", "1+2x^1.5"])
+def test_invalid_polynomial(poly_string):
+    with pytest.raises(ValueError):
+        Polynomial(poly_string)
+
+
+@pytest.mark.parametrize(
+    "poly_string, start, expected",
+    [
+        ("-2+1x^2", 1, math.sqrt(2)),
+        ("-2+1x^2", -3, -math.sqrt(2)),
+        ("-6+11x+-6x^2+1x^3", 0.5, 1),
+        ("-6+11x+-6x^2+1x^3", 3.7, 3),
+        ("-1+1x", 100, 1),
+    ],
+)
+def test_find_root(poly_string, start, expected):
+    assert Polynomial(poly_string).find_root(start, 1e-10) == pytest.approx(expected)
+
+
+def test_find_roots_is_lazy():
+    """Starting points are only read as roots are asked for."""
+    roots = Polynomial("-2+1x^2").find_roots(itertools.count(1), 1e-10)
+    assert next(roots) == pytest.approx(math.sqrt(2))
+    assert next(roots) == pytest.approx(math.sqrt(2))
+
+
+def test_find_roots_many_starts():
+    poly = Polynomial("-6+11x+-6x^2+1x^3")
+    roots = list(poly.find_roots([0, 1.8, 2.2, 10], 1e-10))
+    assert roots == pytest.approx([1, 2, 2, 3])
+
+
+def test_find_roots_carries_on_past_failures():
+    """Newton cycles from 0 and 1.5, and goes flat from 0 on x^2 - 1."""
+    roots = list(Polynomial("2+-2x+1x^3").find_roots([0, 1.5, -2], 1e-6))
+    assert roots == [None, None, pytest.approx(-1.7692923542386314)]
+    roots = list(Polynomial("-1+1x^2").find_roots([0, 2, 100], 1e-10, max_iter=8))
+    assert roots == [None, pytest.approx(1), None]
+
+
+def test_high_degree_stays_sparse():
+    poly = Polynomial("1x^1000000+-1")
+    assert poly.sparse
+    assert poly.coefficients == {1000000: 1.0, 0: -1.0}
+    assert poly.derivative == {999999: 1000000.0}
+    assert poly(1) == 0
+    assert poly.slope_with_curvature(1) == (1000000.0, 999999000000.0)
+    assert poly.find_root(1.0000001, 1e-12) == pytest.approx(1)
+
+
+def test_dense_enough_is_dense():
+    poly = Polynomial("1+1x+1x^2+1x^3")
+    assert not poly.sparse
+    assert poly.coefficients == [1.0, 1.0, 1.0, 1.0]
+
+
+# --------------------------------------------------------------------------
+# Tests for exact mode
+# --------------------------------------------------------------------------
+
+
+def test_exact_coefficients():
+    poly = Polynomial("0.1x^2+-0.3x+0.2", exact=True)
+    assert poly.coefficients == [Fraction(1, 5), Fraction(-3, 10), Fraction(1, 10)]
+    assert poly.derivative == [Fraction(-3, 10), Fraction(1, 5)]
+    # roots at 1 and 2 come out exactly zero, which floats can't manage
+    assert poly(Fraction(1)) == 0 and poly(Fraction(2)) == 0
+    assert Polynomial("0.1x^2+-0.3x+0.2")(1) != 0
+    assert repr(poly) == "Polynomial('0.1x^2+-0.3x+0.2', exact=True)"
+
+
+def test_exact_sparse():
+    poly = Polynomial("0.1x^1000+-0.1", exact=True)
+    assert poly.sparse
+    assert poly(Fraction(1)) == 0
+    assert poly.find_root(1.001, 1e-12) == pytest.approx(1)
+
+
+@pytest.mark.parametrize("degree", [10, 15, 20])
+def test_exact_wilkinson(degree):
+    """Rounding noise keeps float Newton from settling, exact mode settles."""
+    start = degree - 0.5
+    floats = Polynomial(wilkinson(degree)).solve(start, 1e-12, max_iter=200)
+    exact = Polynomial(wilkinson(degree), exact=True).solve(start, 1e-12)
+
+    assert not floats.converged
+    assert exact.converged and exact.iterations < 10
+    # the root next to start, to far more places than a float holds
+    assert abs(exact.root - (degree - 1)) < 1e-30
+    assert exact.root.denominator <= 2**128
+
+
+def test_exact_newton_bisection():
+    poly = Polynomial(wilkinson(20), exact=True)
+    result = poly.solve(19.5, 1e-12, "newton-bisection", bracket=(18.5, 19.5))
+    assert result.converged and abs(result.root - 19) < 1e-30
@@ -0,0 +1,155 @@
+"""
+Finds roots for a whole batch of polynomials using every core.
+
+    python root_service.py jobs.txt --workers 8
+    python root_service.py jobs.txt --start 1 --tol 0.0001 --chunksize 500
+
+Each line of the jobs file is a polynomial, optionally followed by its own
+starting point and tolerance: "-2+1x^2 1.5 0.0001". Jobs are handed to the
+worker processes in chunks, so each round trip to a worker carries many
+jobs instead of one, and the results come back in the same order as the
+jobs.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Sequence
+
+from assignment1 import PolynomialSyntaxError
+from ingest import ParseCache, find_root
+
+# chunks per worker, more evens out the load, fewer means fewer round trips
+CHUNKS_PER_WORKER = 4
+
+
+class Job(NamedTuple):
+    poly_string: str
+    start: float
+    tol: float
+
+
+class Solved(NamedTuple):
+    root: Optional[float]  # None if no root was found or on error
+    error: Optional[str]  # why the polynomial couldn't be parsed
+
+
+# each worker process keeps its own cache, so a polynomial that shows up
+# in many jobs is parsed once per worker
+_cache = ParseCache()
+
+
+def solve(job: Job, max_iter: int = 100, method: str = "newton") -> Solved:
+    try:
+        polynomial = _cache.parse(job.poly_string)
+    except PolynomialSyntaxError as error:
+        return Solved(None, str(error))
+    return Solved(find_root(polynomial, job.start, job.tol, max_iter, method), None)
+
+
+def pick_chunksize(jobs: int, workers: int) -> int:
+    """
+    Splits jobs into about CHUNKS_PER_WORKER chunks for each worker.
+    """
+    return max(1, -(-jobs // (workers * CHUNKS_PER_WORKER)))
+
+
+def solve_all(
+    jobs: Sequence[Job],
+    workers: Optional[int] = None,
+    chunksize: Optional[int] = None,
+    max_iter: int = 100,
+    method: str = "newton",
+) -> Iterator[Solved]:
+    """
+    Yields a Solved for each of jobs, in order, using workers processes,
+    or one per core if workers is None. chunksize jobs are sent to a worker
+    at a time, by default enough to give each worker a few chunks. method
+    is passed on to Polynomial.solve.
+    """
+    workers = workers if workers is not None else os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    task = partial(solve, max_iter=max_iter, method=method)
+    if workers == 1 or len(jobs) <= 1:
+        yield from map(task, jobs)
+        return
+
+    if chunksize is None:
+        chunksize = pick_chunksize(len(jobs), workers)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(task, jobs, chunksize=chunksize)
+
+
+def parse_jobs(lines: Iterable[str], start: float, tol: float) -> List[Job]:
+    """
+    Reads one job from each non blank line, as a polynomial optionally
+    followed by its starting point and tolerance.
+    """
+    jobs = []
+    for line_number, line in enumerate(lines, start=1):
+        fields = line.split()
+        if not fields:
+            continue
+        if len(fields) > 3:
+            raise ValueError(f"line {line_number}: expected POLY [START [TOL]]")
+        try:
+            job_start = float(fields[1]) if len(fields) > 1 else start
+            job_tol = float(fields[2]) if len(fields) > 2 else tol
+        except ValueError:
+            raise ValueError(f"line {line_number}: invalid number") from None
+        jobs.append(Job(fields[0], job_start, job_tol))
+    return jobs
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("jobs", help="file of jobs, one per line")
+    parser.add_argument("--start", type=float, default=1.0)
+    parser.add_argument("--tol", type=float, default=0.0001)
+    parser.add_argument("--max-iter", type=int, default=100)
+    parser.add_argument("--method", choices=["newton", "halley"], default="newton")
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="number of worker processes (default: one per core)",
+    )
+    parser.add_argument(
+        "--chunksize", type=int, help="jobs sent to a worker at a time"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        with open(args.jobs, encoding="utf-8") as lines:
+            jobs = parse_jobs(lines, args.start, args.tol)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+
+    start = time.perf_counter()
+    results = solve_all(
+        jobs, args.workers, args.chunksize, args.max_iter, args.method
+    )
+    for job, result in zip(jobs, results):
+        if result.error is not None:
+            print(f"{job.poly_string}: invalid, {result.error}")
+        elif result.root is None:
+            print(f"{job.poly_string}: no root found")
+        else:
+            print(f"{job.poly_string}: {result.root}")
+    elapsed = max(time.perf_counter() - start, 1e-9)
+
+    print(
+        f"solved {len(jobs)} jobs in {elapsed:.3f}s with {args.workers} workers "
+        f"({len(jobs) / elapsed:.1f} jobs/sec)",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,88 @@
+import math
+
+import pytest
+
+from ingest import find_root
+from polynomial import Polynomial
+from root_service import Job, Solved, main, parse_jobs, pick_chunksize, solve_all
+
+JOBS = [
+    Job("-2+1x^2", 1, 1e-10),
+    Job("-2+1x^2", -1, 1e-10),
+    Job("-6+11x+-6x^2+1x^3", 3.7, 1e-10),
+    Job("1+1x^2", 1, 1e-10),  # No real root
+    Job("1x+2y", 1, 1e-10),  # Invalid
+    Job("-1+1x", 5, 1e-10),
+]
+
+
+def expected(job):
+    try:
+        polynomial = Polynomial(job.poly_string)
+    except ValueError:
+        return None
+    return find_root(polynomial, job.start, job.tol, 100)
+
+
+# --------------------------------------------------------------------------
+# Tests for solve_all
+# --------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("workers, chunksize", [(1, None), (2, None), (2, 1), (3, 4)])
+def test_results_in_input_order(workers, chunksize):
+    results = list(solve_all(JOBS, workers, chunksize))
+
+    assert [result.root for result in results] == [expected(job) for job in JOBS]
+    assert results[0].root == pytest.approx(math.sqrt(2))
+    assert results[1].root == pytest.approx(-math.sqrt(2))
+    assert results[3] == Solved(None, None)
+    assert "offset 4" in results[4].error
+
+
+def test_workers_must_be_positive():
+    with pytest.raises(ValueError):
+        list(solve_all(JOBS, workers=0))
+
+
+@pytest.mark.parametrize(
+    "jobs, workers, expected",
+    [(1000, 8, 32), (10, 8, 1), (0, 4, 1), (33, 2, 5)],
+)
+def test_pick_chunksize(jobs, workers, expected):
+    assert pick_chunksize(jobs, workers) == expected
+
+
+# --------------------------------------------------------------------------
+# Tests for parse_jobs and main
+# --------------------------------------------------------------------------
+
+
+def test_parse_jobs():
+    lines = ["-2+1x^2\n", "\n", "1x 3\n", "1x 3 0.5\n"]
+    assert parse_jobs(lines, 1.0, 0.01) == [
+        Job("-2+1x^2", 1.0, 0.01),
+        Job("1x", 3.0, 0.01),
+        Job("1x", 3.0, 0.5),
+    ]
+
+
+@pytest.mark.parametrize("line", ["1x a", "1x 1 2 3"])
+def test_parse_jobs_fail(line):
+    with pytest.raises(ValueError, match="line 1"):
+        parse_jobs([line], 1.0, 0.01)
+
+
+def test_main(tmp_path, capsys):
+    path = tmp_path / "jobs.txt"
+    path.write_text("-2+1x^2 1 1e-10\n1+1x^2\nbad\n")
+
+    assert main([str(path), "--workers", "2"]) == 0
+    out, err = capsys.readouterr()
+    lines = out.splitlines()
+    assert float(lines[0].split(": ")[1]) == pytest.approx(math.sqrt(2))
+    assert lines[1:] == [
+        "1+1x^2: no root found",
+        "bad: invalid, expected a number at offset 0 in 'bad'",
+    ]
+    assert "solved 3 jobs" in err and "with 2 workers" in err
@@ -0,0 +1,182 @@
+"""
+Root finding that always stops. Every method gives up after max_iter
+steps, on a derivative too small to divide by, on a guess that stops
+being a finite number, and on coming back to a guess it has already
+made, and says which of those happened in the SolveResult it returns.
+
+    >>> from polynomial import Polynomial
+    >>> solve(Polynomial("-2+1x^2"), 1, 0.0001)
+    SolveResult(root=1.4142135623746899, iterations=4, status='converged')
+    >>> solve(Polynomial("2+-2x+1x^3"), 0, 0.0001)
+    SolveResult(root=0.0, iterations=2, status='cycle')
+"""
+
+import math
+import sys
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+from assignment1 import approx_equal
+
+CONVERGED = "converged"
+MAX_ITER = "max_iter"  # ran out of steps
+FLAT = "flat"  # the derivative underflowed
+CYCLE = "cycle"  # came back to an earlier guess
+DIVERGED = "diverged"  # a guess overflowed
+
+# below this a float slope can't safely be divided by
+TINY = sys.float_info.min
+
+
+class SolveResult(NamedTuple):
+    root: float  # the last guess, only a root if status is CONVERGED
+    iterations: int  # steps taken
+    status: str
+
+    @property
+    def converged(self) -> bool:
+        return self.status == CONVERGED
+
+
+class RootNotFoundError(ArithmeticError):
+    """
+    Raised by Polynomial.find_root when the solver stops without
+    converging. result is the SolveResult it stopped with.
+    """
+
+    def __init__(self, start: float, result: SolveResult) -> None:
+        super().__init__(
+            f"no root found from {start}: {result.status} after "
+            f"{result.iterations} steps"
+        )
+        self.result = result
+
+
+class _Flat(Exception):
+    pass
+
+
+def _too_flat(polynomial, slope: float) -> bool:
+    # an exact polynomial's Fractions can be divided by anything but zero
+    if polynomial.exact:
+        return slope == 0
+    return abs(slope) < TINY
+
+
+def newton_step(polynomial, x: float) -> float:
+    value, slope = polynomial.evaluate_with_derivative(x)
+    if value == 0:
+        return x
+    if _too_flat(polynomial, slope):
+        raise _Flat
+    return x - value / slope
+
+
+def halley_step(polynomial, x: float) -> float:
+    # x - 2ff' / (2f'^2 - ff''), converges cubically near a simple root
+    value, slope = polynomial.evaluate_with_derivative(x)
+    if value == 0:
+        return x
+    _, curvature = polynomial.slope_with_curvature(x)
+    denominator = 2 * slope * slope - value * curvature
+    if _too_flat(polynomial, denominator):
+        raise _Flat
+    return x - 2 * value * slope / denominator
+
+
+STEPS: Dict[str, Callable] = {"newton": newton_step, "halley": halley_step}
+METHODS = ("newton", "newton-bisection", "halley")
+
+
+def solve(
+    polynomial,
+    start: float,
+    tol: float,
+    method: str = "newton",
+    max_iter: int = 100,
+    bracket: Optional[Tuple[float, float]] = None,
+) -> SolveResult:
+    """
+    Looks for a root of polynomial (a Polynomial) from start, stopping
+    once two guesses in a row are within tol of each other. Each guess is
+    passed through polynomial.rounded.
+
+    method is "newton", "halley" or "newton-bisection". The last one needs
+    a bracket (low, high) that polynomial changes sign across, and never
+    leaves it: any Newton step that would is replaced by a bisection.
+    """
+    if method == "newton-bisection":
+        if bracket is None:
+            raise ValueError("newton-bisection needs a bracket")
+        return _solve_bracketed(polynomial, start, tol, max_iter, bracket)
+    if method not in STEPS:
+        raise ValueError(f"unknown method {method!r}, expected one of {METHODS}")
+
+    step = STEPS[method]
+    current = start
+    seen = {start}
+    for iteration in range(1, max_iter + 1):
+        try:
+            following = polynomial.rounded(step(polynomial, current))
+            # a Fraction past the largest float raises OverflowError here,
+            # so exact guesses diverge where float ones would overflow
+            finite = math.isfinite(following)
+        except _Flat:
+            return SolveResult(current, iteration - 1, FLAT)
+        except OverflowError:
+            finite = False
+
+        if not finite:
+            return SolveResult(current, iteration - 1, DIVERGED)
+        if approx_equal(current, following, tol):
+            return SolveResult(following, iteration, CONVERGED)
+        if following in seen:
+            return SolveResult(following, iteration, CYCLE)
+        seen.add(following)
+        current = following
+
+    return SolveResult(current, max_iter, MAX_ITER)
+
+
+def _solve_bracketed(
+    polynomial,
+    start: float,
+    tol: float,
+    max_iter: int,
+    bracket: Tuple[float, float],
+) -> SolveResult:
+    low, high = bracket
+    low_value, high_value = polynomial(low), polynomial(high)
+    if low_value == 0:
+        return SolveResult(low, 0, CONVERGED)
+    if high_value == 0:
+        return SolveResult(high, 0, CONVERGED)
+    if (low_value > 0) == (high_value > 0):
+        raise ValueError(f"polynomial doesn't change sign across {bracket}")
+    # from here on polynomial is negative at low and positive at high
+    if low_value > 0:
+        low, high = high, low
+
+    current = start
+    if not min(low, high) <= current <= max(low, high):
+        current = (low + high) / 2
+    for iteration in range(1, max_iter + 1):
+        value, slope = polynomial.evaluate_with_derivative(current)
+        if value == 0:
+            return SolveResult(current, iteration - 1, CONVERGED)
+        if value < 0:
+            low = current
+        else:
+            high = current
+
+        if _too_flat(polynomial, slope):
+            following = math.nan
+        else:
+            following = current - value / slope
+        if not min(low, high) < following < max(low, high):
+            following = (low + high) / 2
+        following = polynomial.rounded(following)
+        if approx_equal(current, following, tol):
+            return SolveResult(following, iteration, CONVERGED)
+        current = following
+
+    return SolveResult(current, max_iter, MAX_ITER)
@@ -0,0 +1,127 @@
+import math
+from fractions import Fraction
+
+import pytest
+
+from polynomial import Polynomial
+from solvers import (
+    CONVERGED,
+    CYCLE,
+    DIVERGED,
+    FLAT,
+    MAX_ITER,
+    RootNotFoundError,
+    solve,
+)
+
+CUBIC = "-6+11x+-6x^2+1x^3"  # (x - 1)(x - 2)(x - 3)
+
+# --------------------------------------------------------------------------
+# Tests for solve
+# --------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("method", ["newton", "halley"])
+@pytest.mark.parametrize(
+    "poly_string, start, expected",
+    [
+        ("-2+1x^2", 1, math.sqrt(2)),
+        ("-2+1x^2", -3, -math.sqrt(2)),
+        (CUBIC, 0.5, 1),
+        (CUBIC, 3.7, 3),
+        ("-1+1x^1000000", 1.0000001, 1),  # Sparse
+    ],
+)
+def test_converges(poly_string, start, expected, method):
+    result = solve(Polynomial(poly_string), start, 1e-10, method)
+    assert result.status == CONVERGED and result.converged
+    assert result.root == pytest.approx(expected)
+    assert 0 < result.iterations < 100
+
+
+def test_halley_takes_fewer_steps():
+    poly = Polynomial(CUBIC)
+    newton = solve(poly, 10, 1e-12, "newton")
+    halley = solve(poly, 10, 1e-12, "halley")
+    assert halley.root == pytest.approx(newton.root)
+    assert halley.iterations < newton.iterations
+
+
+@pytest.mark.parametrize(
+    "poly_string, start, method, status",
+    [
+        ("1+1x^2", 0, "newton", FLAT),  # Derivative is zero at the start
+        ("2+-2x+1x^3", 0, "newton", CYCLE),  # 0 -> 1 -> 0
+        ("1+1x^2", 0.5, "newton", MAX_ITER),  # No real root, wanders forever
+        ("1+1x^2", 0.5, "halley", MAX_ITER),
+        ("1+1x^2", 1e200, "newton", DIVERGED),  # Overflows straight away
+    ],
+)
+def test_stops(poly_string, start, method, status):
+    result = solve(Polynomial(poly_string), start, 1e-10, method, max_iter=50)
+    assert result.status == status
+    assert not result.converged
+    assert result.iterations <= 50
+
+
+def test_exact_overflow_diverges():
+    # the first step is around -5e320, a Fraction no float can hold
+    poly = Polynomial("1000000000000000000000+1x^2", exact=True)
+    assert poly.solve(1e-300, 1e-9).status == DIVERGED
+    assert list(poly.find_roots([1e-300], 1e-9)) == [None]
+
+
+@pytest.mark.parametrize(
+    "method, status", [("newton", DIVERGED), ("halley", CONVERGED)]
+)
+def test_exact_tiny_slope_isnt_flat(method, status):
+    # the slope at the start, 20e-570, is far under the smallest float
+    poly = Polynomial("-1+1x^20", exact=True)
+    assert solve(poly, Fraction(1, 10**30), 1e-9, method).status == status
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        solve(Polynomial("1x"), 0, 1e-10, "secant")
+
+
+# --------------------------------------------------------------------------
+# Tests for newton-bisection
+# --------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "poly_string, start, bracket, expected",
+    [
+        (CUBIC, 2.2, (1.5, 2.5), 2),
+        (CUBIC, 2.2, (2.5, 1.5), 2),  # Either way round
+        (CUBIC, 0, (1.5, 2.5), 2),  # Start outside the bracket
+        ("2+-2x+1x^3", 0, (-3, 0), -1.7692923542386314),  # Newton cycles here
+        ("-1+1x^1000000", 0.5, (0.5, 1.5), 1),  # Newton overshoots from 0.5
+        (CUBIC, 0, (1, 2.5), 1),  # Root at the end of the bracket
+    ],
+)
+def test_newton_bisection(poly_string, start, bracket, expected):
+    poly = Polynomial(poly_string)
+    result = solve(poly, start, 1e-12, "newton-bisection", bracket=bracket)
+    assert result.converged
+    assert result.root == pytest.approx(expected)
+    assert min(bracket) <= result.root <= max(bracket)
+
+
+@pytest.mark.parametrize("bracket", [None, (3.5, 4)])
+def test_newton_bisection_needs_sign_change(bracket):
+    with pytest.raises(ValueError):
+        solve(Polynomial(CUBIC), 3.7, 1e-10, "newton-bisection", bracket=bracket)
+
+
+# --------------------------------------------------------------------------
+# Tests for Polynomial.find_root
+# --------------------------------------------------------------------------
+
+
+def test_find_root_raises():
+    with pytest.raises(RootNotFoundError) as error:
+        Polynomial("1+1x^2").find_root(0.5, 1e-10, max_iter=10)
+    assert error.value.result.status == MAX_ITER
+    assert isinstance(error.value, ArithmeticError)
@@ -0,0 +1,239 @@
+"""
+Counts and brackets the real roots of a polynomial with its Sturm chain,
+p0 = p, p1 = p', p(k+1) = -remainder(p(k-1), p(k)). The number of distinct
+real roots in (a, b] is how many more sign changes the chain has at a than
+at b, and the chain only has to be worked out once per polynomial.
+
+    >>> chain = SturmChain([-6, 11, -6, 1])
+    >>> chain.count_roots(0, 2.5), chain.count_roots()
+    (2, 3)
+    >>> chain.isolate(0, 4)
+    [(0.0, 1.0), (1.0, 2.0), (2.0, 4.0)]
+"""
+
+import math
+from typing import List, Sequence, Tuple
+
+from assignment1 import derive, evaluate, evaluate_with_derivative
+from solvers import (
+    CONVERGED,
+    FLAT,
+    MAX_ITER,
+    RootNotFoundError,
+    SolveResult,
+    solve,
+)
+
+# remainder coefficients this much smaller than the polynomial they came
+# from are taken to be rounding error
+RELATIVE_TOL = 1e-10
+
+# isolate stops splitting brackets narrower than this
+MIN_WIDTH = 1e-12
+
+# enough halvings to take any finite bracket down to adjacent floats
+MAX_BISECTIONS = 2100
+
+
+def _divide(
+    numerator: List[float], denominator: List[float]
+) -> Tuple[List[float], List[float]]:
+    # long division, highest degree last like every coefficient list here
+    remainder = list(numerator)
+    quotient = [0.0] * max(1, len(numerator) - len(denominator) + 1)
+    lead = denominator[-1]
+    for shift in range(len(numerator) - len(denominator), -1, -1):
+        factor = remainder[shift + len(denominator) - 1] / lead
+        quotient[shift] = factor
+        for index, coefficient in enumerate(denominator):
+            remainder[shift + index] -= factor * coefficient
+    return quotient, remainder[: len(denominator) - 1]
+
+
+def _trim(poly: List[float], scale: float) -> List[float]:
+    while poly and abs(poly[-1]) <= RELATIVE_TOL * scale:
+        poly.pop()
+    return poly
+
+
+class SturmChain:
+    """
+    The Sturm chain of poly, a list of coefficients, or of poly with its
+    repeated roots divided out if it has any (which is then self.poly, with
+    poly kept as self.original). It's kept as the quotients
+    that link each member to the next two, so the chain can be evaluated
+    with the recurrence p(k-1) = q(k) p(k) - c(k) p(k+1) in O(degree) steps
+    instead of evaluating every member.
+    """
+
+    def __init__(self, poly: Sequence[float]) -> None:
+        current = _trim([float(c) for c in poly], 0)
+        if not current:
+            raise ValueError("every number is a root of the zero polynomial")
+        self.original = current
+        self._build(current)
+        # the last member is the gcd of p and p', whose roots are the roots
+        # p repeats. Every member is zero at those, so the chain is built
+        # again from p / gcd, which has the same roots, each of them once
+        if len(self.last) > 1:
+            self._build(_divide(current, self.last)[0])
+
+    def _build(self, current: List[float]) -> None:
+        self.poly = current
+        following = derive(current)
+
+        # (q(k), c(k)) for every link of the chain, in order
+        self.links: List[Tuple[List[float], float]] = []
+        # leading coefficient and degree of every member, for the signs
+        # at plus and minus infinity
+        self.leads: List[Tuple[float, int]] = [(current[-1], len(current) - 1)]
+        while following:
+            self.leads.append((following[-1], len(following) - 1))
+            quotient, remainder = _divide(current, following)
+            remainder = _trim(remainder, max(map(abs, current)))
+            # scaling by a positive number keeps the signs and stops the
+            # coefficients shrinking or growing down the chain
+            scale = max(map(abs, remainder), default=1.0)
+            self.links.append((quotient, scale))
+            current, following = following, [-c / scale for c in remainder]
+        self.last = current
+
+    def sign_changes(self, x: float) -> int:
+        """
+        How many times the signs of the chain's members at x change,
+        skipping zeros. x can be math.inf or -math.inf.
+        """
+        if math.isinf(x):
+            values = [
+                lead * (-1 if x < 0 and degree % 2 else 1)
+                for lead, degree in self.leads
+            ]
+        else:
+            values = [0.0, evaluate(self.last, x)]
+            for quotient, scale in reversed(self.links):
+                values.append(evaluate(quotient, x) * values[-1] - scale * values[-2])
+            values = values[:0:-1]
+            # p and p' straight from horner's scheme, so a root where the
+            # recurrence leaves a little rounding error still reads as zero
+            values[:2] = evaluate_with_derivative(self.poly, x)[: len(values)]
+            # dividing out the repeated roots leaves a little rounding error
+            # too, but the original polynomial is still exactly zero at them
+            if self.original is not self.poly and evaluate(self.original, x) == 0:
+                values[0] = 0.0
+
+        changes = 0
+        previous = 0.0
+        for value in values:
+            if value:
+                if previous and (value > 0) != (previous > 0):
+                    changes += 1
+                previous = value
+        return changes
+
+    def count_roots(self, low: float = -math.inf, high: float = math.inf) -> int:
+        """
+        The number of distinct real roots in (low, high], all of them by
+        default.
+        """
+        return self.sign_changes(low) - self.sign_changes(high)
+
+    def bound(self) -> float:
+        """Every real root lies strictly inside (-bound, bound)."""
+        lead = self.poly[-1]
+        return 1 + max((abs(c / lead) for c in self.poly[:-1]), default=0.0)
+
+    def isolate(
+        self, low: float = -math.inf, high: float = math.inf
+    ) -> List[Tuple[float, float]]:
+        """
+        Splits (low, high] into brackets (a, b] with one distinct root in
+        each, in order. Roots closer together than MIN_WIDTH can end up
+        sharing a bracket.
+        """
+        if math.isinf(low) or math.isinf(high):
+            bound = self.bound()
+            low, high = max(low, -bound), min(high, bound)
+        low, high = float(low), float(high)
+
+        brackets = []
+        pending = [(low, high, self.sign_changes(low), self.sign_changes(high))]
+        while pending:
+            a, b, changes_a, changes_b = pending.pop()
+            count = changes_a - changes_b
+            if count == 0:
+                continue
+            if count == 1 or b - a <= MIN_WIDTH:
+                brackets.append((a, b))
+                continue
+            middle = (a + b) / 2
+            changes_middle = self.sign_changes(middle)
+            # the right half goes on first so the left comes off first
+            pending.append((middle, b, changes_middle, changes_b))
+            pending.append((a, middle, changes_a, changes_middle))
+        return brackets
+
+
+def _bisect(poly: List[float], low: float, high: float, tol: float) -> SolveResult:
+    # halves (low, high] until it's narrower than tol, keeping the sign
+    # change of poly inside it
+    low_positive = evaluate(poly, low) > 0
+    if (evaluate(poly, high) > 0) == low_positive:
+        return SolveResult((low + high) / 2, 0, FLAT)
+    for iteration in range(1, MAX_BISECTIONS + 1):
+        middle = (low + high) / 2
+        if high - low <= tol or middle in (low, high):
+            return SolveResult(high, iteration - 1, CONVERGED)
+        value = evaluate(poly, middle)
+        if value == 0:
+            return SolveResult(middle, iteration, CONVERGED)
+        if (value > 0) == low_positive:
+            low = middle
+        else:
+            high = middle
+    return SolveResult(high, MAX_BISECTIONS, MAX_ITER)
+
+
+def root_in(polynomial, low: float, high: float, tol: float) -> float:
+    """
+    Finds the one root of polynomial (a Polynomial) in the bracket
+    (low, high], like the ones isolate gives. Raises RootNotFoundError if
+    the solver doesn't converge inside it.
+    """
+    if polynomial(high) == 0:
+        return high
+    middle = (low + high) / 2
+    # a root right on low belongs to the bracket before this one, so move
+    # low up to somewhere that isn't a root, still short of this one
+    inside, upper = low, high
+    for _ in range(MAX_BISECTIONS):
+        if polynomial(inside) != 0:
+            break
+        split = (inside + upper) / 2
+        if polynomial.sturm.count_roots(inside, split):
+            if polynomial(split) == 0:
+                return split
+            upper = split
+        else:
+            inside = split
+
+    if (polynomial(inside) > 0) != (polynomial(upper) > 0):
+        result = solve(
+            polynomial, middle, tol, "newton-bisection", bracket=(inside, upper)
+        )
+    else:
+        # a root of even multiplicity touches zero without crossing it, but
+        # the chain's polynomial has every root just once, so it crosses
+        result = _bisect(polynomial.sturm.poly, inside, upper, tol)
+    if not result.converged or not low < result.root <= high:
+        raise RootNotFoundError(middle, result)
+    return result.root
+
+
+def roots_between(polynomial, low: float, high: float, tol: float) -> List[float]:
+    """
+    Every distinct real root of polynomial in (low, high], in order, each
+    found from its own bracket so none is found twice or missed.
+    """
+    return [
+        root_in(polynomial, a, b, tol) for a, b in polynomial.sturm.isolate(low, high)
+    ]
@@ -0,0 +1,113 @@
+import math
+import random
+
+import pytest
+
+from polynomial import Polynomial
+from sturm import SturmChain
+
+CUBIC = [-6, 11, -6, 1]  # (x - 1)(x - 2)(x - 3)
+WILKINSON_8 = [40320, -109584, 118124, -67284, 22449, -4536, 546, -36, 1]
+
+
+def naive_chain(poly):
+    """Every member of the chain, evaluated the long way."""
+    import numpy as np
+
+    chain = [np.poly1d(poly[::-1]), np.polyder(np.poly1d(poly[::-1]))]
+    while True:
+        remainder = -np.polydiv(chain[-2], chain[-1])[1]
+        if np.allclose(remainder.coeffs, 0):
+            return chain
+        chain.append(remainder)
+
+
+# --------------------------------------------------------------------------
+# Tests for SturmChain
+# --------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "poly, low, high, expected",
+    [
+        (CUBIC, -math.inf, math.inf, 3),
+        (CUBIC, 0, 2.5, 2),
+        (CUBIC, 1, 2, 1),  # (1, 2] leaves out 1 and keeps 2
+        (CUBIC, 3.5, 10, 0),
+        ([1, 0, 1], -math.inf, math.inf, 0),  # x^2 + 1
+        ([0, 0, 1], -1, 1, 1),  # x^2, a double root counts once
+        ([-1, 3, -3, 1], 0, 2, 1),  # (x - 1)^3
+        ([5], -math.inf, math.inf, 0),  # Constant
+        (WILKINSON_8, 0, 9, 8),
+        (WILKINSON_8, 4.5, 6.5, 2),
+        ([4, -8, 5, -1], 0, 2, 2),  # (x - 1)(x - 2)^2, ending on the double root
+        ([4, -8, 5, -1], 2, 4, 0),
+    ],
+)
+def test_count_roots(poly, low, high, expected):
+    assert SturmChain(poly).count_roots(low, high) == expected
+
+
+@pytest.mark.parametrize("x", [-3.5, -0.2, 0.7, 1.5, 4])
+def test_sign_changes_match_naive_chain(x):
+    pytest.importorskip("numpy")
+    rng = random.Random(4)
+    poly = [rng.uniform(-1, 1) for _ in range(7)]
+    values = [member(x) for member in naive_chain(poly)]
+    signs = [value > 0 for value in values if value]
+    expected = sum(a != b for a, b in zip(signs, signs[1:]))
+    assert SturmChain(poly).sign_changes(x) == expected
+
+
+def test_isolate():
+    brackets = SturmChain(WILKINSON_8).isolate()
+    assert len(brackets) == 8
+    for root, (low, high) in zip(range(1, 9), brackets):
+        assert low < root <= high
+
+
+def test_zero_polynomial():
+    with pytest.raises(ValueError):
+        SturmChain([0, 0])
+
+
+# --------------------------------------------------------------------------
+# Tests for Polynomial.count_roots and Polynomial.roots_between
+# --------------------------------------------------------------------------
+
+
+def test_chain_cached_on_polynomial():
+    poly = Polynomial("-6+11x+-6x^2+1x^3")
+    assert poly.count_roots(0, 2.5) == 2
+    assert poly.sturm is poly.sturm
+    assert poly.count_roots() == 3
+
+
+@pytest.mark.parametrize(
+    "poly_string, low, high, expected",
+    [
+        ("-6+11x+-6x^2+1x^3", 0, 10, [1, 2, 3]),
+        ("-6+11x+-6x^2+1x^3", 1.5, 10, [2, 3]),
+        ("1+1x^2", -10, 10, []),
+        ("1x^2", -1, 1, [0]),  # Touches zero without crossing
+        ("2+-2x+1x^3", -3, 3, [-1.7692923542386314]),  # Newton cycles from 0
+        ("-1+1x^40", -2, 2, [-1, 1]),  # Sparse
+        # roots on the ends of the brackets isolate splits into
+        ("-6+11x+-6x^2+1x^3", 0, 4, [1, 2, 3]),
+        ("-6+11x+-6x^2+1x^3", 1, 3, [2, 3]),
+        ("15+-8x+1x^2", -6, 6, [3, 5]),
+        ("225+-34x^2+1x^4", -6, 6, [-5, -3, 3, 5]),
+        # (x - 4)^2 (x - 1)^2 (x - 5)(x + 2)(x - 3), Newton stalls at the
+        # double roots
+        (
+            "480+-1216x+934x^2+-77x^3+-198x^4+92x^5+-16x^6+1x^7",
+            -10,
+            10,
+            [-2, 1, 3, 4, 5],
+        ),
+    ],
+)
+def test_roots_between(poly_string, low, high, expected):
+    roots = Polynomial(poly_string).roots_between(low, high, 1e-12)
+    assert roots == pytest.approx(expected, abs=1e-6)
+    assert all(low < root <= high for root in roots)
@@ -1,11 +1,50 @@
+from itertools import chain, islice, repeat
 from PIL import Image
-from typing import List
+from typing import List, Optional, Tuple, Union
 
+import instrument
+import python_backend
+from image_cache import ImageCache
+from raw_image import RawImage
 
-def mirror(raw: List[List[List[int]]]) -> None:
+try:
+    import numpy_backend
+except ImportError:  # numpy is optional, fall back to plain python
+    numpy_backend = None
+
+BLACK = (0, 0, 0)
+
+# the filters below use the fastest backend available for RawImage data
+BACKENDS = {"python": python_backend}
+if numpy_backend is not None:
+    BACKENDS["numpy"] = numpy_backend
+
+_backend_name = "numpy" if numpy_backend is not None else "python"
+_backend = BACKENDS[_backend_name]
+
+
+def get_backend() -> str:
+    """Returns the name of the backend used for RawImage data."""
+    return _backend_name
+
+
+def set_backend(name: str) -> None:
+    """
+    Chooses which backend the filters use for RawImage data, one of the
+    keys of BACKENDS.
+    """
+    global _backend, _backend_name
+    if name not in BACKENDS:
+        raise ValueError(f"unknown or unavailable backend: {name!r}")
+    _backend_name = name
+    _backend = BACKENDS[name]
+
+
+@instrument.instrumented
+def mirror(raw: Union[List[List[List[int]]], RawImage]) -> None:
     """
     Assume raw is image data. Modifies raw by reversing all the rows
-    of the data.
+    of the data. raw may also be a RawImage.
 
     >>> raw = [[[233, 100, 115], [0, 0, 0], [255, 255, 255]],
                [[199, 201, 116], [1, 9, 0], [255, 255, 255]]]
@@ -16,16 +55,21 @@ def mirror(raw: List[List[List[int]]]) -> None:
     """
     # TODO
 
+    if isinstance(raw, RawImage):
+        _backend.mirror(raw)
+        return
+
     for image_row in raw:
         image_row = image_row.reverse()
 
 
-def grey(raw: List[List[List[int]]]) -> None:
+@instrument.instrumented
+def grey(raw: Union[List[List[List[int]]], RawImage]) -> None:
     """
     Assume raw is image data. Modifies raw "averaging out" each
     pixel of raw. Specifically, for each pixel it totals the RGB
     values, integer divides by three, and sets the all RGB values
-    equal to this new value
+    equal to this new value. raw may also be a RawImage.
 
     >>> raw = [[[233, 100, 115], [0, 0, 0], [255, 255, 255]],
                [[199, 201, 116], [1, 9, 0], [255, 255, 255]]]
@@ -35,6 +79,10 @@ def grey(raw: List[List[List[int]]]) -> None:
      [[172, 172, 172], [3, 3, 3], [255, 255, 255]]]
     """
 
+    if isinstance(raw, RawImage):
+        _backend.grey(raw)
+        return
+
     for image_row in raw:
         for pixel in image_row:
             average = sum(pixel) // 3
@@ -43,11 +91,13 @@ def grey(raw: List[List[List[int]]]) -> None:
                 pixel[i] = average
 
 
-def invert(raw: List[List[List[int]]]) -> None:
+@instrument.instrumented
+def invert(raw: Union[List[List[List[int]]], RawImage]) -> None:
     """
     Assume raw is image data. Modifies raw inverting each pixel.
     To invert a pixel, you swap all the max values, with all the
-    minimum values. See the doc tests for examples.
+    minimum values. See the doc tests for examples. raw may also be
+    a RawImage.
 
     >>> raw = [[[233, 100, 115], [0, 0, 0], [255, 255, 0]],
                [[199, 201, 116], [1, 9, 0], [255, 100, 100]]]
@@ -57,6 +107,10 @@ def invert(raw: List[List[List[int]]]) -> None:
         [[199, 116, 201], [1, 0, 9], [100, 255, 255]]]
     """
 
+    if isinstance(raw, RawImage):
+        _backend.invert(raw)
+        return
+
     for image in raw:
         for pixel in image:
             max_colour = max(pixel)
@@ -71,9 +125,12 @@ def invert(raw: List[List[List[int]]]) -> None:
     return
 
 
+@instrument.instrumented
 def merge(
-    raw1: List[List[List[int]]], raw2: List[List[List[int]]]
-) -> List[List[List[int]]]:
+    raw1: Union[List[List[List[int]]], RawImage],
+    raw2: Union[List[List[List[int]]], RawImage],
+    *others: Union[List[List[List[int]]], RawImage],
+) -> Union[List[List[List[int]]], RawImage]:
     """
     Merges raw1 and raw2 into new raw image data and returns it.
     It merges them using the following rule/procedure.
@@ -86,43 +143,52 @@ def merge(
        3.3) raw2[i][j] if there is no pixel data at raw1[i][j]
        3.4) raw1[i][j] if i is even
        3.5) raw2[i][j] if i is odd
+    Any number of images can be merged the same way: with n of them, row i
+    takes its pixels from image i % n where it can, then from the images
+    after that one in turn.
+    The result shares no pixels with the inputs. If any of the images is a
+    RawImage, the result is a RawImage.
+
+    >>> merge([[[1, 1, 1], [2, 2, 2]]], [[[3, 3, 3]], [[4, 4, 4]]])
+    [[[1, 1, 1], [2, 2, 2]], [[4, 4, 4], [0, 0, 0]]]
     """
-    height = max(len(raw1), len(raw2))
-    width = max(len(raw1[0]) if raw1 else 0, len(raw2[0]) if raw2 else 0)
+    raws = (raw1, raw2) + others
+    if any(isinstance(raw, RawImage) for raw in raws):
+        return _backend.merge(*map(_as_raw_image, raws))
+
+    height = max(map(len, raws))
+    width = max((len(image_row) for raw in raws for image_row in raw), default=0)
 
     merged_output = []
     for image_row in range(height):
-        merged_output.append([])
-
-        for pixel_col in range(width):
-            raw1_has_row = len(raw1) > image_row
-            raw2_has_row = len(raw2) > image_row
-            raw1_has_pixel = raw1_has_row and pixel_col < len(raw1[image_row])
-            raw2_has_pixel = raw2_has_row and pixel_col < len(raw2[image_row])
-
-            if not raw1_has_pixel and not raw2_has_pixel:
-                merged_output[image_row][pixel_col] = [0, 0, 0]  # black pixel
-
-            elif not raw2_has_pixel:
-                merged_output[image_row].append(raw1[image_row][pixel_col])
-            elif not raw1_has_pixel:
-                merged_output[image_row].append(raw2[image_row][pixel_col])
-
-            elif image_row % 2 == 0:
-                merged_output[image_row].append(raw1[image_row][pixel_col])
-            else:
-                merged_output[image_row].append(raw2[image_row][pixel_col])
+        # each column comes from the most preferred image that reaches it,
+        # so an image only adds the columns past those already filled in
+        output_row = []
+        for source in reversed(python_backend.merge_order(raws, image_row)):
+            if image_row < len(source) and len(source[image_row]) > len(output_row):
+                # fresh lists, so filtering the result can't change the inputs
+                rest = islice(source[image_row], len(output_row), None)
+                output_row.extend(map(list, rest))
+        output_row.extend(map(list, repeat(BLACK, width - len(output_row))))
+        merged_output.append(output_row)
     return merged_output
 
 
-def compress(raw: List[List[List[int]]]) -> List[List[List[int]]]:
+@instrument.instrumented
+def compress(
+    raw: Union[List[List[List[int]]], RawImage], factor: int = 2
+) -> Union[List[List[List[int]]], RawImage]:
     """
     Compresses raw by going through the pixels and combining a pixel with
     the ones directly to the right, below and diagonally to the lower right.
     For each RGB values it takes the average of these four pixels using integer
     division. If is is a pixel on the "edge" of the image, it only takes the
     relevant pixels to average across. See the second doctest for an example of
-    this.
+    this. If raw is a RawImage, the result is a RawImage.
+
+    factor can be changed to average factor x factor blocks instead of 2x2
+    ones, with the same rule for blocks on the edges. Bigger factors are
+    worked out with a summed-area table, so they cost no more than 2x2.
 
     >>> raw = [[[233, 100, 115], [0, 0, 0], [255, 255, 0], [3, 6, 7]],
                [[199, 201, 116], [1, 9, 0], [255, 100, 100], [99, 99, 0]],
@@ -140,8 +206,17 @@ def compress(raw: List[List[List[int]]]) -> List[List[List[int]]]:
     >>> raw2
     [[[108, 77, 57], [255, 177, 50]],
      [[117, 166, 80], [0, 1, 1]]]
+
+    >>> compress(raw, factor=3)
+    [[[130, 110, 54]]]
     """
 
+    if isinstance(raw, RawImage):
+        return _backend.compress(raw, factor=factor)
+    if factor != 2:
+        compressed = _backend.compress(RawImage.from_nested(raw), factor=factor)
+        return compressed.to_nested()
+
     height = len(raw)
     width = len(raw[0]) if len(raw) > 0 else 0
 
@@ -181,6 +256,12 @@ def compress(raw: List[List[List[int]]]) -> List[List[List[int]]]:
     return compressed_output
 
 
+def _as_raw_image(raw: Union[List[List[List[int]]], RawImage]) -> RawImage:
+    if isinstance(raw, RawImage):
+        return raw
+    return RawImage.from_nested(raw)
+
+
 """
 **********************************************************
 
@@ -192,49 +273,79 @@ new images.
 """
 
 
-def get_raw_image(name: str) -> List[List[List[int]]]:
-    image = Image.open(name)
-    num_rows = image.height
-    num_columns = image.width
-    pixels = image.getdata()
-    new_data = []
+def get_raw_image(
+    name: str, compact: bool = False, cache: Optional[ImageCache] = None
+) -> Union[List[List[List[int]]], RawImage]:
+    # a cached image is only decoded the first time it's asked for
+    if cache is not None:
+        shared = cache.get(name)
+        if compact:
+            return shared
+        num_rows, num_columns, data = shared.height, shared.width, shared.data
+    else:
+        decoded = decode_image(name)
+        num_rows, num_columns, data = decoded.height, decoded.width, decoded.data
 
-    for i in range(num_rows):
-        new_row = []
-        for j in range(num_columns):
-            new_pixel = list(pixels[i * num_columns + j])
-            new_row.append(new_pixel)
-        new_data.append(new_row)
+    if compact:
+        return RawImage(num_columns, num_rows, bytearray(data))
 
-    image.close()
-    return new_data
+    with instrument.stage("to_nested", num_rows * num_columns):
+        pixels = list(map(list, zip(data[0::3], data[1::3], data[2::3])))
+        return [
+            pixels[start : start + num_columns]
+            for start in range(0, num_rows * num_columns, num_columns)
+        ]
 
 
-def image_from_raw(raw: List[List[List[int]]], name: str) -> None:
-    image = Image.new("RGB", (len(raw[0]), len(raw)))
-    pixels = []
-    for row in raw:
-        for pixel in row:
-            pixels.append(tuple(pixel))
-    image.putdata(pixels)
-    image.save(name)
+def decode_image(name: str) -> RawImage:
+    """
+    Decodes the image file name into a RawImage over the read-only bytes
+    pillow hands back, without copying them. get_raw_image copies them
+    into an image of its own, and the image cache keeps them as they are.
+    """
+    # tobytes hands back the decoded pixels as one packed RGB buffer,
+    # so there's no need to go through a python tuple for every pixel
+    with instrument.stage("decode") as decoding, Image.open(name) as image:
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        decoding.pixels = image.width * image.height
+        return RawImage(image.width, image.height, image.tobytes())
+
+
+def image_from_raw(
+    raw: Union[List[List[List[int]]], RawImage], name: str
+) -> None:
+    if isinstance(raw, RawImage):
+        # let pillow read straight out of the image buffer, padding and all
+        image = Image.frombuffer(
+            "RGB", raw.size, raw.data, "raw", "RGB", raw.stride, 1
+        )
+    else:
+        with instrument.stage("from_nested", len(raw) * len(raw[0])):
+            data = bytes(chain.from_iterable(chain.from_iterable(raw)))
+            image = Image.frombytes("RGB", (len(raw[0]), len(raw)), data)
+
+    with instrument.stage("encode", image.width * image.height):
+        image.save(name)
 
 
 # my own custom function
 def test(base_file: str):
-    mirrored = get_raw_image(base_file + ".jpg")
-    inverted = get_raw_image(base_file + ".jpg")
-    grayscaled = get_raw_image(base_file + ".jpg")
-    compressed = get_raw_image(base_file + ".jpg")
-    all = get_raw_image(base_file + ".jpg")
-    super_compressed = get_raw_image(base_file + ".jpg")
+    # the file is only decoded once, the other five come from the cache
+    cache = ImageCache()
+    mirrored = get_raw_image(base_file + ".jpg", cache=cache)
+    inverted = get_raw_image(base_file + ".jpg", cache=cache)
+    grayscaled = get_raw_image(base_file + ".jpg", cache=cache)
+    compressed = get_raw_image(base_file + ".jpg", cache=cache)
+    all = get_raw_image(base_file + ".jpg", cache=cache)
+    super_compressed = get_raw_image(base_file + ".jpg", cache=cache)
 
     invert(inverted)
     grey(grayscaled)
     mirror(mirrored)
-    compress(compressed)
+    compressed = compress(compressed)
 
-    compress(all)
+    all = compress(all)
     grey(all)
     invert(all)
     mirror(all)
@@ -247,9 +358,54 @@ def test(base_file: str):
     image_from_raw(compressed, base_file + "-compressed.jpg")
     image_from_raw(super_compressed, base_file + "-super-compressed.jpg")
 
-def compress_n_times(data, n):
-    for _ in range(n):
-        compress(data)
+
+def build_pyramid(
+    raw: Union[List[List[List[int]]], RawImage], levels: int
+) -> List[Union[List[List[List[int]]], RawImage]]:
+    """
+    Returns a list of up to levels images, each one compress applied to the
+    one before it, starting from raw. Stops early once an image is down to
+    a single pixel, since compressing it again wouldn't change anything.
+
+    For RawImage data every level is written into one buffer allocated up
+    front, rather than allocating a new image per level.
+    """
+    sizes = []
+    width, height = _size_of(raw)
+    while len(sizes) < levels and (width > 1 or height > 1):
+        width, height = (width + 1) // 2, (height + 1) // 2
+        sizes.append((width, height))
+
+    if not isinstance(raw, RawImage):
+        pyramid = []
+        for _ in sizes:
+            raw = compress(raw)
+            pyramid.append(raw)
+        return pyramid
+
+    buffer = memoryview(bytearray(sum(w * h * 3 for w, h in sizes)))
+    pyramid = []
+    offset = 0
+    for width, height in sizes:
+        level = RawImage(width, height, buffer[offset : offset + width * height * 3])
+        raw = _backend.compress(raw, out=level)
+        pyramid.append(raw)
+        offset += width * height * 3
+    return pyramid
+
+
+def compress_n_times(
+    data: Union[List[List[List[int]]], RawImage], n: int
+) -> Union[List[List[List[int]]], RawImage]:
+    pyramid = build_pyramid(data, n)
+    return pyramid[-1] if pyramid else data
+
+
+def _size_of(raw: Union[List[List[List[int]]], RawImage]) -> Tuple[int, int]:
+    if isinstance(raw, RawImage):
+        return raw.size
+    return (len(raw[0]) if raw else 0, len(raw))
+
 
 # test("assets/lotus1/lotus")
 # test("assets/lotus2/lotus")
@@ -3,6 +3,8 @@ from typing import List
 
 # Assuming the functions are imported from your assignment file
 from assignment2 import mirror, grey, invert, merge, compress
+from assignment2 import build_pyramid, compress_n_times
+from raw_image import RawImage
 
 
 # --------------------------------------------------------------------------
@@ -306,6 +308,45 @@ def test_merge_fail(raw1, raw2, not_expected):
     assert result != not_expected
 
 
+@pytest.mark.parametrize(
+    "raws, expected",
+    [
+        # Neither image has a pixel at (1, 1)
+        (
+            [[[[1, 1, 1], [2, 2, 2]]], [[[3, 3, 3]], [[4, 4, 4]]]],
+            [[[1, 1, 1], [2, 2, 2]], [[4, 4, 4], [0, 0, 0]]],
+        ),
+        # Three images, row i prefers image i % 3
+        (
+            [[[[1, 1, 1]]] * 4, [[[2, 2, 2]]] * 4, [[[3, 3, 3]]] * 4],
+            [[[1, 1, 1]], [[2, 2, 2]], [[3, 3, 3]], [[1, 1, 1]]],
+        ),
+        # Three images, falling back to the next image in turn
+        (
+            [[[[1, 1, 1]]], [[[2, 2, 2]]] * 3, [[[3, 3, 3], [3, 3, 3]]]],
+            [[[1, 1, 1], [3, 3, 3]], [[2, 2, 2], [0, 0, 0]], [[2, 2, 2], [0, 0, 0]]],
+        ),
+        # Empty images
+        ([[], []], []),
+    ],
+)
+def test_merge_gaps_and_more_images(raws, expected):
+    """Tests black gaps and merging more than two images."""
+    assert merge(*raws) == expected
+
+
+def test_merge_shares_no_pixels():
+    """Tests that filtering the merged image leaves the inputs alone."""
+    raw1 = [[[10, 20, 30], [40, 50, 60]]]
+    raw2 = [[[70, 80, 90]], [[100, 110, 120]]]
+    merged = merge(raw1, raw2)
+    invert(merged)
+    grey(merged)
+
+    assert raw1 == [[[10, 20, 30], [40, 50, 60]]]
+    assert raw2 == [[[70, 80, 90]], [[100, 110, 120]]]
+
+
 # --------------------------------------------------------------------------
 # Tests for compress (PASS cases)
 # --------------------------------------------------------------------------
@@ -373,3 +414,109 @@ def test_compress_fail(raw, not_expected):
     """Tests that compress does not produce incorrect results."""
     result = compress(raw)
     assert result != not_expected
+
+
+# --------------------------------------------------------------------------
+# Tests for build_pyramid and compress_n_times
+# --------------------------------------------------------------------------
+
+GRADIENT = [[[i * 10 + j, j * 20, 255 - i] for j in range(5)] for i in range(6)]
+
+
+@pytest.mark.parametrize(
+    "raw, levels, expected_sizes",
+    [
+        # Stops at the requested number of levels
+        (GRADIENT, 2, [(3, 3), (2, 2)]),
+        # Stops early once the image is a single pixel
+        (GRADIENT, 100, [(3, 3), (2, 2), (1, 1)]),
+        # A single pixel has nothing left to compress
+        ([[[1, 2, 3]]], 5, []),
+        # A single row still halves every level
+        ([[[1, 1, 1]] * 4], 5, [(2, 1), (1, 1)]),
+        # No levels requested
+        (GRADIENT, 0, []),
+    ],
+)
+def test_build_pyramid_sizes(raw, levels, expected_sizes):
+    """Tests that build_pyramid returns every level it computed."""
+    pyramid = build_pyramid(raw, levels)
+    assert [(len(level[0]), len(level)) for level in pyramid] == expected_sizes
+
+
+@pytest.mark.parametrize("levels", [1, 2, 3])
+def test_build_pyramid_levels(levels):
+    """Tests that each level is compress applied to the level before."""
+    expected = GRADIENT
+    pyramid = build_pyramid(GRADIENT, levels)
+    for level in pyramid:
+        expected = compress(expected)
+        assert level == expected
+
+
+def test_build_pyramid_compact():
+    """Tests that RawImage levels match nested levels and share one buffer."""
+    pyramid = build_pyramid(RawImage.from_nested(GRADIENT), 10)
+    assert [level.to_nested() for level in pyramid] == build_pyramid(GRADIENT, 10)
+
+    buffer = pyramid[0].data.obj
+    assert all(level.data.obj is buffer for level in pyramid)
+
+
+@pytest.mark.parametrize(
+    "raw, n, expected",
+    [
+        (GRADIENT, 0, GRADIENT),
+        (GRADIENT, 1, compress(GRADIENT)),
+        (GRADIENT, 2, compress(compress(GRADIENT))),
+        (GRADIENT, 100, compress(compress(compress(GRADIENT)))),
+    ],
+)
+def test_compress_n_times_pass(raw, n, expected):
+    """Tests that compress_n_times returns the compressed image."""
+    assert compress_n_times(raw, n) == expected
+
+
+def test_compress_n_times_fail():
+    """Tests that compress_n_times does not return None."""
+    assert compress_n_times(GRADIENT, 3) is not None
+
+
+# --------------------------------------------------------------------------
+# Tests for compress with other factors
+# --------------------------------------------------------------------------
+
+
+def block_average(raw, factor):
+    """Straightforward version of compress for any factor to compare against."""
+    output = []
+    for top in range(0, len(raw), factor):
+        output.append([])
+        for left in range(0, len(raw[0]), factor):
+            block = [
+                pixel
+                for row in raw[top : top + factor]
+                for pixel in row[left : left + factor]
+            ]
+            average = [sum(p[i] for p in block) // len(block) for i in range(3)]
+            output[-1].append(average)
+    return output
+
+
+@pytest.mark.parametrize("factor", [1, 2, 3, 4, 5, 8])
+@pytest.mark.parametrize(
+    "raw", [GRADIENT, [[[1, 2, 3]]], [row[:4] for row in GRADIENT[:3]]]
+)
+def test_compress_factor_pass(raw, factor):
+    """Tests blocks of any size, including partial blocks on the edges."""
+    assert compress(raw, factor=factor) == block_average(raw, factor)
+    assert compress(RawImage.from_nested(raw), factor=factor).to_nested() == (
+        block_average(raw, factor)
+    )
+
+
+@pytest.mark.parametrize("factor", [0, -2])
+def test_compress_factor_fail(factor):
+    """Tests that a factor below one is rejected."""
+    with pytest.raises(ValueError):
+        compress(GRADIENT, factor=factor)
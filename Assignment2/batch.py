@@ -0,0 +1,347 @@
+"""
+Command line tool that runs filter chains over many images at once.
+
+    filter-images assets/lotus1/lotus.jpg assets/lotus2/lotus.jpg
+    filter-images "assets/*/lotus.jpg" -v small=compress -v dark=invert,grey
+
+Each source image is decoded once and every requested variant is made
+from that one copy. Files are spread over a pool of worker processes.
+Outputs go next to their source, or with -o under the output directory in
+the same layout as the sources, so assets/lotus1/lotus.jpg and
+assets/lotus2/lotus.jpg become out/lotus1/lotus-*.jpg and
+out/lotus2/lotus-*.jpg rather than overwriting each other.
+With --cache-dir, outputs are also kept in an OutputCache, and a variant
+made before from the same input bytes is copied from there instead, so a
+file whose variants are all cached isn't even decoded. --profile records
+how long decoding, each filter pass and encoding take for every file (see
+instrument), and prints a table of them at the end.
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import assignment2
+import instrument
+from assignment2 import get_raw_image, image_from_raw
+from instrument import Recorder, StageRecord
+from output_cache import OutputCache, hash_file
+from pipeline import Pipeline, stage_name
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".ppm", ".tif", ".tiff")
+
+# the same variants the test() helper in assignment2 makes
+DEFAULT_VARIANTS = {
+    "mirrored": ("mirror",),
+    "inverted": ("invert",),
+    "grayscaled": ("grey",),
+    "compressed": ("compress",),
+    "all": ("compress", "grey", "invert", "mirror"),
+}
+
+Variants = Dict[str, Tuple[str, ...]]
+
+# "memory" also traces allocations, which slows down the pure python backend
+PROFILE_MODES = ("time", "memory")
+
+
+class FileReport(NamedTuple):
+    source: str
+    outputs: List[str]
+    pixels: int  # 0 if every output came from the cache
+    seconds: float
+    cached: int = 0  # outputs copied from the cache
+    stages: Tuple[StageRecord, ...] = ()  # with profiling on
+
+    @property
+    def megabytes(self) -> float:
+        """Size of the decoded source pixels in MB."""
+        return self.pixels * 3 / 1_000_000
+
+
+def find_images(patterns: Iterable[str], variants: Iterable[str] = ()) -> List[str]:
+    """
+    Expands patterns, each of which is an image file, a directory of
+    images or a glob pattern, into a sorted list of image files. Files
+    from directories and patterns that are the output of one of variants
+    for another image found, named like output_path names them, are left
+    out, so running over the same directory again doesn't filter the
+    outputs of the last run.
+    """
+    found = set()
+    named = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            names = os.listdir(pattern)
+            candidates = [os.path.join(pattern, name) for name in names]
+        elif glob.has_magic(pattern):
+            candidates = glob.glob(pattern)
+        elif os.path.isfile(pattern):
+            named.add(pattern)
+            continue
+        else:
+            raise FileNotFoundError(pattern)
+
+        for path in candidates:
+            if os.path.isfile(path) and path.lower().endswith(IMAGE_EXTENSIONS):
+                found.add(path)
+
+    variants = list(variants)
+    outputs = {
+        output_path(source, variant, None)
+        for source in found
+        for variant in variants
+    }
+    return sorted(named | (found - outputs))
+
+
+def parse_variant(spec: str) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Parses a variant given as NAME=STAGE,STAGE,... into its name and the
+    names of its stages.
+    """
+    name, separator, stages = spec.partition("=")
+    if not separator or not name or not stages:
+        raise ValueError(f"variants look like name=stage,stage: {spec!r}")
+    return name, tuple(stage_name(stage) for stage in stages.split(","))
+
+
+def output_path(source: str, variant: str, output_dir: Optional[str]) -> str:
+    directory, file_name = os.path.split(source)
+    stem, extension = os.path.splitext(file_name)
+    return os.path.join(output_dir or directory, f"{stem}-{variant}{extension}")
+
+
+def output_dirs(sources: Sequence[str], output_dir: Optional[str]) -> List[str]:
+    """
+    The directory the outputs of each of sources go in: output_dir, or a
+    subdirectory of it matching where the source is relative to the others
+    so that sources with the same name in different places don't collide.
+    Without output_dir, each output goes next to its source.
+    """
+    if not output_dir:
+        return [os.path.dirname(source) for source in sources]
+    directories = [os.path.dirname(os.path.abspath(source)) for source in sources]
+    if not directories:
+        return []
+    common = os.path.commonpath(directories)
+    return [
+        os.path.normpath(os.path.join(output_dir, os.path.relpath(directory, common)))
+        for directory in directories
+    ]
+
+
+def process_file(
+    source: str,
+    variants: Variants,
+    output_dir: Optional[str],
+    backend: str,
+    cache: Optional[OutputCache] = None,
+    profile: Optional[str] = None,
+) -> FileReport:
+    """
+    Decodes source once and writes one output image per variant, taking
+    any that cache already has from there. profile, one of PROFILE_MODES,
+    records the stages of the work in the report.
+    """
+    if profile is None:
+        return _process_file(source, variants, output_dir, backend, cache)
+    if profile not in PROFILE_MODES:
+        raise ValueError(f"unknown profile mode {profile!r}")
+
+    # recorded here rather than by the caller, which may be another process
+    trace_memory = profile == "memory"
+    with instrument.recording(trace_memory=trace_memory, file=source) as recorder:
+        report = _process_file(source, variants, output_dir, backend, cache)
+    return report._replace(stages=tuple(recorder.records))
+
+
+def _process_file(
+    source: str,
+    variants: Variants,
+    output_dir: Optional[str],
+    backend: str,
+    cache: Optional[OutputCache],
+) -> FileReport:
+    assignment2.set_backend(backend)
+    start = time.perf_counter()
+
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    outputs = [output_path(source, name, output_dir) for name in variants]
+    missing = list(zip(variants, outputs))
+    keys = {}
+    if cache is not None:
+        with instrument.stage("cache"):
+            input_hash = hash_file(source)
+            for name, destination in missing:
+                extension = os.path.splitext(destination)[1]
+                stages = Pipeline(variants[name]).stages
+                keys[name] = cache.key(input_hash, stages, extension)
+            missing = [
+                (name, destination)
+                for name, destination in missing
+                if not cache.fetch(keys[name], destination)
+            ]
+
+    pixels = 0
+    if missing:
+        raw = get_raw_image(source, compact=True)
+        pixels = raw.width * raw.height
+        for index, (name, destination) in enumerate(missing):
+            # the last variant can have the decoded image itself
+            image = raw if index == len(missing) - 1 else raw.copy()
+            image_from_raw(Pipeline(variants[name]).run(image), destination)
+            if cache is not None:
+                cache.store(keys[name], destination)
+
+    cached = len(outputs) - len(missing)
+    return FileReport(source, outputs, pixels, time.perf_counter() - start, cached)
+
+
+def process_files(
+    sources: Sequence[str],
+    variants: Variants,
+    output_dir: Optional[str] = None,
+    workers: int = 1,
+    cache: Optional[OutputCache] = None,
+    profile: Optional[str] = None,
+) -> Iterable[FileReport]:
+    """
+    Yields a FileReport for each of sources, in order, using workers
+    processes.
+    """
+    backend = assignment2.get_backend()
+    jobs = list(zip(sources, output_dirs(sources, output_dir)))
+    if workers <= 1 or len(sources) <= 1:
+        for source, directory in jobs:
+            yield process_file(source, variants, directory, backend, cache, profile)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                process_file, source, variants, directory, backend, cache, profile
+            )
+            for source, directory in jobs
+        ]
+        for future in futures:
+            yield future.result()
+
+
+def format_rate(count: float, megabytes: float, seconds: float) -> str:
+    seconds = max(seconds, 1e-9)
+    return f"{count / seconds:.2f} images/sec, {megabytes / seconds:.2f} MB/sec"
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="filter-images",
+        description="Apply filter chains to many images using a pool of workers.",
+    )
+    parser.add_argument(
+        "inputs", nargs="+", help="image files, directories or glob patterns"
+    )
+    parser.add_argument(
+        "-v",
+        "--variant",
+        action="append",
+        metavar="NAME=STAGE,...",
+        help="an output to make from each image, e.g. small=compress,grey "
+        "(default: the same variants as assignment2's test helper)",
+    )
+    parser.add_argument("-o", "--output-dir", help="where to write the outputs")
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="number of worker processes (default: one per core)",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=sorted(assignment2.BACKENDS),
+        default=assignment2.get_backend(),
+    )
+    parser.add_argument(
+        "--cache-dir", help="keep outputs here and reuse them on later runs"
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=1024,
+        help="size the cache is trimmed to (default: 1024)",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=PROFILE_MODES,
+        help="time every stage, and with memory trace its allocations too",
+    )
+    parser.add_argument(
+        "--profile-output",
+        metavar="PATH",
+        help="also write every profiled stage to PATH as a line of JSON",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        variants = DEFAULT_VARIANTS
+        if args.variant:
+            variants = dict(map(parse_variant, args.variant))
+        sources = find_images(args.inputs, variants)
+    except (ValueError, FileNotFoundError) as error:
+        parser.error(str(error))
+
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+    assignment2.set_backend(args.backend)
+    cache = None
+    if args.cache_dir:
+        cache = OutputCache(args.cache_dir, int(args.cache_max_mb * 1_000_000))
+
+    if args.profile_output and not args.profile:
+        parser.error("--profile-output needs --profile")
+
+    with ExitStack() as stack:
+        profile_output = None
+        if args.profile_output:
+            profile_output = stack.enter_context(open(args.profile_output, "w"))
+        recorder = Recorder(profile_output)
+
+        start = time.perf_counter()
+        total_megabytes = 0.0
+        total_cached = 0
+        reports = process_files(
+            sources, variants, args.output_dir, args.workers, cache, args.profile
+        )
+        for report in reports:
+            total_megabytes += report.megabytes
+            total_cached += report.cached
+            for record in report.stages:
+                recorder.add(record)
+            from_cache = f", {report.cached} from cache" if cache is not None else ""
+            print(
+                f"{report.source}: {len(report.outputs)} outputs{from_cache} in "
+                f"{report.seconds:.3f}s "
+                f"({format_rate(1, report.megabytes, report.seconds)})"
+            )
+        elapsed = time.perf_counter() - start
+
+        print(
+            f"processed {len(sources)} images in {elapsed:.3f}s "
+            f"({format_rate(len(sources), total_megabytes, elapsed)})"
+        )
+        if cache is not None:
+            print(f"{total_cached} outputs came from the cache in {args.cache_dir}")
+        if args.profile:
+            print(recorder.summary())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
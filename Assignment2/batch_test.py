@@ -0,0 +1,258 @@
+import json
+import os
+import random
+
+import pytest
+
+import batch
+from assignment2 import get_raw_image, image_from_raw
+from batch import find_images, main, parse_variant, process_files
+from output_cache import OutputCache
+from pipeline import Pipeline
+from raw_image import RawImage
+
+
+def make_image(path, height=6, width=5, seed=0):
+    rng = random.Random(seed)
+    data = bytearray(rng.randrange(256) for _ in range(width * height * 3))
+    raw = RawImage(width, height, data)
+    image_from_raw(raw, str(path))
+    return raw
+
+
+# --------------------------------------------------------------------------
+# Tests for finding inputs and parsing variants
+# --------------------------------------------------------------------------
+
+
+def test_find_images(tmp_path):
+    for name in ["a.png", "b.PNG", "c.txt"]:
+        (tmp_path / name).write_bytes(b"")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "d.jpg").write_bytes(b"")
+
+    expected = [str(tmp_path / "a.png"), str(tmp_path / "b.PNG")]
+    assert find_images([str(tmp_path)]) == expected
+    assert find_images([str(tmp_path / "*.png"), str(tmp_path / "a.png")]) == [
+        str(tmp_path / "a.png")
+    ]
+    assert find_images([str(tmp_path / "*" / "*.jpg")]) == [
+        str(tmp_path / "sub" / "d.jpg")
+    ]
+
+
+def test_find_images_skips_outputs(tmp_path):
+    names = ["lotus.jpg", "lotus-all.jpg", "lotus-all-small.jpg", "lotus-small.png"]
+    names += ["sea-all.jpg", "sea-big.jpg", "sea.jpg"]
+    for name in names:
+        (tmp_path / name).write_bytes(b"")
+    expected = ["lotus-small.png", "lotus.jpg", "sea-big.jpg", "sea.jpg"]
+
+    found = find_images([str(tmp_path)], ["all", "small"])
+    assert found == [str(tmp_path / name) for name in expected]
+    found = find_images([str(tmp_path / "*.jpg")], ["all", "small"])
+    assert found == [str(tmp_path / name) for name in expected if "png" not in name]
+    # unless they are asked for by name
+    found = find_images([str(tmp_path / "lotus-all.jpg")], ["all", "small"])
+    assert found == [str(tmp_path / "lotus-all.jpg")]
+
+
+def test_main_skips_earlier_outputs(tmp_path, capsys):
+    make_image(tmp_path / "lotus.png")
+    assert main([str(tmp_path), "-j", "1"]) == 0
+    assert main([str(tmp_path), "-j", "1"]) == 0
+    assert "processed 1 images" in capsys.readouterr().out
+    assert len(os.listdir(tmp_path)) == 6
+
+
+def test_find_images_missing(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        find_images([str(tmp_path / "nope.png")])
+
+
+@pytest.mark.parametrize(
+    "spec, expected",
+    [
+        ("small=compress", ("small", ("compress",))),
+        ("mix=grey,invert,mirror", ("mix", ("grey", "invert", "mirror"))),
+    ],
+)
+def test_parse_variant_pass(spec, expected):
+    assert parse_variant(spec) == expected
+
+
+@pytest.mark.parametrize("spec", ["compress", "=grey", "x=", "x=blur"])
+def test_parse_variant_fail(spec):
+    with pytest.raises(ValueError):
+        parse_variant(spec)
+
+
+# --------------------------------------------------------------------------
+# Tests for processing files
+# --------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_process_files(tmp_path, workers):
+    """Every variant of every source is written, matching the Pipeline."""
+    sources = [str(tmp_path / f"image{i}.png") for i in range(3)]
+    raws = [make_image(source, seed=i) for i, source in enumerate(sources)]
+    variants = {"flip": ("mirror",), "small": ("compress", "grey")}
+
+    reports = list(process_files(sources, variants, str(tmp_path), workers))
+    assert [report.source for report in reports] == sources
+
+    for raw, report in zip(raws, reports):
+        assert report.pixels == raw.width * raw.height
+        for name, output in zip(variants, report.outputs):
+            expected = Pipeline(variants[name]).run(raw.copy())
+            assert get_raw_image(output, compact=True) == expected
+
+
+def test_main_reports_throughput(tmp_path, capsys):
+    make_image(tmp_path / "lotus.png")
+    output_dir = tmp_path / "out"
+    code = main([str(tmp_path / "lotus.png"), "-o", str(output_dir), "-j", "1"])
+
+    assert code == 0
+    assert sorted(os.listdir(output_dir)) == [
+        "lotus-all.png",
+        "lotus-compressed.png",
+        "lotus-grayscaled.png",
+        "lotus-inverted.png",
+        "lotus-mirrored.png",
+    ]
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 2
+    assert "images/sec" in lines[0] and "MB/sec" in lines[0]
+    assert lines[1].startswith("processed 1 images")
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_same_names_kept_apart(tmp_path, workers):
+    sources, raws = [], []
+    for i, folder in enumerate(["lotus1", "lotus2", "lotus2/small"]):
+        (tmp_path / folder).mkdir()
+        sources.append(str(tmp_path / folder / "lotus.png"))
+        raws.append(make_image(sources[-1], seed=i))
+    output_dir = tmp_path / "out"
+    reports = process_files(sources, {"flip": ("mirror",)}, str(output_dir), workers)
+
+    outputs = [output for report in reports for output in report.outputs]
+    assert outputs == [
+        str(output_dir / "lotus1" / "lotus-flip.png"),
+        str(output_dir / "lotus2" / "lotus-flip.png"),
+        str(output_dir / "lotus2" / "small" / "lotus-flip.png"),
+    ]
+    for raw, output in zip(raws, outputs):
+        expected = Pipeline(["mirror"]).run(raw.copy())
+        assert get_raw_image(output, compact=True) == expected
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_process_files_cached(tmp_path, monkeypatch, workers):
+    """A second run copies every output from the cache without decoding."""
+    sources = [str(tmp_path / f"image{i}.png") for i in range(2)]
+    for i, source in enumerate(sources):
+        make_image(source, seed=i)
+    variants = {"flip": ("mirror",), "small": ("compress", "grey")}
+    cache = OutputCache(str(tmp_path / "cache"))
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+
+    first = list(process_files(sources, variants, str(output_dir), workers, cache))
+    names = os.listdir(output_dir)
+    expected = {name: (output_dir / name).read_bytes() for name in names}
+    for name in expected:
+        (output_dir / name).unlink()
+
+    def no_decoding(*args, **kwargs):
+        raise AssertionError("decoded a cached image")
+
+    monkeypatch.setattr(batch, "get_raw_image", no_decoding)
+    second = list(process_files(sources, variants, str(output_dir), 1, cache))
+
+    assert [report.cached for report in first] == [0, 0]
+    assert [(report.cached, report.pixels) for report in second] == [(2, 0), (2, 0)]
+    assert {name: (output_dir / name).read_bytes() for name in expected} == expected
+
+
+def test_main_with_cache_dir(tmp_path, capsys):
+    make_image(tmp_path / "lotus.png")
+    arguments = [str(tmp_path / "lotus.png"), "-o", str(tmp_path / "out"), "-j", "1"]
+    arguments += ["--cache-dir", str(tmp_path / "cache")]
+
+    assert main(arguments) == 0
+    assert "0 outputs came from the cache" in capsys.readouterr().out
+    assert main(arguments) == 0
+    out = capsys.readouterr().out
+    assert "5 outputs, 5 from cache" in out
+    assert "5 outputs came from the cache" in out
+
+
+@pytest.mark.parametrize("cached", [False, True])
+@pytest.mark.parametrize("workers", [1, 2])
+def test_process_files_profiled(tmp_path, workers, cached):
+    sources = [str(tmp_path / f"image{i}.png") for i in range(2)]
+    for i, source in enumerate(sources):
+        make_image(source, seed=i)
+    variants = {"flip": ("mirror",), "small": ("compress", "grey")}
+    cache = OutputCache(str(tmp_path / "cache")) if cached else None
+    reports = list(
+        process_files(
+            sources, variants, str(tmp_path), workers, cache, profile="time"
+        )
+    )
+
+    for source, report in zip(sources, reports):
+        # only looking things up in a cache is recorded as a stage
+        lookup = [(source, "cache")] if cached else []
+        assert [(record.file, record.stage) for record in report.stages] == lookup + [
+            (source, "decode"),
+            (source, "mirror"),
+            (source, "encode"),
+            (source, "compress"),
+            (source, "grey"),
+            (source, "encode"),
+        ]
+
+
+def test_process_files_unprofiled(tmp_path):
+    make_image(tmp_path / "lotus.png")
+    (report,) = process_files([str(tmp_path / "lotus.png")], {"flip": ("mirror",)})
+    assert report.stages == ()
+
+
+def test_main_profile(tmp_path, capsys):
+    make_image(tmp_path / "lotus.png")
+    arguments = [str(tmp_path / "lotus.png"), "-o", str(tmp_path / "out"), "-j", "1"]
+    profile = tmp_path / "profile.jsonl"
+    profiling = ["--profile", "memory", "--profile-output", str(profile)]
+
+    assert main(arguments + profiling) == 0
+    assert "Mpixels/s" in capsys.readouterr().out
+    lines = [json.loads(line) for line in profile.read_text().splitlines()]
+    assert {line["stage"] for line in lines} >= {"decode", "encode", "grey"}
+    assert all(line["allocated"] is not None for line in lines)
+
+    with pytest.raises(SystemExit):
+        main(arguments + ["--profile-output", str(profile)])
+
+
+def test_main_closes_profile_output_on_error(tmp_path, monkeypatch):
+    make_image(tmp_path / "lotus.png")
+    opened = []
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    def record_open(*args, **kwargs):
+        opened.append(open(*args, **kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr(batch, "process_files", fail)
+    monkeypatch.setattr(batch, "open", record_open, raising=False)
+    profiling = ["--profile", "time", "--profile-output", str(tmp_path / "p.jsonl")]
+    with pytest.raises(OSError):
+        main([str(tmp_path / "lotus.png"), *profiling])
+    assert len(opened) == 1 and opened[0].closed
@@ -0,0 +1,54 @@
+import random
+
+import pytest
+from PIL import Image
+
+import assignment2
+from raw_image import RawImage
+
+
+@pytest.fixture(params=sorted(assignment2.BACKENDS))
+def backend(request):
+    """Runs the test with each backend in turn, then puts the old one back."""
+    previous = assignment2.get_backend()
+    assignment2.set_backend(request.param)
+    yield request.param
+    assignment2.set_backend(previous)
+
+
+def _random_raw(height, width, seed=0, stride=None):
+    rng = random.Random(seed)
+    stride = stride if stride is not None else width * 3
+    data = bytearray(rng.randrange(256) for _ in range(stride * height))
+    return RawImage(width, height, data, stride)
+
+
+@pytest.fixture
+def random_raw():
+    """Makes RawImages of random pixels, the same ones for the same seed."""
+    return _random_raw
+
+
+def _random_nested(height, width, seed=0):
+    rng = random.Random(seed)
+    return [
+        [[rng.randrange(256) for _ in range(3)] for _ in range(width)]
+        for _ in range(height)
+    ]
+
+
+@pytest.fixture
+def random_nested():
+    """Makes nested lists of random pixels, the same ones for the same seed."""
+    return _random_nested
+
+
+def _save_image(path, width=4, height=3, colour=(10, 20, 30)):
+    Image.new("RGB", (width, height), colour).save(path)
+    return str(path)
+
+
+@pytest.fixture
+def save_image():
+    """Saves an image of one colour at a path and gives back the path."""
+    return _save_image
@@ -0,0 +1,326 @@
+"""
+Benchmarks for the assignment2 filters on synthetic images, with baselines
+to catch performance regressions.
+
+    python filter_bench.py --save baseline.json
+    python filter_bench.py --baseline baseline.json --threshold 0.1
+    python filter_bench.py --sizes 64 1K --backends numpy --layouts raw
+
+Every filter is timed through the assignment2 function callers use, so
+backend dispatch and the copy on write check are counted too: on RawImages
+with every available backend, and on nested lists, which the filters work
+through in pure python whatever the backend. get_raw_image and
+image_from_raw, which go through pillow whatever the backend, are timed
+once per layout. Each result records pixels per second, from the best of
+several rounds, and the peak memory traced by tracemalloc over one more
+run. With --baseline, the exit status is 1 if any result is slower or uses
+more memory than the baseline by more than --threshold.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import timeit
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+import assignment2
+from assignment2 import BACKENDS, get_raw_image, image_from_raw
+from raw_image import RawImage
+
+# bumped when results stop being comparable with older baselines
+BASELINE_VERSION = 3
+
+SIZES = {
+    "64": (64, 64),
+    "256": (256, 256),
+    "1K": (1024, 1024),
+    "HD": (1920, 1080),
+    "4K": (3840, 2160),
+    "8K": (7680, 4320),
+}
+
+FILTERS = ("mirror", "grey", "invert", "merge", "compress")
+CODECS = ("get_raw_image", "image_from_raw")
+OPERATIONS = FILTERS + CODECS
+
+# get_raw_image and image_from_raw are recorded under this backend name
+PILLOW = "pillow"
+
+# how the pixels are handed over: a RawImage, or nested lists of them
+LAYOUTS = ("raw", "nested")
+
+# the filters on nested lists never reach a backend, so they're recorded
+# under this one, and only when it's asked for
+NESTED_BACKEND = "python"
+
+# the python backend and nested lists take minutes per run at 4K and up,
+# so --sizes or --backends is worth narrowing down for a quick check
+DEFAULT_SIZES = ("64", "256", "1K", "4K", "8K")
+
+DEFAULT_THRESHOLD = 0.2
+
+# what each tracked metric is called in the results, and whether a bigger
+# number is better
+METRICS = {"pixels_per_sec": True, "peak_bytes": False}
+
+
+class Result(NamedTuple):
+    operation: str
+    backend: str
+    layout: str
+    size: str
+    pixels: int
+    seconds: float  # per call, the best of the rounds
+    peak_bytes: int  # traced by tracemalloc, so not pillow's own buffers
+
+    @property
+    def key(self) -> str:
+        return f"{self.operation}/{self.backend}/{self.layout}/{self.size}"
+
+    @property
+    def pixels_per_sec(self) -> float:
+        return self.pixels / self.seconds
+
+
+class Regression(NamedTuple):
+    key: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        """How much worse current is than baseline, as a fraction of it."""
+        return abs(self.current - self.baseline) / self.baseline
+
+
+def synthetic_image(width: int, height: int, seed: int = 0) -> RawImage:
+    """An image of random pixels, the same ones for the same seed."""
+    data = bytearray(random.Random(seed).randbytes(width * height * 3))
+    return RawImage(width, height, data)
+
+
+def best_time(statement: Callable[[], object], repeat: int) -> float:
+    """Seconds per call of statement, the best of repeat rounds."""
+    timer = timeit.Timer(statement)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def peak_memory(statement: Callable[[], object]) -> int:
+    """Bytes statement allocates at most at once, going by tracemalloc."""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        statement()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def _backends(operation: str, layout: str, backends: Sequence[str]) -> List[str]:
+    """The backends operation is timed with on images laid out as layout."""
+    if operation not in FILTERS:
+        return [PILLOW]
+    if layout == "nested":
+        return [NESTED_BACKEND] if NESTED_BACKEND in backends else []
+    return list(backends)
+
+
+def _statement(
+    operation: str, layout: str, width: int, height: int, directory: str
+) -> Callable[[], object]:
+    # every operation gets an image of its own, since mirror, grey and
+    # invert change theirs, and what the codecs cost depends on the pixels
+    raw = synthetic_image(width, height)
+    image = raw if layout == "raw" else raw.to_nested()
+    if operation == "merge":
+        other = synthetic_image(width, height, seed=1)
+        if layout == "nested":
+            other = other.to_nested()
+        return lambda: assignment2.merge(image, other)
+    if operation in FILTERS:
+        # the in place filters cost the same every time they're run on it
+        function = getattr(assignment2, operation)
+        return lambda: function(image)
+
+    # png, so the file saved and loaded is the same every run
+    path = os.path.join(directory, f"{operation}-{layout}-{width}x{height}.png")
+    if operation == "get_raw_image":
+        image_from_raw(raw, path)
+        return lambda: get_raw_image(path, compact=layout == "raw")
+    return lambda: image_from_raw(image, path)
+
+
+def run(
+    sizes: Sequence[str] = DEFAULT_SIZES,
+    backends: Sequence[str] = tuple(BACKENDS),
+    operations: Sequence[str] = OPERATIONS,
+    layouts: Sequence[str] = LAYOUTS,
+    repeat: int = 3,
+) -> List[Result]:
+    """
+    Times every operation on every backend and layout at every size, one
+    of the keys of SIZES, and returns the results in that order.
+    """
+    for kind, names, known in (
+        ("size", sizes, SIZES),
+        ("backend", backends, BACKENDS),
+        ("operation", operations, OPERATIONS),
+        ("layout", layouts, LAYOUTS),
+    ):
+        for name in names:
+            if name not in known:
+                raise ValueError(
+                    f"unknown {kind} {name!r}, expected one of {set(known)}"
+                )
+
+    results = []
+    previous = assignment2.get_backend()
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            for size in sizes:
+                width, height = SIZES[size]
+                for operation in operations:
+                    for layout in layouts:
+                        for backend in _backends(operation, layout, backends):
+                            if backend in BACKENDS:
+                                assignment2.set_backend(backend)
+                            statement = _statement(
+                                operation, layout, width, height, directory
+                            )
+                            seconds = best_time(statement, repeat)
+                            results.append(
+                                Result(
+                                    operation,
+                                    backend,
+                                    layout,
+                                    size,
+                                    width * height,
+                                    seconds,
+                                    peak_memory(statement),
+                                )
+                            )
+    finally:
+        assignment2.set_backend(previous)
+    return results
+
+
+def to_json(results: Sequence[Result]) -> dict:
+    return {
+        "version": BASELINE_VERSION,
+        "python": sys.version.split()[0],
+        "results": {
+            result.key: {
+                "pixels": result.pixels,
+                "seconds": result.seconds,
+                "pixels_per_sec": result.pixels_per_sec,
+                "peak_bytes": result.peak_bytes,
+            }
+            for result in results
+        },
+    }
+
+
+def save_baseline(results: Sequence[Result], path: str) -> None:
+    with open(path, "w") as file:
+        json.dump(to_json(results), file, indent=2)
+        file.write("\n")
+
+
+def load_baseline(path: str) -> Dict[str, dict]:
+    """The results saved at path by save_baseline, by Result.key."""
+    with open(path) as file:
+        baseline = json.load(file)
+    if baseline.get("version") != BASELINE_VERSION:
+        raise ValueError(f"{path} isn't a version {BASELINE_VERSION} baseline")
+    return baseline["results"]
+
+
+def compare(
+    baseline: Dict[str, dict],
+    results: Sequence[Result],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[Regression]:
+    """
+    Every metric of results that is worse than in baseline by more than
+    threshold, a fraction of the baseline value. Results the baseline
+    doesn't have are skipped.
+    """
+    regressions = []
+    for key, current in to_json(results)["results"].items():
+        if key not in baseline:
+            continue
+        for metric, bigger_is_better in METRICS.items():
+            before, after = baseline[key][metric], current[metric]
+            if bigger_is_better:
+                worse = after < before * (1 - threshold)
+            else:
+                worse = after > before * (1 + threshold)
+            if worse:
+                regressions.append(Regression(key, metric, before, after))
+    return regressions
+
+
+def print_results(results: Sequence[Result]) -> None:
+    print(
+        f"{'operation':>14} {'backend':>8} {'layout':>6} {'size':>5} "
+        f"{'time':>12} {'Mpixels/s':>10} {'peak':>10}"
+    )
+    for result in results:
+        print(
+            f"{result.operation:>14} {result.backend:>8} {result.layout:>6} "
+            f"{result.size:>5} "
+            f"{result.seconds * 1e3:>10.3f}ms {result.pixels_per_sec / 1e6:>10.2f} "
+            f"{result.peak_bytes / 1e6:>8.2f}MB"
+        )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", nargs="+", choices=SIZES, default=DEFAULT_SIZES)
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=None)
+    parser.add_argument("--operations", nargs="+", choices=OPERATIONS, default=None)
+    parser.add_argument("--layouts", nargs="+", choices=LAYOUTS, default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", metavar="PATH", help="save results as a baseline")
+    parser.add_argument("--baseline", metavar="PATH", help="compare with a baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="how much worse than the baseline a metric may get, as a fraction",
+    )
+    args = parser.parse_args(argv)
+
+    results = run(
+        args.sizes,
+        args.backends or list(BACKENDS),
+        args.operations or OPERATIONS,
+        args.layouts or LAYOUTS,
+        args.repeat,
+    )
+    print_results(results)
+    if args.save:
+        save_baseline(results, args.save)
+    if not args.baseline:
+        return 0
+
+    regressions = compare(load_baseline(args.baseline), results, args.threshold)
+    for regression in regressions:
+        print(
+            f"regression: {regression.key} {regression.metric} went from "
+            f"{regression.baseline:.4g} to {regression.current:.4g} "
+            f"({regression.change:.0%} worse)",
+            file=sys.stderr,
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,188 @@
+import json
+import timeit
+
+import pytest
+
+import assignment2
+import filter_bench
+from assignment2 import BACKENDS
+from filter_bench import (
+    LAYOUTS,
+    OPERATIONS,
+    PILLOW,
+    Result,
+    compare,
+    load_baseline,
+    main,
+    run,
+    save_baseline,
+    synthetic_image,
+)
+
+
+@pytest.fixture(autouse=True)
+def fast_runs(monkeypatch):
+    # a tiny image timed once is enough to check what gets recorded
+    monkeypatch.setitem(filter_bench.SIZES, "tiny", (8, 4))
+    monkeypatch.setattr(
+        filter_bench,
+        "best_time",
+        lambda statement, repeat: timeit.timeit(statement, number=1),
+    )
+
+
+def result(operation="grey", seconds=1.0, peak_bytes=1000):
+    return Result(operation, "python", "raw", "tiny", 32, seconds, peak_bytes)
+
+
+# --------------------------------------------------------------------------
+# Tests for running benchmarks
+# --------------------------------------------------------------------------
+
+
+def test_synthetic_image():
+    raw = synthetic_image(8, 4)
+    assert raw.size == (8, 4)
+    assert raw == synthetic_image(8, 4)
+    assert raw != synthetic_image(8, 4, seed=1)
+
+
+def test_run_covers_every_operation():
+    results = run(["tiny"], repeat=1)
+
+    expected = []
+    for operation in OPERATIONS:
+        for layout in LAYOUTS:
+            if operation not in filter_bench.FILTERS:
+                backends = [PILLOW]
+            elif layout == "nested":
+                backends = ["python"]
+            else:
+                backends = BACKENDS
+            expected += [(operation, backend, layout) for backend in backends]
+    assert [(r.operation, r.backend, r.layout) for r in results] == expected
+    for r in results:
+        assert r.pixels == 32 and r.seconds > 0 and r.peak_bytes >= 0
+
+
+def test_run_uses_public_functions(monkeypatch, backend):
+    """Filters go through assignment2, with the backend being timed set."""
+    calls = []
+    monkeypatch.setattr(
+        assignment2,
+        "grey",
+        lambda raw: calls.append((assignment2.get_backend(), type(raw).__name__)),
+    )
+    run(["tiny"], list(BACKENDS), ["grey"], repeat=1)
+
+    assert set(calls) == {(name, "RawImage") for name in BACKENDS} | {
+        ("python", "list")
+    }
+    assert assignment2.get_backend() == backend
+
+
+def test_nested_needs_python_backend():
+    if "numpy" not in BACKENDS:
+        pytest.skip("numpy isn't installed")
+    results = run(["tiny"], ["numpy"], ["grey"], LAYOUTS, repeat=1)
+    assert [(r.backend, r.layout) for r in results] == [("numpy", "raw")]
+
+
+@pytest.mark.parametrize(
+    "arguments",
+    [
+        {"sizes": ["huge"]},
+        {"backends": ["fortran"]},
+        {"operations": ["blur"]},
+        {"layouts": ["flat"]},
+    ],
+)
+def test_run_rejects_unknown_names(arguments):
+    with pytest.raises(ValueError):
+        run(**{"sizes": ["tiny"], **arguments})
+
+
+# --------------------------------------------------------------------------
+# Tests for baselines
+# --------------------------------------------------------------------------
+
+
+def test_save_and_load_baseline(tmp_path):
+    path = str(tmp_path / "baseline.json")
+    save_baseline([result()], path)
+
+    assert load_baseline(path) == {
+        "grey/python/raw/tiny": {
+            "pixels": 32,
+            "seconds": 1.0,
+            "pixels_per_sec": 32.0,
+            "peak_bytes": 1000,
+        }
+    }
+
+
+def test_load_baseline_checks_version(tmp_path):
+    path = tmp_path / "baseline.json"
+    path.write_text(json.dumps({"version": 0, "results": {}}))
+    with pytest.raises(ValueError):
+        load_baseline(str(path))
+
+
+@pytest.mark.parametrize(
+    "current, metrics",
+    [
+        (result(), []),
+        # within the threshold either way
+        (result(seconds=1.2, peak_bytes=1200), []),
+        (result(seconds=0.5, peak_bytes=500), []),
+        (result(seconds=1.5), ["pixels_per_sec"]),
+        (result(peak_bytes=1300), ["peak_bytes"]),
+        (result(seconds=2.0, peak_bytes=2000), ["pixels_per_sec", "peak_bytes"]),
+        # not in the baseline
+        (result("invert", seconds=100.0), []),
+    ],
+)
+def test_compare(current, metrics):
+    baseline = filter_bench.to_json([result()])["results"]
+    regressions = compare(baseline, [current], threshold=0.25)
+    assert [regression.metric for regression in regressions] == metrics
+
+
+def test_regression_change():
+    baseline = filter_bench.to_json([result()])["results"]
+    (regression,) = compare(baseline, [result(seconds=2.0)])
+    assert regression.change == 0.5
+
+
+def test_main_fails_on_regression(tmp_path, capsys):
+    path = str(tmp_path / "baseline.json")
+    arguments = ["--sizes", "tiny", "--operations", "merge", "--repeat", "1"]
+
+    assert main(arguments + ["--save", path]) == 0
+    assert main(arguments + ["--baseline", path, "--threshold", "1000"]) == 0
+
+    with open(path) as file:
+        baseline = json.load(file)
+    for entry in baseline["results"].values():
+        entry["pixels_per_sec"] *= 1000
+    with open(path, "w") as file:
+        json.dump(baseline, file)
+    capsys.readouterr()
+
+    assert main(arguments + ["--baseline", path]) == 1
+    error = capsys.readouterr().err
+    assert "regression: merge/python/raw/tiny pixels_per_sec" in error
+    assert "regression: merge/python/nested/tiny pixels_per_sec" in error
+
+
+def test_operations_get_their_own_image(monkeypatch):
+    """Codecs see the same random pixels whichever filters ran before."""
+    seen = []
+    monkeypatch.setattr(
+        filter_bench, "image_from_raw", lambda raw, path: seen.append(raw.tobytes())
+    )
+    run(["tiny"], ["python"], ["image_from_raw"], ["raw"], repeat=1)
+    run(["tiny"], ["python"], ["grey", "invert", "image_from_raw"], ["raw"], repeat=1)
+
+    assert len(set(seen)) == 1
+    assert seen[0] == synthetic_image(8, 4).tobytes()
@@ -0,0 +1,27 @@
+"""
+Entry point of the filter-images command (see batch).
+
+Installed, the modules the command runs on live in the assignment2_tools
+directory rather than at the top of site-packages, where names like batch
+and pipeline would clash with other projects. They import each other by
+those plain names, so main puts that directory on sys.path before loading
+batch. Worker processes inherit the path.
+"""
+
+import os
+import sys
+from typing import Optional, Sequence
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    here = os.path.dirname(os.path.abspath(__file__))
+    if here not in sys.path:
+        sys.path.insert(0, here)
+
+    import batch
+
+    return batch.main(argv)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,20 @@
+import os
+import sys
+
+import batch
+from filter_images import main
+
+
+def test_runs_batch(monkeypatch):
+    seen = []
+    monkeypatch.setattr(batch, "main", lambda argv: seen.append(argv) or 3)
+    assert main(["a.jpg", "-j", "1"]) == 3
+    assert seen == [["a.jpg", "-j", "1"]]
+
+
+def test_modules_importable_by_name(monkeypatch):
+    here = os.path.dirname(os.path.abspath(batch.__file__))
+    monkeypatch.setattr(sys, "path", [path for path in sys.path if path != here])
+    monkeypatch.setattr(batch, "main", lambda argv: 0)
+    main([])
+    assert sys.path[0] == here
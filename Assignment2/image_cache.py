@@ -0,0 +1,126 @@
+"""
+Keeps recently decoded images in memory so asking for the same file again
+doesn't decode it again.
+
+    cache = ImageCache(max_bytes=256 * 1024 * 1024)
+    raw = get_raw_image("assets/lotus1/lotus.jpg", compact=True, cache=cache)
+
+Each file is cached under its path along with its size and modification
+time, so a file that changes on disk is decoded again. Every image handed
+out shares the cached pixel buffer, which is read-only, and only gets a
+copy of its own when a filter first writes to it (see
+RawImage.ensure_writable). The least recently used images are dropped
+once the cached pixels add up to more than max_bytes.
+"""
+
+import os
+from collections import OrderedDict
+from typing import Callable, NamedTuple, Optional
+
+from raw_image import RawImage
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int  # images dropped to make room for others
+    entries: int
+    nbytes: int  # pixel bytes held now
+    max_bytes: int
+
+
+def _decode(path: str) -> RawImage:
+    # imported here since assignment2 imports this module for test()
+    from assignment2 import decode_image
+
+    return decode_image(path)
+
+
+class ImageCache:
+    """
+    A least recently used cache of decoded images that holds at most
+    max_bytes of pixels. load decodes a path into a RawImage, by default
+    with decode_image from assignment2.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        load: Optional[Callable[[str], RawImage]] = None,
+    ) -> None:
+        if max_bytes < 0:
+            raise ValueError("max_bytes must not be negative")
+        self.max_bytes = max_bytes
+        self._load = load or _decode
+        # path -> ((file size, mtime in ns), width, height, pixels), with the
+        # most recently used last
+        self._entries: OrderedDict = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, path: str) -> RawImage:
+        """
+        Returns the image at path as a RawImage that shares the cached
+        pixels until it's written to.
+        """
+        key = os.path.abspath(path)
+        status = os.stat(key)
+        signature = (status.st_size, status.st_mtime_ns)
+
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == signature:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        else:
+            self.misses += 1
+            self._discard(key)
+            loaded = self._load(key)
+            pixels = loaded.data
+            # bytes can't change, so packed ones are shared as they are, and
+            # anything else is copied into bytes once
+            shareable = loaded.is_packed and len(pixels) == loaded.nbytes
+            if not (isinstance(pixels, bytes) and shareable):
+                pixels = loaded.tobytes()
+            entry = (signature, loaded.width, loaded.height, pixels)
+            if len(entry[3]) <= self.max_bytes:
+                self._entries[key] = entry
+                self.nbytes += len(entry[3])
+                self._evict()
+
+        _, width, height, pixels = entry
+        return RawImage(width, height, pixels)
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            self.hits,
+            self.misses,
+            self.evictions,
+            len(self._entries),
+            self.nbytes,
+            self.max_bytes,
+        )
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, path: object) -> bool:
+        return isinstance(path, str) and os.path.abspath(path) in self._entries
+
+    def _discard(self, key: str) -> None:
+        # a file that has changed since it was cached
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.nbytes -= len(entry[3])
+
+    def _evict(self) -> None:
+        while self.nbytes > self.max_bytes:
+            _, (_, _, _, pixels) = self._entries.popitem(last=False)
+            self.nbytes -= len(pixels)
+            self.evictions += 1
@@ -0,0 +1,112 @@
+import os
+
+import pytest
+
+from assignment2 import get_raw_image, grey, invert, mirror
+from image_cache import ImageCache, _decode
+from raw_image import RawImage
+
+
+# --------------------------------------------------------------------------
+# Tests for hits, misses and eviction
+# --------------------------------------------------------------------------
+
+
+def test_decoded_once(tmp_path, save_image):
+    path = save_image(tmp_path / "a.png", 4, 3)
+    cache = ImageCache()
+    first = cache.get(path)
+    second = cache.get(path)
+
+    assert first == second == _decode(path)
+    assert first.data is second.data
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 1, 0)
+    assert cache.stats().nbytes == 4 * 3 * 3
+    assert path in cache
+
+
+def test_evicts_least_recently_used(tmp_path, save_image):
+    # each image is 2 * 2 * 3 = 12 bytes and two fit
+    paths = [save_image(tmp_path / f"{i}.png", 2, 2) for i in range(3)]
+    cache = ImageCache(max_bytes=24)
+    cache.get(paths[0])
+    cache.get(paths[1])
+    cache.get(paths[0])
+    cache.get(paths[2])
+
+    assert paths[0] in cache and paths[2] in cache
+    assert paths[1] not in cache
+    assert cache.stats() == (1, 3, 1, 2, 24, 24)
+
+
+def test_too_big_to_cache(tmp_path, save_image):
+    path = save_image(tmp_path / "big.png", 10, 10)
+    cache = ImageCache(max_bytes=100)
+    assert cache.get(path).size == (10, 10)
+    assert len(cache) == 0 and cache.nbytes == 0
+
+
+def test_changed_file_is_decoded_again(tmp_path, save_image):
+    path = save_image(tmp_path / "a.png", 2, 2)
+    cache = ImageCache()
+    cache.get(path)
+
+    save_image(path, 3, 1, colour=(1, 2, 3))
+    status = os.stat(path)
+    os.utime(path, ns=(status.st_atime_ns, status.st_mtime_ns + 10**9))
+    assert cache.get(path).to_nested() == [[[1, 2, 3]] * 3]
+    assert (cache.hits, cache.misses, len(cache), cache.nbytes) == (0, 2, 1, 9)
+
+
+def test_decoded_bytes_not_copied(tmp_path, save_image):
+    path = save_image(tmp_path / "a.png", 4, 3)
+    pixels = bytes(range(6))
+    cache = ImageCache(load=lambda path: RawImage(1, 2, pixels))
+    assert cache.get(path).data is pixels
+
+    decoded = _decode(path)
+    assert isinstance(decoded.data, bytes) and decoded.readonly
+    assert type(ImageCache().get(path).data) is bytes
+
+
+def test_custom_loader(tmp_path, save_image):
+    path = save_image(tmp_path / "a.png", 1, 1)
+    cache = ImageCache(load=lambda path: RawImage(1, 2, bytearray(range(6))))
+    assert cache.get(path).tobytes() == bytes(range(6))
+
+
+# --------------------------------------------------------------------------
+# Tests for copy on write
+# --------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("image_filter", [mirror, grey, invert])
+def test_filters_copy_before_writing(tmp_path, backend, image_filter, save_image):
+    path = save_image(tmp_path / "a.png", 3, 2)
+    cache = ImageCache()
+    image = cache.get(path)
+    assert image.readonly
+
+    image_filter(image)
+    assert not image.readonly
+    assert cache.get(path) == _decode(path)
+
+
+def test_pipeline_copies_before_writing(tmp_path, save_image):
+    from pipeline import Pipeline
+
+    path = save_image(tmp_path / "a.png", 3, 2)
+    cache = ImageCache()
+    result = Pipeline(["invert", "mirror"]).run(cache.get(path))
+    assert result.pixel(0, 0) == [30, 20, 10]
+    assert cache.get(path).pixel(0, 0) == [10, 20, 30]
+
+
+def test_get_raw_image_through_cache(tmp_path, save_image):
+    path = save_image(tmp_path / "a.png", 2, 1)
+    cache = ImageCache()
+    assert get_raw_image(path, cache=cache) == get_raw_image(path)
+    nested = get_raw_image(path, cache=cache)
+    nested[0][0][0] = 99
+    assert get_raw_image(path, compact=True, cache=cache) == _decode(path)
+    assert cache.hits == 2
@@ -0,0 +1,232 @@
+"""
+Opt-in profiling of where the time and memory of an image go: decoding in
+get_raw_image, converting to and from nested lists, each filter, and
+encoding in image_from_raw.
+
+    with instrument.recording(trace_memory=True) as recorder:
+        raw = get_raw_image("assets/lotus1/lotus.jpg", compact=True)
+        grey(raw)
+        image_from_raw(raw, "lotus-grey.jpg")
+    print(recorder.summary())
+
+Every stage that runs while recording adds a StageRecord with its wall
+time, the pixels it worked on, the peak process RSS so far and, with
+trace_memory, the most bytes it had allocated at once according to
+tracemalloc. Records can also be written to a file as JSON lines as they
+happen. Stages aren't meant to nest, since each one resets tracemalloc's
+peak.
+
+When nothing is recording, stage hands back one shared object that does
+nothing, and instrumented functions go straight to the function they wrap,
+so the hooks cost a global lookup and a call each.
+"""
+
+import functools
+import json
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, NamedTuple, Optional, TextIO
+
+from raw_image import RawImage
+
+try:
+    import resource
+except ImportError:  # not on windows, where peak RSS isn't recorded
+    resource = None
+
+
+class StageRecord(NamedTuple):
+    file: Optional[str]  # the file being processed, if the caller said
+    stage: str
+    seconds: float
+    pixels: int
+    allocated: Optional[int]  # peak traced bytes, None without trace_memory
+    peak_rss: Optional[int]  # bytes, None where it can't be found out
+
+
+def peak_rss() -> Optional[int]:
+    """The most memory this process has had resident so far, in bytes."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes everywhere but macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def pixel_count(raw: object) -> int:
+    """Pixels in raw if it's image data, RawImage or nested lists, else 0."""
+    if isinstance(raw, RawImage):
+        return raw.width * raw.height
+    if isinstance(raw, list):
+        return sum(map(len, raw))
+    return 0
+
+
+class Recorder:
+    """
+    Collects the StageRecord of every stage run while it's enabled, and
+    writes each one to sink as a line of JSON if there is a sink. file is
+    attached to every record, for callers working through many files.
+    """
+
+    def __init__(
+        self, sink: Optional[TextIO] = None, trace_memory: bool = False
+    ) -> None:
+        self.sink = sink
+        self.trace_memory = trace_memory
+        self.file: Optional[str] = None
+        self.records: List[StageRecord] = []
+
+    def add(self, record: StageRecord) -> None:
+        self.records.append(record)
+        if self.sink is not None:
+            self.sink.write(json.dumps(record._asdict()) + "\n")
+
+    def summary(self, by: str = "stage") -> str:
+        """
+        A table of the records added up by stage or by file: how many
+        there were, their total time and pixels, the pixel rate, and the
+        most memory any of them allocated or had resident.
+        """
+        if by not in ("stage", "file"):
+            raise ValueError(f"can only summarise by stage or file, not {by!r}")
+        groups = defaultdict(list)
+        for record in self.records:
+            groups[getattr(record, by)].append(record)
+
+        lines = [
+            f"{by:>20} {'calls':>6} {'time':>10} {'Mpixels':>9} "
+            f"{'Mpixels/s':>10} {'allocated':>10} {'peak RSS':>10}"
+        ]
+        for name, records in groups.items():
+            seconds = sum(record.seconds for record in records)
+            pixels = sum(record.pixels for record in records)
+            rate = pixels / seconds / 1e6 if seconds else 0.0
+            lines.append(
+                f"{str(name)[-20:]:>20} {len(records):>6} {seconds:>9.4f}s "
+                f"{pixels / 1e6:>9.3f} {rate:>10.2f} "
+                f"{_megabytes(r.allocated for r in records):>10} "
+                f"{_megabytes(r.peak_rss for r in records):>10}"
+            )
+        return "\n".join(lines)
+
+
+def _megabytes(values) -> str:
+    known = [value for value in values if value is not None]
+    return f"{max(known) / 1e6:.2f}MB" if known else "-"
+
+
+_recorder: Optional[Recorder] = None
+
+
+class _Stage:
+    __slots__ = ("recorder", "name", "pixels", "_start", "_traced")
+
+    def __init__(self, recorder: Recorder, name: str, pixels: int) -> None:
+        self.recorder = recorder
+        self.name = name
+        self.pixels = pixels
+
+    def __enter__(self) -> "_Stage":
+        self._traced = 0
+        if self.recorder.trace_memory:
+            tracemalloc.reset_peak()
+            self._traced = tracemalloc.get_traced_memory()[0]
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        seconds = time.perf_counter() - self._start
+        allocated = None
+        if self.recorder.trace_memory:
+            allocated = tracemalloc.get_traced_memory()[1] - self._traced
+        self.recorder.add(
+            StageRecord(
+                self.recorder.file,
+                self.name,
+                seconds,
+                self.pixels,
+                allocated,
+                peak_rss(),
+            )
+        )
+
+
+class _NullStage:
+    # setting pixels on the shared instance is harmless, nothing reads it
+    __slots__ = ("pixels",)
+
+    def __enter__(self) -> "_NullStage":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+def stage(name: str, pixels: int = 0):
+    """
+    A context manager that records the block under it as the stage name.
+    pixels can also be set on the object it gives once it's known.
+
+        with instrument.stage("decode") as decoding:
+            ...
+            decoding.pixels = width * height
+    """
+    if _recorder is None:
+        return _NULL_STAGE
+    return _Stage(_recorder, name, pixels)
+
+
+def instrumented(function: Callable) -> Callable:
+    """
+    Records every call of function as a stage named after it, with the
+    pixels of every image passed to it.
+    """
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if _recorder is None:
+            return function(*args, **kwargs)
+        pixels = sum(map(pixel_count, args))
+        with _Stage(_recorder, function.__name__, pixels):
+            return function(*args, **kwargs)
+
+    return wrapper
+
+
+def enabled() -> bool:
+    return _recorder is not None
+
+
+@contextmanager
+def recording(
+    sink: Optional[TextIO] = None,
+    trace_memory: bool = False,
+    file: Optional[str] = None,
+) -> Iterator[Recorder]:
+    """
+    Records every stage run inside the with block into the Recorder it
+    gives, then goes back to whatever was recording before. trace_memory
+    starts tracemalloc if it isn't already running, which slows down
+    python code that allocates a lot, so the times are less accurate.
+    """
+    global _recorder
+    recorder = Recorder(sink, trace_memory)
+    recorder.file = file
+    previous = _recorder
+    started = trace_memory and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    _recorder = recorder
+    try:
+        yield recorder
+    finally:
+        _recorder = previous
+        if started:
+            tracemalloc.stop()
@@ -0,0 +1,136 @@
+import io
+import json
+import tracemalloc
+
+import pytest
+
+import instrument
+from assignment2 import compress, get_raw_image, grey, image_from_raw, merge
+from instrument import Recorder, StageRecord, pixel_count, recording, stage
+from pipeline import Pipeline
+from raw_image import RawImage
+
+
+def stages(recorder):
+    return [(record.stage, record.pixels) for record in recorder.records]
+
+
+# --------------------------------------------------------------------------
+# Tests for turning recording on and off
+# --------------------------------------------------------------------------
+
+
+def test_disabled_by_default():
+    assert not instrument.enabled()
+    with stage("decode") as decoding:
+        decoding.pixels = 12
+    assert stage("encode") is stage("decode")
+
+
+def test_recording_restores_previous():
+    with recording() as outer:
+        with recording() as inner:
+            grey(RawImage(2, 2))
+        compress(RawImage(2, 2))
+        assert instrument.enabled()
+    assert not instrument.enabled()
+    assert stages(inner) == [("grey", 4)]
+    assert stages(outer) == [("compress", 4)]
+
+
+def test_trace_memory():
+    assert not tracemalloc.is_tracing()
+    with recording(trace_memory=True) as recorder:
+        merge(RawImage(10, 10), RawImage(20, 5))
+    assert not tracemalloc.is_tracing()
+
+    (record,) = recorder.records
+    assert record.stage == "merge" and record.pixels == 200
+    # the merged image is 20x10
+    assert record.allocated >= 20 * 10 * 3
+
+
+def test_records_without_trace_memory():
+    with recording(file="lotus.jpg") as recorder:
+        grey([[[1, 2, 3]]])
+    (record,) = recorder.records
+    assert record.file == "lotus.jpg"
+    assert record.seconds >= 0 and record.allocated is None
+
+
+@pytest.mark.parametrize(
+    "raw, pixels",
+    [(RawImage(4, 3), 12), ([[[0, 0, 0]] * 4] * 3, 12), ([], 0), (2, 0)],
+)
+def test_pixel_count(raw, pixels):
+    assert pixel_count(raw) == pixels
+
+
+# --------------------------------------------------------------------------
+# Tests for the hooks
+# --------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "compact, expected",
+    [(True, [("decode", 12)]), (False, [("decode", 12), ("to_nested", 12)])],
+)
+def test_get_raw_image_stages(tmp_path, compact, expected, save_image):
+    path = save_image(tmp_path / "a.png")
+    with recording() as recorder:
+        get_raw_image(path, compact=compact)
+    assert stages(recorder) == expected
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        (RawImage(4, 3), [("encode", 12)]),
+        ([[[0, 0, 0]] * 4] * 3, [("from_nested", 12), ("encode", 12)]),
+    ],
+)
+def test_image_from_raw_stages(tmp_path, raw, expected):
+    with recording() as recorder:
+        image_from_raw(raw, str(tmp_path / "a.png"))
+    assert stages(recorder) == expected
+
+
+def test_pipeline_stages():
+    with recording() as recorder:
+        Pipeline(["mirror", "compress", "grey", "invert"]).run(RawImage(4, 4))
+    assert stages(recorder) == [("mirror", 16), ("compress", 16), ("grey+invert", 4)]
+
+
+# --------------------------------------------------------------------------
+# Tests for output
+# --------------------------------------------------------------------------
+
+
+def test_json_lines():
+    sink = io.StringIO()
+    with recording(sink, file="a.png"):
+        grey(RawImage(2, 1))
+        compress(RawImage(2, 1))
+
+    lines = [json.loads(line) for line in sink.getvalue().splitlines()]
+    assert [line["stage"] for line in lines] == ["grey", "compress"]
+    assert StageRecord(**lines[0]).file == "a.png"
+
+
+def test_summary():
+    recorder = Recorder()
+    recorder.add(StageRecord("a.png", "decode", 0.5, 1_000_000, None, None))
+    recorder.add(StageRecord("b.png", "decode", 1.5, 3_000_000, 2_000_000, None))
+    recorder.add(StageRecord("b.png", "encode", 1.0, 1_000_000, None, None))
+
+    header, decode, encode = recorder.summary().splitlines()
+    assert header.split() == [
+        "stage", "calls", "time", "Mpixels", "Mpixels/s", "allocated", "peak", "RSS"
+    ]
+    assert decode.split() == ["decode", "2", "2.0000s", "4.000", "2.00", "2.00MB", "-"]
+    assert encode.split()[:2] == ["encode", "1"]
+
+    by_file = recorder.summary(by="file").splitlines()[1:]
+    assert [line.split()[:2] for line in by_file] == [["a.png", "1"], ["b.png", "2"]]
+    with pytest.raises(ValueError):
+        recorder.summary(by="backend")
@@ -0,0 +1,192 @@
+"""
+NumPy versions of the assignment2 filters that work on RawImage data. Each
+filter is a handful of whole-array operations on a (height, width, 3) view
+of the image buffer, and gives exactly the same pixels as python_backend.
+Importing this module raises ImportError when NumPy isn't installed.
+"""
+
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from python_backend import merge_order
+from raw_image import RawImage
+
+
+def as_array(raw: RawImage) -> np.ndarray:
+    """
+    Returns a (height, width, 3) uint8 array that shares memory with raw,
+    so writing to the array writes to the image.
+    """
+    if raw.width == 0 or raw.height == 0:
+        return np.zeros((raw.height, raw.width, 3), dtype=np.uint8)
+
+    return np.ndarray(
+        (raw.height, raw.width, 3),
+        dtype=np.uint8,
+        buffer=raw.data,
+        strides=(raw.stride, 3, 1),
+    )
+
+
+def from_array(array: np.ndarray) -> RawImage:
+    height, width, _ = array.shape
+    data = bytearray(np.ascontiguousarray(array, dtype=np.uint8))
+    return RawImage(width, height, data)
+
+
+def _greyed(pixels: np.ndarray) -> np.ndarray:
+    averages = pixels.sum(axis=2, dtype=np.uint16) // 3
+    return averages[:, :, np.newaxis]
+
+
+def _inverted(pixels: np.ndarray) -> np.ndarray:
+    max_colour = pixels.max(axis=2, keepdims=True)
+    min_colour = pixels.min(axis=2, keepdims=True)
+    # a channel equal to the min or max becomes the other one, which is
+    # the same thing as max + min - channel
+    swapped = max_colour.astype(np.uint16) + min_colour - pixels
+    is_extreme = (pixels == max_colour) | (pixels == min_colour)
+    return np.where(is_extreme, swapped, pixels)
+
+
+PIXEL_OPS = {"grey": _greyed, "invert": _inverted}
+
+
+def mirror(raw: RawImage) -> None:
+    raw.ensure_writable()
+    pixels = as_array(raw)
+    # numpy notices the overlap and copies before writing
+    pixels[:] = pixels[:, ::-1]
+
+
+def grey(raw: RawImage) -> None:
+    raw.ensure_writable()
+    pixels = as_array(raw)
+    pixels[:] = _greyed(pixels)
+
+
+def invert(raw: RawImage) -> None:
+    raw.ensure_writable()
+    pixels = as_array(raw)
+    pixels[:] = _inverted(pixels)
+
+
+def fused_pass(raw: RawImage, pixel_ops: Sequence[str], mirrored: bool) -> None:
+    """
+    Applies each of the per pixel operations in pixel_ops ("grey" or
+    "invert") in order and then mirrors if mirrored is True. Mirroring is
+    done by reading the columns backwards rather than as a separate pass.
+    """
+    raw.ensure_writable()
+    pixels = as_array(raw)
+    result = pixels[:, ::-1] if mirrored else pixels
+    for name in pixel_ops:
+        result = PIXEL_OPS[name](result)
+    pixels[:] = result
+
+
+def merge(*raws: RawImage) -> RawImage:
+    height = max(raw.height for raw in raws)
+    width = max(raw.width for raw in raws)
+    merged = np.zeros((height, width, 3), dtype=np.uint8)
+    arrays = [as_array(raw) for raw in raws]
+
+    # every n-th row, starting at row i, prefers image i, so paint the
+    # other images first and the preferred one on top of them
+    for first in range(len(arrays)):
+        for pixels in merge_order(arrays, first):
+            source_height, source_width, _ = pixels.shape
+            rows = slice(first, source_height, len(arrays))
+            merged[rows, :source_width] = pixels[rows]
+
+    return from_array(merged)
+
+
+def _pair_totals(pixels: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Totals and pixel counts of each 2x2 block of pixels."""
+    image_height, image_width, _ = pixels.shape
+    height = (image_height + 1) // 2
+    width = (image_width + 1) // 2
+
+    # pad the image out to an even size with zeros, and keep track of how
+    # many real pixels fall in each 2x2 block so edges average correctly
+    padded = np.zeros((height * 2, width * 2, 3), dtype=np.uint16)
+    padded[:image_height, :image_width] = pixels
+    present = np.zeros((height * 2, width * 2), dtype=np.uint16)
+    present[:image_height, :image_width] = 1
+
+    totals = padded.reshape(height, 2, width, 2, 3).sum(axis=(1, 3))
+    counts = present.reshape(height, 2, width, 2).sum(axis=(1, 3))
+    return totals, counts
+
+
+def _run_totals(array: np.ndarray, factor: int, axis: int, dtype) -> np.ndarray:
+    """
+    Totals of each run of factor values along axis of array, the last run
+    being whatever is left over. The sums are buffered, so only the result
+    is allocated, never array converted to dtype.
+    """
+    length = array.shape[axis]
+    whole = length // factor
+    shape = list(array.shape)
+    shape[axis] = -(-length // factor)
+    totals = np.empty(shape, dtype=dtype)
+
+    runs = np.moveaxis(totals, axis, 0)
+    values = np.moveaxis(array, axis, 0)
+    blocks = values[: whole * factor].reshape(whole, factor, *values.shape[1:])
+    blocks.sum(axis=1, dtype=dtype, out=runs[:whole])
+    if whole < len(runs):
+        values[whole * factor :].sum(axis=0, dtype=dtype, out=runs[whole])
+    return totals
+
+
+def _block_totals(pixels: np.ndarray, factor: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Totals and pixel counts of each factor x factor block of pixels, adding
+    up each band of factor rows and then each run of factor columns in it,
+    so nothing bigger than the image shrunk down the rows is allocated.
+    """
+    image_height, image_width, _ = pixels.shape
+    # a whole block of 255s fits in 32 bits for any sensible factor
+    dtype = np.uint32 if 255 * factor * factor < 2**32 else np.int64
+    bands = _run_totals(pixels, factor, 0, dtype)
+    totals = _run_totals(bands, factor, 1, dtype)
+
+    row_edges = np.append(np.arange(0, image_height, factor), image_height)
+    col_edges = np.append(np.arange(0, image_width, factor), image_width)
+    counts = np.outer(np.diff(row_edges), np.diff(col_edges))
+    return totals, counts
+
+
+def compress(
+    raw: RawImage, out: Optional[RawImage] = None, factor: int = 2
+) -> RawImage:
+    """
+    Returns raw compressed by factor, averaging each factor x factor block
+    of pixels (or what's left of one at the edges) into a single pixel. If
+    out is given the result is written into it rather than into a newly
+    allocated image.
+    """
+    if factor < 1:
+        raise ValueError("factor must be at least 1")
+
+    height = -(-raw.height // factor)
+    width = -(-raw.width // factor)
+    if out is not None and out.size != (width, height):
+        raise ValueError(f"out must be {width}x{height}, not {out.width}x{out.height}")
+
+    pixels = as_array(raw)
+    if factor == 2:
+        totals, counts = _pair_totals(pixels)
+    else:
+        totals, counts = _block_totals(pixels, factor)
+
+    compressed = totals // counts[:, :, np.newaxis]
+    if out is None:
+        return from_array(compressed)
+
+    out.ensure_writable()
+    as_array(out)[:] = compressed
+    return out
@@ -0,0 +1,90 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+import assignment2
+import numpy_backend
+import python_backend
+from raw_image import RawImage
+
+
+SIZES = [(1, 1), (1, 6), (6, 1), (2, 2), (3, 3), (5, 8), (8, 5), (11, 13)]
+
+
+# --------------------------------------------------------------------------
+# Tests that the numpy backend matches the python backend exactly
+# --------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("height, width", SIZES)
+@pytest.mark.parametrize("name", ["mirror", "grey", "invert"])
+def test_in_place_filters_bit_exact(random_raw, name, height, width):
+    expected = random_raw(height, width, seed=height * 31 + width)
+    actual = expected.copy()
+    getattr(python_backend, name)(expected)
+    getattr(numpy_backend, name)(actual)
+    assert actual == expected
+
+
+@pytest.mark.parametrize("height, width", SIZES)
+def test_compress_bit_exact(random_raw, height, width):
+    """Includes odd sizes, where edge blocks average fewer pixels."""
+    raw = random_raw(height, width, seed=height * 17 + width)
+    assert numpy_backend.compress(raw) == python_backend.compress(raw)
+
+
+@pytest.mark.parametrize("factor", [1, 3, 4, 7, 5000])  # 5000 sums in 64 bits
+@pytest.mark.parametrize("height, width", SIZES)
+def test_compress_factor_bit_exact(random_raw, height, width, factor):
+    raw = random_raw(height, width, seed=height * 13 + width)
+    expected = python_backend.compress(raw, factor=factor)
+    assert numpy_backend.compress(raw, factor=factor) == expected
+
+
+@pytest.mark.parametrize(
+    "size1, size2", [((2, 2), (2, 2)), ((3, 1), (1, 4)), ((1, 1), (5, 4))]
+)
+def test_merge_bit_exact(random_raw, size1, size2):
+    raw1 = random_raw(*size1, seed=1)
+    raw2 = random_raw(*size2, seed=2)
+    assert numpy_backend.merge(raw1, raw2) == python_backend.merge(raw1, raw2)
+
+
+@pytest.mark.parametrize("count", [1, 3, 4])
+def test_merge_many_bit_exact(random_raw, count):
+    raws = [random_raw(count + i, 5 - i, seed=i) for i in range(count)]
+    assert numpy_backend.merge(*raws) == python_backend.merge(*raws)
+
+
+def test_padded_stride(random_raw):
+    """Padding bytes between rows are neither read nor written."""
+    raw = random_raw(4, 3, seed=5, stride=12)
+    padding = bytes(raw.data[9::12]) + bytes(raw.data[10::12]) + bytes(raw.data[11::12])
+    expected = RawImage.from_nested(raw.to_nested())
+
+    numpy_backend.invert(raw)
+    python_backend.invert(expected)
+    assert raw == expected
+    assert padding == (
+        bytes(raw.data[9::12]) + bytes(raw.data[10::12]) + bytes(raw.data[11::12])
+    )
+
+
+# --------------------------------------------------------------------------
+# Tests for choosing a backend
+# --------------------------------------------------------------------------
+
+
+def test_numpy_is_default():
+    assert assignment2.get_backend() == "numpy"
+
+
+def test_set_backend():
+    try:
+        assignment2.set_backend("python")
+        assert assignment2.get_backend() == "python"
+    finally:
+        assignment2.set_backend("numpy")
+
+    with pytest.raises(ValueError):
+        assignment2.set_backend("fortran")
@@ -0,0 +1,167 @@
+"""
+Keeps the images made by filter chains on disk, so running the same chain
+on the same input again copies the stored result instead of decoding and
+filtering the input all over again.
+
+    cache = OutputCache(".filter-cache", max_bytes=1024 * 1024 * 1024)
+    key = cache.key(hash_file("lotus.jpg"), ("grey", "invert"), ".jpg")
+    if not cache.fetch(key, "lotus-dark.jpg"):
+        ...  # make lotus-dark.jpg
+        cache.store(key, "lotus-dark.jpg")
+
+Results are stored under a sha256 of the input file's bytes, the stages
+in order and the output format, so a renamed or copied input still hits
+and an edited one doesn't. Files are written under a temporary name and
+renamed into place, so a crash or another process reading at the same
+time never sees half a file. Once the cache holds more than max_bytes the
+least recently used results are deleted.
+
+Each OutputCache keeps a running total of the bytes stored, found once
+when it's made and added to by every store, and only looks through the
+directory again once the total goes over max_bytes. Processes sharing a
+directory don't see each other's stores until then, so it can go over by
+what the others stored in the meantime.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+from typing import NamedTuple, Sequence
+
+# bump when a filter changes what it outputs, so older results aren't used
+CACHE_VERSION = 1
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+CHUNK_SIZE = 1024 * 1024
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+
+
+def hash_file(path: str) -> str:
+    """The sha256 of the bytes of the file at path, read a chunk at a time."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _copy_atomically(source: str, destination: str) -> None:
+    directory = os.path.dirname(os.path.abspath(destination))
+    handle, temporary = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(handle, "wb") as output, open(source, "rb") as file:
+            shutil.copyfileobj(file, output, CHUNK_SIZE)
+        os.replace(temporary, destination)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+class OutputCache:
+    """
+    A directory of filter chain outputs holding at most max_bytes. It's
+    safe for several processes to share one directory.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        if max_bytes < 0:
+            raise ValueError("max_bytes must not be negative")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        self._total = self.size()
+
+    def key(self, input_hash: str, stages: Sequence[str], extension: str) -> str:
+        """
+        The key of the result of running stages, with any parameters
+        written into their names, on the input whose hash_file is
+        input_hash, saved in the format extension picks.
+        """
+        description = "\n".join(
+            [f"v{CACHE_VERSION}", input_hash, extension.lower(), *stages]
+        )
+        return hashlib.sha256(description.encode()).hexdigest()
+
+    def path(self, key: str) -> str:
+        # the first two characters as a subdirectory keeps directories small
+        return os.path.join(self.directory, key[:2], key)
+
+    def fetch(self, key: str, destination: str) -> bool:
+        """
+        Copies the result stored under key to destination and returns True,
+        or returns False if there isn't one.
+        """
+        stored = self.path(key)
+        try:
+            _copy_atomically(stored, destination)
+        except FileNotFoundError:
+            if os.path.exists(stored):
+                raise
+            self.misses += 1
+            return False
+
+        # the modification time doubles as the last time it was used
+        try:
+            os.utime(stored)
+        except FileNotFoundError:  # evicted by another process meanwhile
+            pass
+        self.hits += 1
+        return True
+
+    def store(self, key: str, source: str) -> None:
+        """Stores a copy of the file at source under key."""
+        stored = self.path(key)
+        os.makedirs(os.path.dirname(stored), exist_ok=True)
+        try:
+            replaced = os.stat(stored).st_size
+        except FileNotFoundError:
+            replaced = 0
+        _copy_atomically(source, stored)
+        self._total += os.stat(source).st_size - replaced
+        if self._total > self.max_bytes:
+            self._evict()
+
+    def stats(self) -> CacheStats:
+        return CacheStats(self.hits, self.misses, self.evictions)
+
+    def size(self) -> int:
+        """Bytes of results stored right now."""
+        return sum(entry.stat().st_size for entry in self._entries())
+
+    def _entries(self):
+        for bucket in os.scandir(self.directory):
+            if bucket.is_dir():
+                for entry in os.scandir(bucket.path):
+                    if entry.is_file() and not entry.name.startswith(".tmp-"):
+                        yield entry
+
+    def _evict(self) -> None:
+        # counts what other processes stored too, and sets the total to it
+        entries = []
+        for entry in self._entries():
+            try:
+                status = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((status.st_mtime_ns, status.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                continue
+            total -= size
+            self.evictions += 1
+        self._total = total
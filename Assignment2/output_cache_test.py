@@ -0,0 +1,108 @@
+import os
+
+import pytest
+
+from output_cache import OutputCache, hash_file
+
+
+def write(path, data):
+    path.write_bytes(data)
+    return str(path)
+
+
+# --------------------------------------------------------------------------
+# Tests for keys
+# --------------------------------------------------------------------------
+
+
+def test_hash_file_is_content_addressed(tmp_path):
+    first = write(tmp_path / "a.png", b"pixels")
+    copy = write(tmp_path / "b.png", b"pixels")
+    edited = write(tmp_path / "c.png", b"pixelz")
+    assert hash_file(first) == hash_file(copy) != hash_file(edited)
+
+
+def test_key_depends_on_everything(tmp_path):
+    cache = OutputCache(str(tmp_path))
+    key = cache.key("abc", ("grey", "invert"), ".png")
+    assert key == cache.key("abc", ["grey", "invert"], ".PNG")
+    assert len(
+        {
+            key,
+            cache.key("abd", ("grey", "invert"), ".png"),
+            cache.key("abc", ("invert", "grey"), ".png"),
+            cache.key("abc", ("grey",), ".png"),
+            cache.key("abc", ("grey", "invert"), ".jpg"),
+        }
+    ) == 5
+
+
+# --------------------------------------------------------------------------
+# Tests for fetch, store and eviction
+# --------------------------------------------------------------------------
+
+
+def test_store_then_fetch(tmp_path):
+    cache = OutputCache(str(tmp_path / "cache"))
+    output = write(tmp_path / "out.png", b"result")
+    destination = str(tmp_path / "again.png")
+
+    assert not cache.fetch("k" * 64, destination)
+    assert not os.path.exists(destination)
+    cache.store("k" * 64, output)
+    assert cache.fetch("k" * 64, destination)
+    assert open(destination, "rb").read() == b"result"
+    assert cache.stats() == (1, 1, 0)
+    assert cache.size() == len(b"result")
+
+
+def test_no_temporary_files_left(tmp_path):
+    cache = OutputCache(str(tmp_path / "cache"))
+    cache.store("a" * 64, write(tmp_path / "out.png", b"result"))
+    with pytest.raises(FileNotFoundError):
+        cache.store("b" * 64, str(tmp_path / "missing.png"))
+
+    names = [name for _, _, files in os.walk(tmp_path / "cache") for name in files]
+    assert names == ["a" * 64]
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = OutputCache(str(tmp_path / "cache"), max_bytes=20)
+    output = write(tmp_path / "out.png", b"0123456789")
+    cache.store("a" * 64, output)
+    cache.store("b" * 64, output)
+    # using a makes b the least recently used
+    os.utime(cache.path("a" * 64), ns=(0, 2 * 10**18))
+    os.utime(cache.path("b" * 64), ns=(0, 10**18))
+    cache.store("c" * 64, output)
+
+    assert os.path.exists(cache.path("a" * 64))
+    assert not os.path.exists(cache.path("b" * 64))
+    assert os.path.exists(cache.path("c" * 64))
+    assert cache.evictions == 1 and cache.size() == 20
+
+
+def test_scans_only_when_over(tmp_path, monkeypatch):
+    directory = str(tmp_path / "cache")
+    OutputCache(directory).store("a" * 64, write(tmp_path / "old.png", b"0123"))
+    cache = OutputCache(directory, max_bytes=20)
+    scans = []
+    entries = cache._entries
+    monkeypatch.setattr(cache, "_entries", lambda: scans.append(1) or entries())
+
+    output = write(tmp_path / "out.png", b"0123456789")
+    cache.store("b" * 64, output)
+    cache.store("b" * 64, output)  # replacing a result adds nothing
+    assert scans == []
+
+    cache.store("c" * 64, output)  # the 4 bytes already there count too
+    assert len(scans) == 1
+    assert cache.evictions == 1 and cache.size() == 20
+
+
+def test_fetch_marks_as_used(tmp_path):
+    cache = OutputCache(str(tmp_path / "cache"))
+    cache.store("a" * 64, write(tmp_path / "out.png", b"result"))
+    os.utime(cache.path("a" * 64), ns=(0, 0))
+    cache.fetch("a" * 64, str(tmp_path / "again.png"))
+    assert os.stat(cache.path("a" * 64)).st_mtime_ns > 0
@@ -0,0 +1,112 @@
+"""
+Runs filters on several cores at once. The image is copied into shared
+memory once, split into tiles of whole rows, and each tile is filtered by
+a worker process that reads and writes the shared memory directly, so no
+pixel data is pickled on the way to or from the workers.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, List, Optional, Sequence, Tuple, Union
+
+import assignment2
+from pipeline import Pipeline
+from raw_image import RawImage
+
+# (input name, output name or None, width, top row, rows,
+#  output top row, stage names, backend name)
+Tile = Tuple[str, Optional[str], int, int, int, int, Tuple[str, ...], str]
+
+
+def _run_tile(tile: Tile) -> None:
+    source_name, output_name, width, top, rows, output_top, stages, backend = tile
+    assignment2.set_backend(backend)
+
+    source = shared_memory.SharedMemory(name=source_name, track=False)
+    output = None
+    if output_name is not None:
+        output = shared_memory.SharedMemory(name=output_name, track=False)
+
+    try:
+        view = source.buf[top * width * 3 : (top + rows) * width * 3]
+        result = Pipeline(stages).run(RawImage(width, rows, view))
+        if output is not None:
+            start = output_top * result.width * 3
+            output.buf[start : start + result.nbytes] = result.tobytes()
+        # shared memory can't be closed while views of it are still alive
+        del result
+        view.release()
+    finally:
+        source.close()
+        if output is not None:
+            output.close()
+
+
+def split_rows(height: int, tiles: int, alignment: int = 1) -> List[Tuple[int, int]]:
+    """
+    Splits height rows into at most tiles (top, rows) pieces of about the
+    same size. Every piece but the last has a multiple of alignment rows.
+    """
+    rows = max(1, -(-height // max(1, tiles)))
+    rows = -(-rows // alignment) * alignment
+    return [(top, min(rows, height - top)) for top in range(0, height, rows)]
+
+
+def parallel_filter(
+    raw: RawImage,
+    stages: Sequence[Union[str, Callable]],
+    workers: Optional[int] = None,
+) -> RawImage:
+    """
+    Applies stages (see Pipeline) to raw using workers processes, or one
+    per core if workers is None, and returns the result. raw itself is
+    left unchanged. The result is identical to running the pipeline on
+    one core.
+    """
+    pipeline = Pipeline(stages)
+    workers = workers if workers is not None else os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    if workers == 1 or raw.height < 2:
+        return pipeline.run(raw.copy())
+
+    compressions = pipeline.stages.count("compress")
+    alignment = 2**compressions
+    width, height = raw.width, raw.height
+    for _ in range(compressions):
+        width, height = (width + 1) // 2, (height + 1) // 2
+
+    source = shared_memory.SharedMemory(create=True, size=max(1, raw.nbytes))
+    # without compress every filter works in place, so the workers can
+    # write their results straight back over the source
+    output = None
+    if compressions > 0:
+        output_size = max(1, width * height * 3)
+        output = shared_memory.SharedMemory(create=True, size=output_size)
+
+    try:
+        source.buf[: raw.width * raw.height * 3] = raw.tobytes()
+        tiles = [
+            (
+                source.name,
+                output.name if output is not None else None,
+                raw.width,
+                top,
+                rows,
+                top // alignment,
+                tuple(pipeline.stages),
+                assignment2.get_backend(),
+            )
+            for top, rows in split_rows(raw.height, workers, alignment)
+        ]
+        with ProcessPoolExecutor(max_workers=min(workers, len(tiles))) as executor:
+            list(executor.map(_run_tile, tiles))
+
+        result = output if output is not None else source
+        return RawImage(width, height, bytearray(result.buf[: width * height * 3]))
+    finally:
+        for block in (source, output):
+            if block is not None:
+                block.close()
+                block.unlink()
@@ -0,0 +1,52 @@
+import pytest
+
+from parallel import parallel_filter, split_rows
+from pipeline import Pipeline
+
+
+# --------------------------------------------------------------------------
+# Tests for split_rows
+# --------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "height, tiles, alignment, expected",
+    [
+        (10, 2, 1, [(0, 5), (5, 5)]),
+        (10, 3, 1, [(0, 4), (4, 4), (8, 2)]),
+        (10, 3, 2, [(0, 4), (4, 4), (8, 2)]),
+        (9, 2, 4, [(0, 8), (8, 1)]),
+        (3, 8, 1, [(0, 1), (1, 1), (2, 1)]),
+    ],
+)
+def test_split_rows(height, tiles, alignment, expected):
+    assert split_rows(height, tiles, alignment) == expected
+
+
+# --------------------------------------------------------------------------
+# Tests for parallel_filter
+# --------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "stages",
+    [
+        ["grey", "mirror"],
+        ["invert"],
+        ["compress", "grey", "invert", "mirror"],
+        ["compress", "compress"],
+    ],
+)
+@pytest.mark.parametrize("workers", [1, 2, 3])
+def test_matches_serial(backend, random_raw, stages, workers):
+    raw = random_raw(23, 11, seed=workers)
+    original = raw.copy()
+    result = parallel_filter(raw, stages, workers=workers)
+
+    assert result == Pipeline(stages).run(original.copy())
+    assert raw == original
+
+
+def test_invalid_worker_count(random_raw):
+    with pytest.raises(ValueError):
+        parallel_filter(random_raw(2, 2), ["grey"], workers=0)
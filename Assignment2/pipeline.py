@@ -0,0 +1,110 @@
+from typing import Callable, List, Sequence, Tuple, Union
+
+import assignment2
+import instrument
+from raw_image import RawImage
+
+# what each stage does to the pixels, which decides what it can be fused with
+PIXEL = "pixel"  # each output pixel only depends on the same input pixel
+ROW = "row"  # moves pixels around within their row
+RESAMPLE = "resample"  # changes the size of the image
+
+STAGE_KINDS = {"grey": PIXEL, "invert": PIXEL, "mirror": ROW, "compress": RESAMPLE}
+
+
+def stage_name(stage: Union[str, Callable]) -> str:
+    """
+    Returns the name of stage, which may be given as a string or as one of
+    the filter functions from assignment2.
+    """
+    name = stage if isinstance(stage, str) else getattr(stage, "__name__", None)
+    if name not in STAGE_KINDS:
+        raise ValueError(f"unsupported pipeline stage: {stage!r}")
+    return name
+
+
+class Pipeline:
+    """
+    A sequence of filters to run on an image. Runs of per pixel filters
+    (grey, invert) and mirror are fused into a single pass over the image,
+    with mirror done by writing each pixel to its mirrored position rather
+    than as a pass of its own. compress changes the size of the image, so
+    it always gets a pass to itself.
+
+    >>> pipeline = Pipeline([compress, grey, invert, mirror])
+    >>> pipeline.passes
+    [('compress',), ('grey', 'invert', 'mirror')]
+    >>> result = pipeline.run(raw)
+    """
+
+    def __init__(self, stages: Sequence[Union[str, Callable]]) -> None:
+        self.stages = [stage_name(stage) for stage in stages]
+        self.passes: List[Tuple[str, ...]] = []
+
+        for name in self.stages:
+            fusable = (
+                STAGE_KINDS[name] != RESAMPLE
+                and self.passes
+                and STAGE_KINDS[self.passes[-1][0]] != RESAMPLE
+            )
+            if fusable:
+                self.passes[-1] += (name,)
+            else:
+                self.passes.append((name,))
+
+    @property
+    def fused(self) -> List[Tuple[str, ...]]:
+        """The passes that combine more than one stage."""
+        return [stages for stages in self.passes if len(stages) > 1]
+
+    def describe(self) -> str:
+        return " | ".join("+".join(stages) for stages in self.passes)
+
+    def run(
+        self, raw: Union[List[List[List[int]]], RawImage]
+    ) -> Union[List[List[List[int]]], RawImage]:
+        """
+        Runs every stage on raw and returns the result, which has the same
+        type as raw. As with the filters themselves, a RawImage passed in
+        may be modified in place.
+        """
+        nested = not isinstance(raw, RawImage)
+        image = RawImage.from_nested(raw) if nested else raw
+        backend = assignment2.BACKENDS[assignment2.get_backend()]
+
+        for stages in self.passes:
+            # each pass is profiled as one stage, since fused filters can't
+            # be told apart
+            with instrument.stage("+".join(stages), image.width * image.height):
+                if stages == ("compress",):
+                    image = backend.compress(image)
+                    continue
+
+                pixel_ops, mirrored = _simplify(stages)
+                if pixel_ops or mirrored:
+                    backend.fused_pass(image, pixel_ops, mirrored)
+
+        return image.to_nested() if nested else image
+
+    def __repr__(self) -> str:
+        return f"Pipeline({self.stages!r})"
+
+
+def _simplify(stages: Sequence[str]) -> Tuple[Tuple[str, ...], bool]:
+    """
+    Reduces a fused pass to the per pixel operations that actually change
+    anything, and whether to mirror. Per pixel operations don't care where
+    a pixel is, so mirror can be moved to the end, and two mirrors cancel
+    out. Inverting twice gives back the original pixel, and once a pixel
+    is grey, neither grey nor invert change it again.
+    """
+    mirrored = stages.count("mirror") % 2 == 1
+    pixel_ops = [name for name in stages if STAGE_KINDS[name] == PIXEL]
+    first_grey = pixel_ops.index("grey") if "grey" in pixel_ops else len(pixel_ops)
+
+    simplified: Tuple[str, ...] = ()
+    if pixel_ops[:first_grey].count("invert") % 2 == 1:
+        simplified += ("invert",)
+    if first_grey < len(pixel_ops):
+        simplified += ("grey",)
+    return simplified, mirrored
@@ -0,0 +1,74 @@
+import itertools
+
+import pytest
+
+import assignment2
+from assignment2 import mirror, grey, invert, compress
+from pipeline import Pipeline
+from raw_image import RawImage
+
+
+def run_one_by_one(stages, raw):
+    for stage in stages:
+        result = stage(raw)
+        if result is not None:
+            raw = result
+    return raw
+
+
+CHAINS = [
+    [grey],
+    [mirror, mirror],
+    [invert, invert],
+    [compress, grey, invert, mirror],
+    [invert, mirror, grey],
+    [mirror, compress, invert, compress, mirror],
+] + [list(chain) for chain in itertools.permutations([mirror, grey, invert])]
+
+
+# --------------------------------------------------------------------------
+# Tests for Pipeline
+# --------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("stages", CHAINS)
+@pytest.mark.parametrize("height, width", [(1, 1), (3, 5), (6, 4), (7, 7)])
+def test_matches_filters_one_by_one(backend, stages, height, width, random_nested):
+    """Fusing stages gives the same pixels as running them separately."""
+    nested = random_nested(height, width, seed=height * 7 + width)
+    expected = run_one_by_one(stages, [[p[:] for p in row] for row in nested])
+
+    assert Pipeline(stages).run(nested) == expected
+    assert Pipeline(stages).run(RawImage.from_nested(nested)).to_nested() == expected
+
+
+@pytest.mark.parametrize(
+    "stages, passes",
+    [
+        ([grey, invert, mirror], [("grey", "invert", "mirror")]),
+        (["compress", "grey"], [("compress",), ("grey",)]),
+        (
+            [compress, grey, invert, mirror],
+            [("compress",), ("grey", "invert", "mirror")],
+        ),
+        (
+            [mirror, compress, compress, invert],
+            [("mirror",), ("compress",), ("compress",), ("invert",)],
+        ),
+    ],
+)
+def test_passes(stages, passes):
+    """Reports which stages were fused into a single pass."""
+    pipeline = Pipeline(stages)
+    assert pipeline.passes == passes
+    assert pipeline.fused == [p for p in passes if len(p) > 1]
+
+
+def test_describe():
+    assert Pipeline([compress, grey, mirror]).describe() == "compress | grey+mirror"
+
+
+@pytest.mark.parametrize("stage", ["blur", assignment2.merge, 5])
+def test_unsupported_stage(stage):
+    with pytest.raises(ValueError):
+        Pipeline([stage])
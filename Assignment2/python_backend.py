@@ -0,0 +1,222 @@
+"""
+Pure Python versions of the assignment2 filters that work on RawImage data.
+Rather than visiting every pixel in a python loop, each row is split into
+its red, green and blue channels with slices and the work is done with
+map/zip so the inner loops run in C.
+"""
+
+from itertools import accumulate
+from operator import add, floordiv, sub
+from typing import List, Optional, Sequence
+
+from raw_image import RawImage
+
+# THIRDS[total] == total // 3 for every possible sum of three channels
+THIRDS = bytes(total // 3 for total in range(3 * 255 + 1))
+
+
+def _mirrored_row(row: bytes) -> bytearray:
+    mirrored = bytearray(len(row))
+    for channel in range(3):
+        mirrored[channel::3] = row[channel::3][::-1]
+    return mirrored
+
+
+def _grey_row(row: bytes) -> bytearray:
+    totals = map(sum, zip(row[0::3], row[1::3], row[2::3]))
+    averages = bytes(map(THIRDS.__getitem__, totals))
+    greyed = bytearray(len(row))
+    for channel in range(3):
+        greyed[channel::3] = averages
+    return greyed
+
+
+def _invert_pixel(red: int, green: int, blue: int) -> bytes:
+    max_colour = max(red, green, blue)
+    min_colour = min(red, green, blue)
+    # a channel equal to the min or max becomes the other one, which is
+    # the same thing as max + min - channel
+    swapped = max_colour + min_colour
+    return bytes(
+        swapped - colour if colour == min_colour or colour == max_colour else colour
+        for colour in (red, green, blue)
+    )
+
+
+def _inverted_row(row: bytes) -> bytes:
+    return b"".join(map(_invert_pixel, row[0::3], row[1::3], row[2::3]))
+
+
+PIXEL_OPS = {"grey": _grey_row, "invert": _inverted_row}
+
+
+def mirror(raw: RawImage) -> None:
+    raw.ensure_writable()
+    for row in raw.rows():
+        row[:] = _mirrored_row(bytes(row))
+
+
+def grey(raw: RawImage) -> None:
+    raw.ensure_writable()
+    for row in raw.rows():
+        row[:] = _grey_row(bytes(row))
+
+
+def invert(raw: RawImage) -> None:
+    raw.ensure_writable()
+    for row in raw.rows():
+        row[:] = _inverted_row(bytes(row))
+
+
+def fused_pass(raw: RawImage, pixel_ops: Sequence[str], mirrored: bool) -> None:
+    """
+    Applies each of the per pixel operations in pixel_ops ("grey" or
+    "invert") in order and then mirrors if mirrored is True, reading and
+    writing each row of raw only once.
+    """
+    raw.ensure_writable()
+    transforms = [PIXEL_OPS[name] for name in pixel_ops]
+    for row in raw.rows():
+        result = bytes(row)
+        for transform in transforms:
+            result = transform(result)
+        if mirrored:
+            result = _mirrored_row(result)
+        row[:] = result
+
+
+def merge(*raws: RawImage) -> RawImage:
+    height = max(raw.height for raw in raws)
+    width = max(raw.width for raw in raws)
+    merged = RawImage(width, height)
+
+    for image_row, output_row in enumerate(merged.rows()):
+        # row i prefers image i % n, then the ones after it in turn, so
+        # paint them least preferred first and the preferred one ends up on
+        # top wherever several have pixels, anything left over stays black
+        for source in merge_order(raws, image_row):
+            if image_row < source.height:
+                source_row = source.row(image_row)
+                output_row[: len(source_row)] = source_row
+
+    return merged
+
+
+def merge_order(raws: Sequence, image_row: int) -> List:
+    """
+    raws in the order merge paints them onto image_row, least preferred
+    first.
+    """
+    first = image_row % len(raws)
+    preferred = list(raws[first:]) + list(raws[:first])
+    return preferred[::-1]
+
+
+def _output_image(width: int, height: int, out: Optional[RawImage]) -> RawImage:
+    if out is None:
+        return RawImage(width, height)
+    if out.size != (width, height):
+        raise ValueError(f"out must be {width}x{height}, not {out.width}x{out.height}")
+    out.ensure_writable()
+    return out
+
+
+def _pair_sums(channel: bytes) -> List[int]:
+    """
+    Adds each even-indexed value to the one after it. If there is an odd
+    number of values the last one is kept as is.
+    """
+    sums = list(map(add, channel[0::2], channel[1::2]))
+    if len(channel) % 2 == 1:
+        sums.append(channel[-1])
+    return sums
+
+
+def compress(
+    raw: RawImage, out: Optional[RawImage] = None, factor: int = 2
+) -> RawImage:
+    """
+    Returns raw compressed by factor, averaging each factor x factor block
+    of pixels (or what's left of one at the edges) into a single pixel. If
+    out is given the result is written into it rather than into a newly
+    allocated image.
+    """
+    if factor < 1:
+        raise ValueError("factor must be at least 1")
+
+    width = -(-raw.width // factor)
+    height = -(-raw.height // factor)
+    compressed = _output_image(width, height, out)
+    if factor != 2:
+        _compress_blocks(raw, factor, compressed)
+        return compressed
+
+    # how many source pixels went into each output pixel of a row that
+    # has a row below it; the last column only has one pixel across when
+    # the width is odd
+    full_counts = [4] * width
+    if raw.width % 2 == 1 and width > 0:
+        full_counts[-1] = 2
+    half_counts = [count // 2 for count in full_counts]
+
+    for output_index, output_row in enumerate(compressed.rows()):
+        top = bytes(raw.row(output_index * 2))
+        has_bottom = output_index * 2 + 1 < raw.height
+        bottom = bytes(raw.row(output_index * 2 + 1)) if has_bottom else b""
+        counts = full_counts if has_bottom else half_counts
+
+        for channel in range(3):
+            totals = _pair_sums(top[channel::3])
+            if has_bottom:
+                totals = map(add, totals, _pair_sums(bottom[channel::3]))
+            output_row[channel::3] = bytes(map(floordiv, totals, counts))
+
+    return compressed
+
+
+def _block_edges(length: int, factor: int) -> List[int]:
+    """Returns where each block of factor values along length starts and ends."""
+    return list(range(0, length, factor)) + [length]
+
+
+def _sampled_table_row(column_totals: List[int], col_edges: List[int]) -> List[int]:
+    """
+    Turns the totals of each column so far into a row of the summed-area
+    table, keeping only the entries at the block edges.
+    """
+    table_row = [0, *accumulate(column_totals)]
+    return list(map(table_row.__getitem__, col_edges))
+
+
+def _compress_blocks(raw: RawImage, factor: int, compressed: RawImage) -> None:
+    """
+    Block averages for any factor using a summed-area table: table[y][x] is
+    the total of every pixel above and to the left of (y, x), so the total
+    of any block is four lookups however big the block is. Only the table
+    rows at block edges are needed, and only two are kept at a time.
+    """
+    col_edges = _block_edges(raw.width, factor)
+    row_edges = _block_edges(raw.height, factor)
+    block_widths = list(map(sub, col_edges[1:], col_edges[:-1]))
+
+    column_totals = [[0] * raw.width for _ in range(3)]
+    top = [_sampled_table_row(totals, col_edges) for totals in column_totals]
+    output_rows = compressed.rows()
+
+    for block_top, block_bottom in zip(row_edges, row_edges[1:]):
+        for image_row in range(block_top, block_bottom):
+            row = bytes(raw.row(image_row))
+            for channel in range(3):
+                column_totals[channel] = list(
+                    map(add, column_totals[channel], row[channel::3])
+                )
+
+        bottom = [_sampled_table_row(totals, col_edges) for totals in column_totals]
+        counts = [(block_bottom - block_top) * w for w in block_widths]
+        output_row = next(output_rows)
+        for channel in range(3):
+            upper = map(sub, top[channel][1:], top[channel][:-1])
+            lower = map(sub, bottom[channel][1:], bottom[channel][:-1])
+            totals = map(sub, lower, upper)
+            output_row[channel::3] = bytes(map(floordiv, totals, counts))
+        top = bottom
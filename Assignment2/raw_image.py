@@ -0,0 +1,153 @@
+from typing import Iterator, List, Optional, Tuple
+
+
+class RawImage:
+    """
+    Compact raw image data. Instead of a list of rows of [r, g, b] lists,
+    the pixels live in one contiguous buffer of unsigned bytes, three
+    bytes (r, g, b) per pixel, row after row. stride is the number of bytes
+    between the start of one row and the start of the next, which is
+    normally width * 3 but may be larger if the rows are padded.
+
+    data may also be read-only, such as bytes shared between several
+    images by the image cache. The filters call ensure_writable before
+    changing an image, which gives it a private copy of its pixels first,
+    so images share one buffer until one of them is written to.
+
+    >>> raw = RawImage.from_nested([[[233, 100, 115], [0, 0, 0]],
+                                    [[199, 201, 116], [1, 9, 0]]])
+    >>> raw.width, raw.height, raw.stride
+    (2, 2, 6)
+    >>> raw.pixel(1, 0)
+    [199, 201, 116]
+    >>> raw.to_nested()
+    [[[233, 100, 115], [0, 0, 0]], [[199, 201, 116], [1, 9, 0]]]
+    """
+
+    __slots__ = ("width", "height", "stride", "data")
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        data: Optional[bytearray] = None,
+        stride: Optional[int] = None,
+    ) -> None:
+        if width < 0 or height < 0:
+            raise ValueError("image dimensions must not be negative")
+
+        if stride is None:
+            stride = width * 3
+        if stride < width * 3:
+            raise ValueError("stride is smaller than a row of pixels")
+
+        if data is None:
+            data = bytearray(stride * height)
+        elif len(data) < stride * height:
+            raise ValueError("buffer is too small for the image dimensions")
+
+        self.width = width
+        self.height = height
+        self.stride = stride
+        self.data = data
+
+    @classmethod
+    def from_nested(cls, raw: List[List[List[int]]]) -> "RawImage":
+        """
+        Builds a RawImage out of nested list image data. Every row of raw
+        must have the same number of pixels.
+        """
+        height = len(raw)
+        width = len(raw[0]) if height > 0 else 0
+
+        data = bytearray(width * height * 3)
+        offset = 0
+        for image_row in raw:
+            if len(image_row) != width:
+                raise ValueError("all rows of the image must be the same width")
+
+            for pixel in image_row:
+                data[offset : offset + 3] = bytes(pixel)
+                offset += 3
+
+        return cls(width, height, data)
+
+    def to_nested(self) -> List[List[List[int]]]:
+        """
+        Returns a copy of the image as nested list image data, the format
+        the functions in assignment2 originally worked with.
+        """
+        nested = []
+        for row in self.rows():
+            nested.append([list(row[i : i + 3]) for i in range(0, len(row), 3)])
+        return nested
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return (self.width, self.height)
+
+    @property
+    def nbytes(self) -> int:
+        return self.stride * self.height
+
+    @property
+    def is_packed(self) -> bool:
+        """True if there is no padding between the rows."""
+        return self.stride == self.width * 3
+
+    def row(self, index: int) -> memoryview:
+        """
+        Returns a view of the pixel bytes of row index, writable unless
+        data is read-only.
+        """
+        if not 0 <= index < self.height:
+            raise IndexError("row index out of range")
+
+        start = index * self.stride
+        return memoryview(self.data)[start : start + self.width * 3]
+
+    def rows(self) -> Iterator[memoryview]:
+        view = memoryview(self.data)
+        row_bytes = self.width * 3
+        for index in range(self.height):
+            start = index * self.stride
+            yield view[start : start + row_bytes]
+
+    def pixel(self, row: int, col: int) -> List[int]:
+        if not 0 <= col < self.width:
+            raise IndexError("column index out of range")
+
+        return list(self.row(row)[col * 3 : col * 3 + 3])
+
+    @property
+    def readonly(self) -> bool:
+        return memoryview(self.data).readonly
+
+    def ensure_writable(self) -> None:
+        """
+        Copies the pixels into a new buffer of this image's own if data is
+        read-only. Anything that changes an image in place calls this first.
+        """
+        if self.readonly:
+            self.data = bytearray(self.tobytes())
+            self.stride = self.width * 3
+
+    def tobytes(self) -> bytes:
+        """Returns the pixel bytes with any row padding removed."""
+        if self.is_packed:
+            return bytes(memoryview(self.data)[: self.nbytes])
+        return b"".join(self.rows())
+
+    def copy(self) -> "RawImage":
+        return RawImage(self.width, self.height, bytearray(self.tobytes()))
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, RawImage):
+            return NotImplemented
+        return self.size == other.size and self.tobytes() == other.tobytes()
+
+    def __repr__(self) -> str:
+        return f"RawImage(width={self.width}, height={self.height})"
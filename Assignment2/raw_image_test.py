@@ -0,0 +1,141 @@
+import pytest
+
+from assignment2 import mirror, grey, invert, merge, compress
+from raw_image import RawImage
+
+
+SIZES = [(1, 1), (1, 5), (5, 1), (2, 2), (3, 3), (4, 7), (7, 4), (9, 10)]
+
+
+# --------------------------------------------------------------------------
+# Tests for RawImage
+# --------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("height, width", SIZES + [(0, 0)])
+def test_round_trip(height, width, random_nested):
+    """Converting to RawImage and back gives the original data."""
+    nested = random_nested(height, width)
+    raw = RawImage.from_nested(nested)
+    assert (raw.width, raw.height) == (width, height)
+    assert len(raw.data) == width * height * 3
+    assert raw.to_nested() == nested
+
+
+def test_padded_stride():
+    """Row padding is skipped when reading pixels back."""
+    data = bytearray([1, 2, 3, 4, 5, 6, 99, 99, 7, 8, 9, 10, 11, 12, 99, 99])
+    raw = RawImage(2, 2, data, stride=8)
+    assert raw.to_nested() == [[[1, 2, 3], [4, 5, 6]], [[7, 8, 9], [10, 11, 12]]]
+    assert raw.tobytes() == bytes([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12])
+    assert raw.pixel(1, 1) == [10, 11, 12]
+
+
+@pytest.mark.parametrize(
+    "width, height, data, stride",
+    [
+        (-1, 1, None, None),  # Negative width
+        (2, 2, bytearray(11), None),  # Buffer too small
+        (2, 2, None, 5),  # Stride shorter than a row
+    ],
+)
+def test_invalid_dimensions(width, height, data, stride):
+    """Inconsistent metadata is rejected."""
+    with pytest.raises(ValueError):
+        RawImage(width, height, data, stride)
+
+
+def test_ragged_rows_rejected():
+    with pytest.raises(ValueError):
+        RawImage.from_nested([[[1, 2, 3], [4, 5, 6]], [[7, 8, 9]]])
+
+
+# --------------------------------------------------------------------------
+# Tests for the filters on RawImage (compared with the nested versions)
+# --------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("height, width", SIZES)
+@pytest.mark.parametrize("image_filter", [mirror, grey, invert])
+def test_in_place_filters_match_nested(image_filter, height, width, random_nested):
+    """In place filters give the same pixels for both representations."""
+    nested = random_nested(height, width, seed=height * 31 + width)
+    raw = RawImage.from_nested(nested)
+    image_filter(nested)
+    image_filter(raw)
+    assert raw.to_nested() == nested
+
+
+@pytest.mark.parametrize("height, width", SIZES)
+def test_compress_matches_nested(height, width, random_nested):
+    nested = random_nested(height, width, seed=height * 17 + width)
+    result = compress(RawImage.from_nested(nested))
+    assert isinstance(result, RawImage)
+    assert result.to_nested() == compress(nested)
+
+
+@pytest.mark.parametrize(
+    "size1, size2", [((2, 2), (2, 2)), ((3, 1), (1, 4)), ((1, 1), (4, 5))]
+)
+def test_merge_matches_nested(size1, size2, random_nested):
+    nested1 = random_nested(*size1, seed=1)
+    nested2 = random_nested(*size2, seed=2)
+    result = merge(RawImage.from_nested(nested1), RawImage.from_nested(nested2))
+    assert isinstance(result, RawImage)
+    assert result.size == (max(size1[1], size2[1]), max(size1[0], size2[0]))
+
+    for i, row in enumerate(result.to_nested()):
+        for j, pixel in enumerate(row):
+            first = nested1[i][j] if i < size1[0] and j < size1[1] else None
+            second = nested2[i][j] if i < size2[0] and j < size2[1] else None
+            preferred, other = (first, second) if i % 2 == 0 else (second, first)
+            expected = preferred or other or [0, 0, 0]
+            assert pixel == expected
+
+
+def test_merge_many_matches_nested(random_nested):
+    sizes = [(3, 2), (5, 1), (1, 4)]
+    nested = [random_nested(*size, seed=i) for i, size in enumerate(sizes)]
+    raws = [RawImage.from_nested(raw) for raw in nested]
+    # mixing formats gives a RawImage too
+    assert merge(*raws).to_nested() == merge(*nested)
+    assert merge(nested[0], *raws[1:]).to_nested() == merge(*nested)
+
+
+# --------------------------------------------------------------------------
+# Tests for loading and saving RawImage data
+# --------------------------------------------------------------------------
+
+
+def test_save_and_load_compact(tmp_path, random_nested):
+    """A lossless round trip through a file keeps every pixel."""
+    from assignment2 import get_raw_image, image_from_raw
+
+    raw = RawImage.from_nested(random_nested(5, 6))
+    path = str(tmp_path / "image.png")
+    image_from_raw(raw, path)
+
+    loaded = get_raw_image(path, compact=True)
+    assert loaded == raw
+    assert get_raw_image(path) == raw.to_nested()
+
+
+def test_save_padded_compact(tmp_path):
+    """Row padding in the buffer doesn't end up in the saved image."""
+    from assignment2 import get_raw_image, image_from_raw
+
+    data = bytearray([1, 2, 3, 4, 5, 6, 99, 99, 7, 8, 9, 10, 11, 12, 99, 99])
+    path = str(tmp_path / "padded.png")
+    image_from_raw(RawImage(2, 2, data, stride=8), path)
+    assert get_raw_image(path) == [[[1, 2, 3], [4, 5, 6]], [[7, 8, 9], [10, 11, 12]]]
+
+
+def test_load_converts_to_rgb(tmp_path):
+    """Images in other modes are loaded as RGB pixels."""
+    from PIL import Image
+    from assignment2 import get_raw_image
+
+    path = str(tmp_path / "grey.png")
+    Image.new("L", (3, 2), 77).save(path)
+    assert get_raw_image(path) == [[[77, 77, 77]] * 3] * 2
+    assert get_raw_image(path, compact=True).tobytes() == bytes([77] * 18)
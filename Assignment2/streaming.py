@@ -0,0 +1,119 @@
+"""
+Runs filters over images too big to load all at once. The image is read
+in bands of rows, each band goes through the filters on its own, and the
+result is appended to the output file before the next band is read, so
+memory use depends on the band size rather than the image size.
+
+Binary PPM files (P6) are read and written band by band straight from
+disk. Other formats are read through pillow, which decodes the whole file
+up front (its own compact copy), but the pixels are still only turned
+into RawImage data one band at a time.
+"""
+
+import os
+from typing import BinaryIO, Callable, Iterator, Sequence, Tuple, Union
+
+from PIL import Image
+
+from pipeline import Pipeline
+from raw_image import RawImage
+
+PPM_EXTENSIONS = (".ppm", ".pnm")
+
+
+def read_ppm_header(file: BinaryIO) -> Tuple[int, int]:
+    """
+    Reads the header of a binary (P6) PPM file, leaving file positioned at
+    the first pixel, and returns the (width, height) of the image.
+    """
+    tokens = []
+    while len(tokens) < 4:
+        line = file.readline()
+        if not line:
+            raise ValueError("unexpected end of file in PPM header")
+        tokens += line.split(b"#", 1)[0].split()
+
+    if tokens[0] != b"P6" or len(tokens) != 4:
+        raise ValueError("not a binary PPM file")
+    if int(tokens[3]) != 255:
+        raise ValueError("only PPM files with 8 bit channels are supported")
+
+    return int(tokens[1]), int(tokens[2])
+
+
+def write_ppm_header(file: BinaryIO, width: int, height: int) -> None:
+    file.write(b"P6\n%d %d\n255\n" % (width, height))
+
+
+def _is_ppm(name: str) -> bool:
+    return os.path.splitext(name)[1].lower() in PPM_EXTENSIONS
+
+
+def iter_bands(name: str, band_rows: int) -> Iterator[RawImage]:
+    """
+    Yields the image in name as RawImage bands of band_rows rows each,
+    from top to bottom. The last band may have fewer rows.
+    """
+    if band_rows <= 0:
+        raise ValueError("band_rows must be positive")
+
+    if _is_ppm(name):
+        with open(name, "rb") as file:
+            width, height = read_ppm_header(file)
+            for top in range(0, height, band_rows):
+                rows = min(band_rows, height - top)
+                data = bytearray(file.read(rows * width * 3))
+                if len(data) != rows * width * 3:
+                    raise ValueError("unexpected end of file in PPM pixel data")
+                yield RawImage(width, rows, data)
+        return
+
+    with Image.open(name) as image:
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        width, height = image.size
+        for top in range(0, height, band_rows):
+            bottom = min(top + band_rows, height)
+            band = image.crop((0, top, width, bottom))
+            yield RawImage(width, bottom - top, bytearray(band.tobytes()))
+
+
+def image_size(name: str) -> Tuple[int, int]:
+    if _is_ppm(name):
+        with open(name, "rb") as file:
+            return read_ppm_header(file)
+
+    with Image.open(name) as image:
+        return image.size
+
+
+def stream_filters(
+    source: str,
+    destination: str,
+    stages: Sequence[Union[str, Callable]],
+    band_rows: int = 64,
+) -> Tuple[int, int]:
+    """
+    Applies stages (see Pipeline) to the image in source band by band and
+    writes the result to destination, which must be a PPM file. Each
+    compress halves the band, so band_rows is rounded up to keep bands
+    lined up with compress's 2x2 blocks. Returns the (width, height) of
+    the written image.
+    """
+    if not _is_ppm(destination):
+        raise ValueError("streamed output can only be written as PPM")
+
+    pipeline = Pipeline(stages)
+    alignment = 2 ** pipeline.stages.count("compress")
+    band_rows = -(-band_rows // alignment) * alignment
+
+    width, height = image_size(source)
+    for _ in range(pipeline.stages.count("compress")):
+        width, height = (width + 1) // 2, (height + 1) // 2
+
+    with open(destination, "wb") as output:
+        write_ppm_header(output, width, height)
+        for band in iter_bands(source, band_rows):
+            output.write(pipeline.run(band).tobytes())
+
+    return width, height
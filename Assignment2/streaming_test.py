@@ -0,0 +1,84 @@
+import pytest
+from PIL import Image
+
+from assignment2 import get_raw_image
+from pipeline import Pipeline
+from streaming import iter_bands, read_ppm_header, stream_filters
+
+
+def save(raw, path):
+    Image.frombytes("RGB", raw.size, raw.tobytes()).save(path)
+    return str(path)
+
+
+# --------------------------------------------------------------------------
+# Tests for reading bands
+# --------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("extension", [".ppm", ".png"])
+@pytest.mark.parametrize("band_rows", [1, 3, 7, 50])
+def test_bands_cover_image(tmp_path, random_raw, extension, band_rows):
+    raw = random_raw(7, 5)
+    path = save(raw, tmp_path / ("image" + extension))
+
+    bands = list(iter_bands(path, band_rows))
+    assert all(band.height <= band_rows for band in bands)
+    assert b"".join(band.tobytes() for band in bands) == raw.tobytes()
+
+
+def test_ppm_header_with_comment(tmp_path):
+    path = tmp_path / "comment.ppm"
+    path.write_bytes(b"P6\n# made by hand\n2 1\n255\n" + bytes(range(6)))
+    with open(path, "rb") as file:
+        assert read_ppm_header(file) == (2, 1)
+        assert file.read() == bytes(range(6))
+
+
+@pytest.mark.parametrize(
+    "contents",
+    [
+        b"P3\n1 1\n255\n0 0 0\n",  # Plain text PPM
+        b"P6\n1 1\n65535\n" + bytes(6),  # 16 bit channels
+        b"P6\n1 1\n",  # Truncated header
+    ],
+)
+def test_unsupported_ppm(tmp_path, contents):
+    path = tmp_path / "bad.ppm"
+    path.write_bytes(contents)
+    with pytest.raises(ValueError):
+        list(iter_bands(str(path), 4))
+
+
+# --------------------------------------------------------------------------
+# Tests for stream_filters
+# --------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize(
+    "stages",
+    [
+        ["grey"],
+        ["invert", "mirror"],
+        ["compress"],
+        ["compress", "grey", "invert", "mirror"],
+        ["mirror", "compress", "compress", "invert"],
+    ],
+)
+@pytest.mark.parametrize("band_rows", [1, 2, 5, 64])
+def test_matches_whole_image(tmp_path, random_raw, stages, band_rows):
+    """Band by band output is identical to filtering the whole image."""
+    raw = random_raw(13, 9, seed=len(stages) + band_rows)
+    source = save(raw, tmp_path / "source.ppm")
+    destination = str(tmp_path / "output.ppm")
+
+    size = stream_filters(source, destination, stages, band_rows)
+    expected = Pipeline(stages).run(raw.copy())
+    assert size == expected.size
+    assert get_raw_image(destination, compact=True) == expected
+
+
+def test_destination_must_be_ppm(tmp_path, random_raw):
+    source = save(random_raw(2, 2), tmp_path / "source.ppm")
+    with pytest.raises(ValueError):
+        stream_filters(source, str(tmp_path / "output.jpg"), ["grey"])